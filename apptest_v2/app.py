@@ -1,8 +1,15 @@
 from flask import Flask
 
 from view import create_endpoints
+from model import create_user_dao
 from service import UserService
+from utils.cache import TokenCache
+from utils.connection import create_pools
 from utils.custom_json_encoder import CustomJSONEncoder
+from utils.database_session import init_session
+from utils.metrics import init_metrics, init_service_metrics
+from utils.profiling import init_profiling
+from utils.scheduler import start_periodic_job
 
 
 class Service:
@@ -19,11 +26,82 @@ def create_app(test_config=None):
     else:
         app.config.update(test_config)
 
-    database = app.config['DB']
+    init_profiling(app)
+    init_metrics(app)
+    backend = app.config.get('DATABASE_BACKEND', 'mysql')
+    init_session(app, *create_pools(app.config['DB'], backend))
 
-    services = Service
-    services.user_service = UserService(app.config)
+    if app.config.get('TOKEN_CACHE_SIZE', 10000):
+        app.extensions['token_cache'] = TokenCache(
+            max_size=app.config.get('TOKEN_CACHE_SIZE', 10000),
+            ttl=app.config.get('TOKEN_CACHE_TTL', 300)
+        )
 
-    create_endpoints(app, services, database)
+    # 앱마다 따로 만들어서 한 프로세스의 여러 앱(테스트, 벤치마크)이 서로의 서비스를 바꾸지 않게 합니다.
+    services = Service()
+    services.user_service = UserService(app.config, create_user_dao(backend))
+    app.extensions['services'] = services
+    init_service_metrics(app, services.user_service)
+
+    # 데이터베이스를 읽는 주기 작업은 test_config로 만든 앱(테스트, 벤치마크)에서는 설정으로 켜야 실행
+    # 멈출 때는 stop_periodic_jobs(app.extensions['periodic_jobs'])
+    background_jobs = test_config is None
+    app.extensions['periodic_jobs'] = {}
+
+    if app.config.get('AVAILABILITY_FILTER_ENABLED', background_jobs):
+        build_availability_filter(app, services.user_service)
+
+    if app.config.get('COUNTER_RECONCILE_ENABLED', background_jobs):
+        reconcile_counters(app, services.user_service)
+
+    create_endpoints(app, services)
 
     return app
+
+
+def build_availability_filter(app, user_service):
+    """
+        login_id, email 블룸 필터 생성 및 주기적 재생성 등록
+
+        키 수에 비례해 시간이 걸리므로 앱 시작을 막지 않도록 백그라운드 스레드에서 만듭니다.
+        만들어지기 전이나 데이터베이스에 연결할 수 없을 때는 모든 중복 검사를 조회합니다.
+        멈출 수 있도록 app.extensions['periodic_jobs']에 저장합니다.
+
+    Args:
+        app: Flask 객체
+        user_service: UserService
+
+    """
+
+    pool = app.extensions['database']
+
+    app.extensions['periodic_jobs']['availability-filter'] = start_periodic_job(
+        app.config.get('AVAILABILITY_FILTER_REBUILD_INTERVAL', 3600),
+        lambda: user_service.build_availability_filter(pool),
+        'availability-filter',
+        run_first=True
+    )
+
+
+def reconcile_counters(app, user_service):
+    """
+        유저, 어드민 수 보정 주기 작업 등록
+
+        앱 시작 시 한 번 (카운터가 없던 데이터 반영) 그리고
+        COUNTER_RECONCILE_INTERVAL초마다 (기본값 3600, 0이면 시작 시에만) 실행합니다.
+        멈출 수 있도록 app.extensions['periodic_jobs']에 저장합니다.
+
+    Args:
+        app: Flask 객체
+        user_service: UserService
+
+    """
+
+    pool = app.extensions['database']
+
+    app.extensions['periodic_jobs']['counter-reconcile'] = start_periodic_job(
+        app.config.get('COUNTER_RECONCILE_INTERVAL', 3600),
+        lambda: user_service.reconcile_counters(pool),
+        'counter-reconcile',
+        run_first=True
+    )
@@ -0,0 +1,465 @@
+"""
+    엔드포인트 벤치마크
+
+    create_app(test_config=...)으로 앱을 만들고 벤치마크용 유저, 어드민을 넣은 뒤
+    /sign-up, /login, /users, /my-page를 동시 요청 수별로 호출해서
+    처리량, p50/p95/p99 응답 시간, 요청당 UserDao 쿼리 수를 JSON으로 저장합니다.
+        test_client: Flask 테스트 클라이언트 (네트워크, WSGI 서버 제외)
+        wsgi: werkzeug WSGI 서버 (HTTP/1.1 keep-alive)
+    compare는 저장한 기준 결과와 비교해서 처리량이 줄거나 p95가 늘어난 항목이 있으면 실패합니다.
+
+    부하를 만드는 스레드와 앱이 같은 프로세스(GIL)에서 실행되므로 절댓값보다 변경 전후 비교에 사용합니다.
+    마이그레이션을 적용한 벤치마크 전용 데이터베이스에서 실행합니다. (python -m scripts.migrate)
+    /sign-up은 실행할 때마다 유저가 늘어납니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m benchmark.endpoints run --output result.json
+        python -m benchmark.endpoints run --drivers wsgi --concurrency 1,8,32 --requests 2000 --output result.json
+        python -m benchmark.endpoints compare baseline.json result.json --threshold 0.1
+        (연결 옵션이 없으면 config.py의 DB 설정 사용)
+        python -m benchmark.endpoints run --sqlite benchmark.sqlite3 --output result.json
+        (DATABASE_BACKEND = 'sqlite', 파일이 없으면 스키마를 만듦)
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import platform
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from scripts.database import add_database_arguments, database_from_args
+
+PASSWORD = 'bench1234'
+
+USER_NAME = '벤치유저'
+
+ADMIN_LOGIN_ID = 'benchadmin'
+
+ENDPOINTS = ('sign_up', 'login', 'users', 'my_page')
+
+
+def user_login_id(index):
+    return 'benchuser{:07d}'.format(index)
+
+
+def seed(app, user_service, user_count):
+    """
+        벤치마크 유저, 어드민 생성
+
+        이미 있는 login_id는 건너뛰므로 여러 번 실행해도 됩니다.
+        비밀번호는 한 번만 암호화해서 모든 유저가 같은 해시를 사용합니다.
+
+    Args:
+        app: Flask 객체
+        user_service: UserService
+        user_count: 유저 수
+
+    Returns:
+        새로 만든 유저 수
+    """
+
+    user_dao = user_service.user_dao
+    pool = app.extensions['database']
+    password = user_service.hasher.hash(PASSWORD)
+    chunk_size = app.config.get('BULK_INSERT_CHUNK_SIZE', 500)
+
+    connection = pool.get_connection()
+    try:
+        if not user_dao.get_existing_login_ids([ADMIN_LOGIN_ID], connection):
+            admin = {
+                'login_id': ADMIN_LOGIN_ID,
+                'password': password,
+                'permission_type_id': 1,
+                'name': '벤치어드민',
+                'memo': None
+            }
+            admin['account_id'] = user_dao.create_account(admin, connection)
+            user_dao.create_admin(admin, connection)
+
+        created = 0
+        for start in range(0, user_count, chunk_size):
+            login_ids = [user_login_id(index) for index in range(start, min(start + chunk_size, user_count))]
+            existing = user_dao.get_existing_login_ids(login_ids, connection)
+            chunk = [
+                {
+                    'login_id': login_id,
+                    'password': password,
+                    'permission_type_id': 2,
+                    'name': USER_NAME,
+                    'email': login_id + '@bench.com',
+                    'birth_date': None,
+                    'memo': None
+                }
+                for login_id in login_ids if login_id not in existing
+            ]
+            if not chunk:
+                continue
+
+            account_ids = user_dao.bulk_create_accounts(chunk, connection)
+            for data in chunk:
+                data['account_id'] = account_ids[data['login_id']]
+            user_dao.bulk_create_users(chunk, connection)
+            created += len(chunk)
+
+        connection.commit()
+        return created
+
+    finally:
+        pool.release(connection)
+
+
+class TestClientDriver:
+    """
+        Flask 테스트 클라이언트로 요청 (스레드마다 클라이언트 하나)
+    """
+
+    name = 'test_client'
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, headers=None, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, headers=headers, json=body)
+        return response.status_code, response.data
+
+    def close(self):
+        pass
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+        HTTP/1.1 keep-alive 요청 처리기
+
+        헤더와 본문을 나눠 쓰므로 TCP_NODELAY가 없으면 Nagle과 delayed ACK로 요청마다 약 40ms씩 늦어집니다.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class WSGIServerDriver:
+    """
+        werkzeug WSGI 서버로 요청 (스레드마다 keep-alive 연결 하나)
+    """
+
+    name = 'wsgi'
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveRequestHandler)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, name='benchmark-wsgi', daemon=True)
+        self.thread.start()
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def request(self, method, path, headers=None, body=None):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection('127.0.0.1', self.port)
+            connection.connect()
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._connections.append(connection)
+
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Scenarios:
+    """
+        엔드포인트별 요청 생성
+
+        make(이름, 순번)은 (method, path, headers, body, 성공 상태 코드)를 돌려줍니다.
+    """
+
+    def __init__(self, driver, user_count):
+        self.user_count = user_count
+        self.run_id = format(int(time.time() * 1000), 'x')
+        self._sign_up_counter = itertools.count()
+
+        self.admin_token = self.login(driver, ADMIN_LOGIN_ID)
+        self.user_tokens = [self.login(driver, user_login_id(index)) for index in range(min(user_count, 10))]
+
+    @staticmethod
+    def login(driver, login_id):
+        _, data = driver.request('POST', '/login', body={'login_id': login_id, 'password': PASSWORD})
+        result = json.loads(data)
+        if 'token' not in result:
+            raise RuntimeError('LOGIN_FAILED {} {}'.format(login_id, result))
+        return result['token']
+
+    def make(self, endpoint, sequence):
+        if endpoint == 'sign_up':
+            login_id = 'su{}{}'.format(self.run_id, next(self._sign_up_counter))
+            body = {'login_id': login_id, 'password': PASSWORD, 'name': USER_NAME, 'email': login_id + '@bench.com'}
+            return 'POST', '/sign-up', None, body, 200
+
+        if endpoint == 'login':
+            body = {'login_id': user_login_id(sequence % self.user_count), 'password': PASSWORD}
+            return 'POST', '/login', None, body, 200
+
+        if endpoint == 'users':
+            return 'GET', '/users?limit=10', {'Authorization': self.admin_token}, None, 200
+
+        if endpoint == 'my_page':
+            token = self.user_tokens[sequence % len(self.user_tokens)]
+            return 'GET', '/my-page', {'Authorization': token}, None, 200
+
+        raise ValueError('UNKNOWN_ENDPOINT ' + endpoint)
+
+
+ENDPOINT_NAMES = {
+    'sign_up': 'sign_up_view',
+    'login': 'login_view',
+    'users': 'user_view',
+    'my_page': 'user_detail_view'
+}
+
+
+def percentile(sorted_values, ratio):
+    """
+        nearest-rank 백분위수
+    """
+
+    if not sorted_values:
+        return 0
+    return sorted_values[max(0, math.ceil(ratio * len(sorted_values)) - 1)]
+
+
+def query_totals(app, endpoint):
+    histogram = app.extensions['metrics'].get('apptest_request_queries')
+    return histogram.totals((ENDPOINT_NAMES[endpoint],)) if histogram else (0, 0)
+
+
+def run_level(app, driver, scenarios, endpoint, concurrency, requests):
+    """
+        동시 요청 수 하나 실행
+
+    Args:
+        app: Flask 객체
+        driver: TestClientDriver 혹은 WSGIServerDriver
+        scenarios: Scenarios
+        endpoint: ENDPOINTS 중 하나
+        concurrency: 동시 요청 수 (스레드 수)
+        requests: 전체 요청 수
+
+    Returns:
+        결과 딕셔너리
+    """
+
+    per_worker = max(1, requests // concurrency)
+    sequence = itertools.count()
+
+    def work(_):
+        latencies, errors = [], 0
+        for _ in range(per_worker):
+            method, path, headers, body, expected = scenarios.make(endpoint, next(sequence))
+            started_at = time.perf_counter()
+            try:
+                status, _ = driver.request(method, path, headers, body)
+            except Exception:
+                status = None
+            latencies.append(time.perf_counter() - started_at)
+            if status != expected:
+                errors += 1
+        return latencies, errors
+
+    count_before, queries_before = query_totals(app, endpoint)
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(work, range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    count_after, queries_after = query_totals(app, endpoint)
+
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    counted = count_after - count_before
+    return {
+        'driver': driver.name,
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'throughput': len(latencies) / elapsed,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'queries_per_request': (queries_after - queries_before) / counted if counted else None
+    }
+
+
+def benchmark_config(args):
+    if args.sqlite:
+        database = {'path': args.sqlite}
+    else:
+        database = database_from_args(args)
+
+    config = {
+        'DATABASE_BACKEND': 'sqlite' if args.sqlite else 'mysql',
+        'DB': dict(database, pool_max_size=max(args.concurrency) + 2),
+        'JWT_SECRET_KEY': 'benchmark',
+        'JWT_ALGORITHM': 'HS256',
+        'METRICS_ENABLED': True,
+        'COUNTER_RECONCILE_ENABLED': True,
+        'COUNTER_RECONCILE_INTERVAL': 0,
+        'AVAILABILITY_FILTER_ENABLED': True,
+        'AVAILABILITY_FILTER_REBUILD_INTERVAL': 0
+    }
+    if args.bcrypt_rounds:
+        config['BCRYPT_ROUNDS'] = args.bcrypt_rounds
+    return config
+
+
+def run(args):
+    app = create_app(benchmark_config(args))
+    app.debug = False
+    user_service = app.extensions['services'].user_service
+
+    created = seed(app, user_service, args.users)
+    print('seeded {} users ({} new)'.format(args.users, created), file=sys.stderr)
+
+    drivers = {'test_client': TestClientDriver, 'wsgi': WSGIServerDriver}
+    results = []
+    for driver_name in args.drivers:
+        driver = drivers[driver_name](app)
+        try:
+            scenarios = Scenarios(driver, args.users)
+            for endpoint in args.endpoints:
+                # 연결, 캐시 준비
+                run_level(app, driver, scenarios, endpoint, 1, min(args.requests, 20))
+                for concurrency in args.concurrency:
+                    result = run_level(app, driver, scenarios, endpoint, concurrency, args.requests)
+                    results.append(result)
+                    print('{driver:<12}{endpoint:<10}c={concurrency:<4}{throughput:>10.1f} req/s'
+                          '  p50={p50_ms:.2f}ms p95={p95_ms:.2f}ms p99={p99_ms:.2f}ms errors={errors}'.format(**result),
+                          file=sys.stderr)
+        finally:
+            driver.close()
+
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database_backend': app.config['DATABASE_BACKEND'],
+            'users': args.users,
+            'requests': args.requests,
+            'bcrypt_rounds': user_service.hasher.rounds
+        },
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+        기준 결과와 비교
+
+        같은 (driver, endpoint, concurrency)끼리 비교해서
+        처리량이 threshold 비율보다 많이 줄었거나 p95가 많이 늘었으면 회귀로 봅니다.
+
+    Args:
+        baseline: 기준 결과 딕셔너리
+        current: 비교할 결과 딕셔너리
+        threshold: 허용 비율 (0.1이면 10%)
+
+    Returns:
+        [(항목 이름, 처리량 변화율, p95 변화율, 회귀 여부)]
+    """
+
+    def key(result):
+        return result['driver'], result['endpoint'], result['concurrency']
+
+    baseline_results = {key(result): result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = baseline_results.get(key(result))
+        if base is None:
+            continue
+
+        throughput_change = result['throughput'] / base['throughput'] - 1 if base['throughput'] else 0
+        p95_change = result['p95_ms'] / base['p95_ms'] - 1 if base['p95_ms'] else 0
+        regressed = throughput_change < -threshold or p95_change > threshold
+        rows.append(('{} {} c={}'.format(*key(result)), throughput_change, p95_change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엔드포인트 벤치마크')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='벤치마크 실행')
+    add_database_arguments(run_parser)
+    run_parser.add_argument('--sqlite', metavar='PATH', help='MySQL 대신 사용할 SQLite 데이터베이스 파일')
+    run_parser.add_argument('--users', type=int, default=1000, help='벤치마크 유저 수')
+    run_parser.add_argument('--requests', type=int, default=500, help='동시 요청 수마다 실행할 요청 수')
+    run_parser.add_argument('--concurrency', type=lambda value: [int(v) for v in value.split(',')], default=[1, 4, 16])
+    run_parser.add_argument('--endpoints', type=lambda value: value.split(','), default=list(ENDPOINTS))
+    run_parser.add_argument('--drivers', type=lambda value: value.split(','), default=['test_client', 'wsgi'])
+    run_parser.add_argument('--bcrypt-rounds', type=int, help='BCRYPT_ROUNDS (없으면 기본값)')
+    run_parser.add_argument('--output', help='결과 JSON 파일 (없으면 표준 출력)')
+
+    compare_parser = commands.add_parser('compare', help='기준 결과와 비교')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='허용 비율 (기본값 0.1)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        result = json.dumps(run(args), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(result + '\n')
+        else:
+            print(result)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    print('{:<36}{:>14}{:>10}'.format('case', 'throughput', 'p95'))
+    for name, throughput_change, p95_change, regressed in rows:
+        print('{:<36}{:>+13.1%}{:>+10.1%}{}'.format(
+            name, throughput_change, p95_change, '  REGRESSION' if regressed else ''))
+    sys.exit(1 if any(regressed for *_, regressed in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
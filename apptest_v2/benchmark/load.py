@@ -0,0 +1,672 @@
+"""
+    부하 생성기
+
+    실행 중인 apptest_v2 서버에 실제와 비슷한 요청 비율(--mix)로 부하를 줍니다.
+        sign_up: /sign-up을 --sign-up-burst개씩 동시에 (가입이 몰리는 상황)
+        login: /login (--login-format, --login-range의 유저)
+        my_page: 미리 /login으로 받은 토큰으로 /my-page 조회 (ETag가 있으면 If-None-Match)
+        users: 어드민 토큰으로 /users를 next_cursor를 따라 --pages 페이지까지 넘기고 처음부터 다시
+    closed: --concurrency개 worker가 응답을 받은 뒤(--think-time 후) 다음 요청을 보냄
+    open: 응답과 상관없이 초당 --rate번 시나리오 시작 (--arrival constant, poisson)
+        응답 시간을 예정된 시작 시각부터 재므로 서버가 밀리면 대기 시간까지 응답 시간에 포함됩니다.
+
+    엔드포인트별로 --interval초마다 요청 수, 에러율, p50/p95/p99를 출력하고
+    끝나면 전체 응답 시간 히스토그램, 상태 코드별 수, 구간별 기록을 JSON으로 저장합니다.
+    기대한 상태 코드(users, my_page는 304 포함)가 아니거나 연결 에러, 시간 초과면 에러로 셉니다.
+    토큰이 401을 받으면 다시 로그인해서 바꿉니다.
+
+    앱을 import하지 않고 표준 라이브러리만 사용하므로 서버와 다른 곳에서 실행할 수 있습니다.
+    기본 계정은 benchmark.endpoints가 만드는 유저(benchuser0000000~, benchadmin)입니다.
+    scripts.generate_dataset으로 만든 데이터는 --login-format genu{:07d} --login-range 첫id:끝id
+    --admin-login-id gena0000001 --password password1처럼 지정합니다. (삭제된 계정의 로그인은 에러로 셈)
+    /sign-up은 실행할 때마다 유저가 늘어나므로 부하 테스트 전용 데이터베이스에서 실행합니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m benchmark.load --url http://127.0.0.1:6000 --mode closed --concurrency 32 --duration 60
+        python -m benchmark.load --mode open --rate 200 --arrival poisson --mix sign_up=1,login=2,my_page=20,users=4 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import ssl
+import sys
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = ('sign_up', 'login', 'my_page', 'users')
+
+DEFAULT_MIX = 'sign_up=1,login=4,my_page=12,users=3'
+
+EXPECTED_STATUSES = {
+    'sign_up': (200,),
+    'login': (200,),
+    'my_page': (200, 304),
+    'users': (200, 304)
+}
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+USER_NAME = '부하유저'
+
+
+def parse_mix(value):
+    """
+        --mix 값 변환
+
+    Args:
+        value: 'sign_up=1,login=4,...' (없는 엔드포인트는 0)
+
+    Returns:
+        {엔드포인트: 가중치}
+
+    Raises:
+        argparse.ArgumentTypeError: 모르는 엔드포인트, 잘못된 가중치
+    """
+
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError('UNKNOWN_ENDPOINT ' + name)
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError('INVALID_WEIGHT ' + item)
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError('INVALID_WEIGHT ' + item)
+
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError('EMPTY_MIX')
+    return mix
+
+
+def parse_range(value):
+    start, _, stop = value.partition(':')
+    try:
+        start, stop = int(start), int(stop)
+    except ValueError:
+        raise argparse.ArgumentTypeError('INVALID_RANGE ' + value)
+    if start >= stop:
+        raise argparse.ArgumentTypeError('INVALID_RANGE ' + value)
+    return start, stop
+
+
+def percentile(sorted_values, ratio):
+    """
+        nearest-rank 백분위수
+    """
+
+    if not sorted_values:
+        return 0
+    return sorted_values[max(0, math.ceil(ratio * len(sorted_values)) - 1)]
+
+
+class HTTPConnection:
+    """
+        asyncio 스트림 위의 HTTP/1.1 연결 하나
+
+        서버가 Connection: close를 보내거나 HTTP/1.0으로 응답하면 reusable이 False가 됩니다.
+    """
+
+    def __init__(self, reader, writer, host_header):
+        self.reader = reader
+        self.writer = writer
+        self.host_header = host_header
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host, port, ssl_context, host_header):
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return cls(reader, writer, host_header)
+
+    async def request(self, method, path, headers, body):
+        """
+            요청 하나 보내고 응답 읽기
+
+        Args:
+            method: HTTP 메서드
+            path: 경로와 쿼리 문자열
+            headers: 헤더 딕셔너리
+            body: 본문 bytes (없으면 None)
+
+        Returns:
+            (상태 코드, 헤더 딕셔너리(소문자 이름), 본문 bytes)
+
+        Raises:
+            ConnectionResetError: 응답 전에 서버가 연결을 닫음
+        """
+
+        lines = ['{} {} HTTP/1.1'.format(method, path), 'Host: ' + self.host_header]
+        for name, value in headers.items():
+            lines.append('{}: {}'.format(name, value))
+        if body is not None:
+            lines.append('Content-Length: {}'.format(len(body)))
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + (body or b''))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('CONNECTION_CLOSED')
+        version, status = status_line.split(None, 2)[:2]
+
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        connection_header = response_headers.get('connection', '').lower()
+        if connection_header == 'close' or (version == b'HTTP/1.0' and connection_header != 'keep-alive'):
+            self.reusable = False
+
+        status = int(status)
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            data = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            data = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            data = await self.reader.read()
+            self.reusable = False
+
+        return status, response_headers, data
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if not size:
+                # trailer
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+
+class ConnectionPool:
+    """
+        keep-alive 연결 풀
+
+        동시에 size개까지 연결을 사용하고 나머지 요청은 연결이 반납될 때까지 기다립니다.
+        재사용한 연결이 응답 전에 닫혀 있으면 (서버의 keep-alive 시간 초과) 새 연결로 한 번 다시 보냅니다.
+    """
+
+    def __init__(self, url, size, timeout):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError('UNSUPPORTED_SCHEME ' + url)
+
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.host_header = parts.netloc
+        self.ssl_context = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.timeout = timeout
+
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def request(self, method, path, headers=None, body=None):
+        """
+            요청
+
+        Args:
+            method: HTTP 메서드
+            path: 경로와 쿼리 문자열
+            headers: 헤더 딕셔너리
+            body: JSON으로 보낼 값 (없으면 None)
+
+        Returns:
+            (상태 코드, 헤더 딕셔너리, 본문 bytes)
+        """
+
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        async with self._semaphore:
+            for retry in (False, True):
+                reused = bool(self._idle) and not retry
+                connection = self._idle.pop() if reused else await asyncio.wait_for(
+                    HTTPConnection.open(self.host, self.port, self.ssl_context, self.host_header), self.timeout)
+                try:
+                    result = await asyncio.wait_for(connection.request(method, path, headers, payload), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+
+                if connection.reusable:
+                    self._idle.append(connection)
+                else:
+                    connection.close()
+                return result
+
+    def close(self):
+        for connection in self._idle:
+            connection.close()
+        self._idle = []
+
+
+class LatencyRecorder:
+    """
+        엔드포인트별 응답 시간 기록
+
+        전체 결과와 --interval초 구간별 결과를 함께 모읍니다. (이벤트 루프 하나에서만 사용)
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+        self.windows = {}
+
+    def record(self, endpoint, latency, status, error):
+        """
+            요청 하나 기록
+
+        Args:
+            endpoint: ENDPOINTS 중 하나
+            latency: 응답 시간(초)
+            status: 상태 코드 혹은 예외 이름
+            error: 에러 여부
+
+        Returns:
+            None
+        """
+
+        window = int((time.perf_counter() - self.started_at) // self.interval)
+        self.latencies.setdefault(endpoint, []).append(latency)
+        statuses = self.statuses.setdefault(endpoint, {})
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + error
+
+        entry = self.windows.setdefault(window, {}).setdefault(endpoint, [[], 0])
+        entry[0].append(latency)
+        entry[1] += error
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @staticmethod
+    def describe(latencies, errors):
+        latencies = sorted(latencies)
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'error_rate': errors / len(latencies) if latencies else 0,
+            'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'max_ms': latencies[-1] * 1000 if latencies else 0
+        }
+
+    def window(self, index):
+        """
+            구간 하나의 엔드포인트별 결과
+
+        Returns:
+            [구간 결과 딕셔너리]
+        """
+
+        return [
+            dict(self.describe(latencies, errors), second=index * self.interval, endpoint=endpoint)
+            for endpoint, (latencies, errors) in sorted(self.windows.get(index, {}).items())
+        ]
+
+    def summary(self):
+        """
+            전체 결과
+
+        Returns:
+            {엔드포인트: 결과 딕셔너리 (throughput, statuses, histogram 포함)}
+        """
+
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        summary = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            for latency in latencies:
+                index = next(
+                    (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency * 1000 <= bound),
+                    len(LATENCY_BUCKETS_MS)
+                )
+                counts[index] += 1
+
+            summary[endpoint] = dict(
+                self.describe(latencies, self.errors[endpoint]),
+                throughput=len(latencies) / elapsed if elapsed else 0,
+                statuses=self.statuses[endpoint],
+                histogram={'le_ms': list(LATENCY_BUCKETS_MS) + ['+Inf'], 'counts': counts}
+            )
+        return summary
+
+    def timeline(self):
+        return [result for index in sorted(self.windows) for result in self.window(index)]
+
+
+class LoadTest:
+    """
+        시나리오 실행
+
+        토큰, /users 커서, ETag는 모든 worker가 함께 사용합니다.
+    """
+
+    def __init__(self, args, pool, recorder):
+        self.args = args
+        self.pool = pool
+        self.recorder = recorder
+        self.random = random.Random(args.seed)
+
+        self.run_id = format(int(time.time() * 1000), 'x')
+        self.sign_up_sequence = 0
+        self.admin_token = None
+        self.user_tokens = []
+        self.users_cursor = None
+        self.users_page = 0
+        self.etags = {}
+
+        names = [name for name in ENDPOINTS if args.mix.get(name)]
+        self.scenario_names = names
+        self.scenario_weights = [args.mix[name] for name in names]
+
+    def login_id(self):
+        return self.args.login_format.format(self.random.randrange(*self.args.login_range))
+
+    async def login(self, login_id):
+        status, _, data = await self.pool.request(
+            'POST', '/login', body={'login_id': login_id, 'password': self.args.password})
+        result = json.loads(data or b'{}')
+        if status != 200 or 'token' not in result:
+            raise RuntimeError('LOGIN_FAILED {} {} {}'.format(login_id, status, result))
+        return result['token']
+
+    async def mint_tokens(self):
+        """
+            어드민 토큰과 유저 토큰 --tokens개 받기
+
+            로그인에 실패한 유저(삭제된 계정 등)는 다른 유저로 다시 시도합니다.
+        """
+
+        if self.args.mix.get('users'):
+            self.admin_token = await self.login(self.args.admin_login_id)
+
+        if not self.args.mix.get('my_page'):
+            return
+
+        attempts = 0
+        while len(self.user_tokens) < self.args.tokens:
+            if attempts > self.args.tokens * 3:
+                raise RuntimeError('LOGIN_FAILED {} tokens minted'.format(len(self.user_tokens)))
+            needed = self.args.tokens - len(self.user_tokens)
+            attempts += needed
+            results = await asyncio.gather(
+                *[self.login(self.login_id()) for _ in range(needed)], return_exceptions=True)
+            self.user_tokens.extend([token for token in results if not isinstance(token, Exception)])
+
+    async def call(self, endpoint, method, path, started_at, headers=None, body=None):
+        """
+            요청 하나 보내고 기록
+
+        Args:
+            endpoint: 기록할 엔드포인트 이름
+            method, path, headers, body: 요청
+            started_at: 응답 시간을 잴 기준 시각 (open 모드는 예정된 시작 시각)
+
+        Returns:
+            (상태 코드, 헤더, 본문), 연결 에러, 시간 초과면 None
+        """
+
+        try:
+            response = await self.pool.request(method, path, headers, body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            self.recorder.record(endpoint, time.perf_counter() - started_at, type(e).__name__, True)
+            return None
+
+        status = response[0]
+        self.recorder.record(
+            endpoint, time.perf_counter() - started_at, status, status not in EXPECTED_STATUSES[endpoint])
+        return response
+
+    async def conditional_get(self, endpoint, path, token, started_at):
+        """
+            이전 ETag로 If-None-Match를 붙여서 GET
+        """
+
+        headers = {'Authorization': token}
+        key = (path, token)
+        if key in self.etags:
+            headers['If-None-Match'] = self.etags[key]
+
+        response = await self.call(endpoint, 'GET', path, started_at, headers)
+        if response is not None and 'etag' in response[1]:
+            self.etags[key] = response[1]['etag']
+        return response
+
+    async def sign_up(self, started_at):
+        async def one():
+            self.sign_up_sequence += 1
+            login_id = 'ld{}{}'.format(self.run_id, self.sign_up_sequence)
+            body = {
+                'login_id': login_id,
+                'password': self.args.password,
+                'name': USER_NAME,
+                'email': login_id + '@load.com'
+            }
+            await self.call('sign_up', 'POST', '/sign-up', started_at, body=body)
+
+        await asyncio.gather(*[one() for _ in range(self.args.sign_up_burst)])
+
+    async def login_scenario(self, started_at):
+        body = {'login_id': self.login_id(), 'password': self.args.password}
+        await self.call('login', 'POST', '/login', started_at, body=body)
+
+    async def my_page(self, started_at):
+        index = self.random.randrange(len(self.user_tokens))
+        response = await self.conditional_get('my_page', '/my-page', self.user_tokens[index], started_at)
+        if response is not None and response[0] == 401:
+            self.user_tokens[index] = await self.login(self.login_id())
+
+    async def users(self, started_at):
+        path = '/users?limit={}'.format(self.args.page_size)
+        if self.users_cursor:
+            path += '&cursor=' + self.users_cursor
+
+        response = await self.conditional_get('users', path, self.admin_token, started_at)
+        if response is None:
+            return
+        if response[0] == 401:
+            self.admin_token = await self.login(self.args.admin_login_id)
+            return
+
+        next_cursor = json.loads(response[2]).get('next_cursor') if response[0] == 200 else self.users_cursor
+        self.users_page += 1
+        if next_cursor is None or self.users_page >= self.args.pages:
+            self.users_cursor, self.users_page = None, 0
+        else:
+            self.users_cursor = next_cursor
+
+    async def scenario(self, started_at):
+        name = self.random.choices(self.scenario_names, self.scenario_weights)[0]
+        handler = self.login_scenario if name == 'login' else getattr(self, name)
+        try:
+            await handler(started_at)
+        except RuntimeError as e:
+            # 토큰을 다시 받지 못함
+            print(e, file=sys.stderr)
+
+    async def closed_loop(self, deadline):
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.scenario(time.perf_counter())
+                if self.args.think_time:
+                    await asyncio.sleep(self.random.expovariate(1 / self.args.think_time))
+
+        await asyncio.gather(*[worker() for _ in range(self.args.concurrency)])
+
+    async def open_loop(self, deadline):
+        """
+            초당 --rate번 시나리오 시작
+
+            진행 중인 시나리오가 --max-in-flight개를 넘으면 시작하지 않고 dropped로 셉니다.
+        """
+
+        tasks = set()
+        scheduled_at = time.perf_counter()
+        while scheduled_at < deadline:
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if len(tasks) >= self.args.max_in_flight:
+                self.recorder.record('dropped', 0, 'dropped', True)
+            else:
+                task = asyncio.ensure_future(self.scenario(scheduled_at))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if self.args.arrival == 'poisson':
+                scheduled_at += self.random.expovariate(self.args.rate)
+            else:
+                scheduled_at += 1 / self.args.rate
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+def print_window(results):
+    for result in results:
+        print('{second:>6.0f}s {endpoint:<10}{requests:>7} req  errors={error_rate:>6.1%}'
+              '  p50={p50_ms:.1f}ms p95={p95_ms:.1f}ms p99={p99_ms:.1f}ms'.format(**result), file=sys.stderr)
+
+
+async def report(recorder, stop):
+    """
+        --interval초마다 끝난 구간 출력
+    """
+
+    index = 0
+    while not stop.is_set():
+        wait = recorder.started_at + (index + 1) * recorder.interval - time.perf_counter()
+        try:
+            await asyncio.wait_for(stop.wait(), max(wait, 0))
+        except asyncio.TimeoutError:
+            pass
+        if not stop.is_set():
+            print_window(recorder.window(index))
+            index += 1
+
+
+async def run(args):
+    pool_size = args.concurrency * args.sign_up_burst if args.mode == 'closed' else args.connections
+    pool = ConnectionPool(args.url, pool_size, args.timeout)
+    try:
+        recorder = LatencyRecorder(args.interval)
+        load_test = LoadTest(args, pool, recorder)
+        await load_test.mint_tokens()
+        print('minted {} user tokens'.format(len(load_test.user_tokens)), file=sys.stderr)
+
+        recorder.started_at = time.perf_counter()
+        deadline = recorder.started_at + args.duration
+        stop = asyncio.Event()
+        reporter = asyncio.ensure_future(report(recorder, stop))
+        if args.mode == 'closed':
+            await load_test.closed_loop(deadline)
+        else:
+            await load_test.open_loop(deadline)
+        recorder.finish()
+        stop.set()
+        await reporter
+
+    finally:
+        pool.close()
+
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'url': args.url,
+            'mode': args.mode,
+            'concurrency': args.concurrency if args.mode == 'closed' else None,
+            'rate': args.rate if args.mode == 'open' else None,
+            'arrival': args.arrival if args.mode == 'open' else None,
+            'duration': args.duration,
+            'mix': args.mix,
+            'sign_up_burst': args.sign_up_burst
+        },
+        'summary': recorder.summary(),
+        'timeline': recorder.timeline()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 생성기')
+    parser.add_argument('--url', default='http://127.0.0.1:6000', help='서버 주소')
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help='시나리오 가중치 (기본값 {})'.format(DEFAULT_MIX))
+    parser.add_argument('--duration', type=float, default=30, help='실행 시간(초)')
+    parser.add_argument('--interval', type=float, default=1, help='구간 길이(초)')
+    parser.add_argument('--concurrency', type=int, default=16, help='closed: worker 수')
+    parser.add_argument('--think-time', type=float, default=0, help='closed: 요청 사이 평균 대기 시간(초, 지수 분포)')
+    parser.add_argument('--rate', type=float, default=50, help='open: 초당 시나리오 수')
+    parser.add_argument('--arrival', choices=('constant', 'poisson'), default='constant', help='open: 도착 간격')
+    parser.add_argument('--connections', type=int, default=64, help='open: 최대 연결 수')
+    parser.add_argument('--max-in-flight', type=int, default=10000, help='open: 진행 중인 시나리오 최대 수')
+    parser.add_argument('--timeout', type=float, default=10, help='요청 시간 초과(초)')
+    parser.add_argument('--sign-up-burst', type=int, default=5, help='sign_up 시나리오 한 번에 동시에 보낼 가입 요청 수')
+    parser.add_argument('--pages', type=int, default=5, help='users 시나리오에서 처음으로 돌아가기 전까지 넘길 페이지 수')
+    parser.add_argument('--page-size', type=int, default=10, help='users 시나리오의 limit')
+    parser.add_argument('--tokens', type=int, default=50, help='my_page에 사용할 유저 토큰 수')
+    parser.add_argument('--login-format', default='benchuser{:07d}', help='유저 login_id 형식')
+    parser.add_argument('--login-range', type=parse_range, default=(0, 1000), help='유저 번호 범위 (시작:끝, 끝 제외)')
+    parser.add_argument('--admin-login-id', default='benchadmin')
+    parser.add_argument('--password', default='bench1234', help='유저, 어드민 비밀번호')
+    parser.add_argument('--seed', type=int, help='난수 seed')
+    parser.add_argument('--output', help='결과 JSON 파일 (없으면 표준 출력)')
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    print('{:<10}{:>9}{:>10}{:>10}{:>10}{:>10}{:>10}'.format('endpoint', 'req/s', 'errors', 'p50', 'p95', 'p99', 'max'),
+          file=sys.stderr)
+    for endpoint, summary in result['summary'].items():
+        print('{:<10}{throughput:>9.1f}{error_rate:>10.1%}{p50_ms:>8.1f}ms{p95_ms:>8.1f}ms{p99_ms:>8.1f}ms{max_ms:>8.1f}ms'.format(
+            endpoint, **summary), file=sys.stderr)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+    DictCursor 행 딕셔너리와 __slots__ 레코드 비교
+
+    데이터베이스 없이 튜플 커서가 돌려주는 것과 같은 행을 만들어서
+    행 객체 생성, JSON 직렬화의 시간과 메모리를 비교합니다.
+        dict: DictCursor와 같은 방식 (dict(zip(컬럼, 행)))
+        record: UserRecord(*행)
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m benchmark.records
+        python -m benchmark.records --rows 1000 --repeat 200
+"""
+
+import argparse
+import datetime
+import json
+import time
+import tracemalloc
+
+from model.records import UserRecord
+from utils.custom_json_encoder import CustomJSONEncoder
+
+COLUMNS = UserRecord.__slots__
+
+
+def make_rows(count):
+    """
+        튜플 커서 행 생성
+
+    Args:
+        count: 행 수
+
+    Returns:
+        [튜플]
+    """
+
+    created_at = datetime.datetime(2021, 1, 1)
+    return [
+        (
+            index,
+            'user',
+            'testuser{}'.format(index),
+            '유저{}'.format(index),
+            'testuser{}@naver.com'.format(index),
+            datetime.date(2000, 1, 1),
+            '{}번째 테스트 유저입니다.'.format(index),
+            created_at + datetime.timedelta(seconds=index)
+        )
+        for index in range(count)
+    ]
+
+
+def build_dicts(rows):
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+
+def build_records(rows):
+    return UserRecord.from_rows(rows)
+
+
+def serialize(objects):
+    """
+        목록 응답 직렬화 (jsonify와 같은 인코더)
+    """
+
+    return json.dumps(objects, cls=CustomJSONEncoder, ensure_ascii=False)
+
+
+def serialize_lines(objects):
+    """
+        내보내기 응답 직렬화 (한 줄에 한 행)
+    """
+
+    return ''.join(json.dumps(row, cls=CustomJSONEncoder, ensure_ascii=False) + '\n' for row in objects)
+
+
+def measure_time(func, rows, repeat):
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        func(rows)
+    return (time.perf_counter() - started_at) / repeat
+
+
+def measure_memory(build, rows):
+    """
+        행 객체 목록이 차지하는 메모리
+
+    Returns:
+        바이트
+    """
+
+    tracemalloc.start()
+    objects = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def run(row_count, repeat):
+    rows = make_rows(row_count)
+    results = {}
+    for name, build in (('dict', build_dicts), ('record', build_records)):
+        objects = build(rows)
+        current = measure_memory(build, rows)
+        results[name] = {
+            'build_ms': measure_time(build, rows, repeat) * 1000,
+            'list_ms': measure_time(lambda rows: serialize(build(rows)), rows, repeat) * 1000,
+            'export_ms': measure_time(lambda rows: serialize_lines(build(rows)), rows, repeat) * 1000,
+            'memory_kb': current / 1024,
+            'bytes_per_row': current / row_count
+        }
+        assert serialize_lines(objects) == serialize_lines(build_dicts(rows))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DictCursor 행과 __slots__ 레코드 비교')
+    parser.add_argument('--rows', type=int, default=1000, help='행 수')
+    parser.add_argument('--repeat', type=int, default=100, help='반복 횟수')
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+
+    print('rows={} repeat={}'.format(args.rows, args.repeat))
+    print('{:<8}{:>12}{:>12}{:>12}{:>14}{:>14}'.format(
+        'type', 'build ms', 'list ms', 'export ms', 'memory KB', 'bytes/row'))
+    for name, result in results.items():
+        print('{:<8}{:>12.3f}{:>12.3f}{:>12.3f}{:>14.1f}{:>14.1f}'.format(
+            name, result['build_ms'], result['list_ms'], result['export_ms'],
+            result['memory_kb'], result['bytes_per_row']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+    flask_request_validator의 validate_params와 compile_params 비교
+
+    회원가입, 유저 목록 조회와 같은 Param으로 요청 하나를 검사하는 시간을 비교합니다.
+    두 방식의 검사 결과와 에러 메시지(demo_error_formatter)가 같은지도 확인합니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m benchmark.validation
+        python -m benchmark.validation --repeat 50000
+"""
+
+import argparse
+import time
+
+from flask import Flask
+from flask_request_validator import validate_params, Param, JSON, GET, Enum
+from flask_request_validator.error_formatter import demo_error_formatter
+from flask_request_validator.exceptions import InvalidRequestError
+
+from utils.rules import (
+    EmailRule,
+    LoginIdRule,
+    PasswordRule,
+    BirthDateRule,
+    NameRule,
+    MemoRule,
+    ZeroRule,
+    CursorRule
+)
+from utils.validation import compile_params
+
+SIGN_UP_PARAMS = (
+    Param('login_id', JSON, str, rules=[LoginIdRule()]),
+    Param('password', JSON, str, rules=[PasswordRule()]),
+    Param('name', JSON, str, rules=[NameRule()]),
+    Param('email', JSON, str, rules=[EmailRule()]),
+    Param('birth_date', JSON, str, required=False, rules=[BirthDateRule()]),
+    Param('memo', JSON, str, required=False, rules=[MemoRule()])
+)
+
+USER_LIST_PARAMS = (
+    Param('permission', GET, str, required=False, default='user', rules=[Enum('user', 'admin')]),
+    Param('offset', GET, str, required=False, default='0', rules=[ZeroRule()]),
+    Param('limit', GET, int, required=False, default=10),
+    Param('cursor', GET, str, required=False, rules=[CursorRule()])
+)
+
+CASES = (
+    ('sign_up', SIGN_UP_PARAMS, {
+        'method': 'POST',
+        'json': {
+            'login_id': 'testuser1',
+            'password': 'Abc123',
+            'name': '유저',
+            'email': 'testuser1@naver.com',
+            'birth_date': '2000-01-01'
+        }
+    }),
+    ('sign_up_invalid', SIGN_UP_PARAMS, {
+        'method': 'POST',
+        'json': {
+            'login_id': 'TEST',
+            'password': 'Abc123',
+            'name': 'user',
+            'email': 'testuser1@naver.com'
+        }
+    }),
+    ('user_list', USER_LIST_PARAMS, {
+        'method': 'GET',
+        'query_string': {'permission': 'admin', 'offset': '20', 'limit': '50'}
+    })
+)
+
+
+def view(valid):
+    return valid.get_json(), valid.get_params()
+
+
+def call(func):
+    """
+        검사 결과 혹은 포맷한 에러 메시지
+    """
+
+    try:
+        return func()
+    except InvalidRequestError as e:
+        return demo_error_formatter(e)
+
+
+def measure(func, repeat):
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        call(func)
+    return (time.perf_counter() - started_at) / repeat
+
+
+def run(repeat):
+    app = Flask(__name__)
+    results = []
+    for name, params, request_options in CASES:
+        library = validate_params(*params)(view)
+        compiled = compile_params(*params)(view)
+
+        with app.test_request_context('/', **request_options):
+            assert call(library) == call(compiled), name
+            results.append((
+                name,
+                measure(library, repeat) * 1000000,
+                measure(compiled, repeat) * 1000000
+            ))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='validate_params와 compile_params 비교')
+    parser.add_argument('--repeat', type=int, default=20000, help='반복 횟수')
+    args = parser.parse_args()
+
+    print('repeat={}'.format(args.repeat))
+    print('{:<18}{:>16}{:>16}{:>10}'.format('case', 'library us', 'compiled us', 'speedup'))
+    for name, library, compiled in run(args.repeat):
+        print('{:<18}{:>16.2f}{:>16.2f}{:>9.1f}x'.format(name, library, compiled, library / compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""
+    pytest 설정
+
+    이 파일이 있는 apptest_v2 디렉터리를 sys.path에 넣어서
+    테스트에서 앱과 같은 방식으로 (from model import ...) import 합니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m pytest -q
+"""
@@ -1 +1,19 @@
-from .user_dao import UserDao
\ No newline at end of file
+from .user_dao import UserDao
+from .sqlite_user_dao import SqliteUserDao
+from .records import UserRecord, AdminRecord, LoginRecord
+
+
+def create_user_dao(backend):
+    """
+        데이터베이스 백엔드에 맞는 Dao 생성
+
+    Args:
+        backend: mysql 혹은 sqlite (DATABASE_BACKEND)
+
+    Returns:
+        UserDao 혹은 SqliteUserDao
+    """
+
+    if backend == 'sqlite':
+        return SqliteUserDao()
+    return UserDao()
@@ -0,0 +1,101 @@
+from operator import attrgetter
+
+
+class Record:
+    """
+        조회 결과 레코드
+
+        DictCursor의 행 딕셔너리 대신 튜플 커서의 행으로 만드는 __slots__ 객체입니다.
+        행마다 키 문자열과 해시 테이블을 만들지 않아 메모리를 적게 쓰고 빨리 만들어집니다.
+        필드 순서는 SELECT 컬럼 순서와 같아야 합니다.
+        JSON 응답은 CustomJSONEncoder가 to_dict로 변환합니다.
+        _hidden의 필드는 내부에서만 사용하고 (커서 생성 등) 응답에 넣지 않습니다.
+    """
+
+    __slots__ = ()
+    _hidden = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._values = attrgetter(*cls.__slots__)
+        cls._fields = tuple(name for name in cls.__slots__ if name not in cls._hidden)
+        cls._field_values = attrgetter(*cls._fields)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+            튜플 커서 행 목록으로 레코드 목록 생성
+
+        Args:
+            rows: 튜플 커서의 fetchall, fetchmany 결과
+
+        Returns:
+            [레코드]
+        """
+
+        return [cls(*row) for row in rows]
+
+    def to_dict(self):
+        return dict(zip(self._fields, self._field_values(self)))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values(self) == other._values(other)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__)
+        )
+
+
+class UserRecord(Record):
+    """
+        유저 목록 레코드
+
+        account_id는 다음 페이지 커서에만 사용하고 응답에는 넣지 않습니다.
+    """
+
+    __slots__ = ('account_id', 'permission_type', 'login_id', 'name', 'email', 'birth_date', 'memo', 'created_at')
+    _hidden = ('account_id',)
+
+    def __init__(self, account_id, permission_type, login_id, name, email, birth_date, memo, created_at):
+        self.account_id = account_id
+        self.permission_type = permission_type
+        self.login_id = login_id
+        self.name = name
+        self.email = email
+        self.birth_date = birth_date
+        self.memo = memo
+        self.created_at = created_at
+
+
+class AdminRecord(Record):
+    """
+        어드민 목록 레코드
+
+        account_id는 다음 페이지 커서에만 사용하고 응답에는 넣지 않습니다.
+    """
+
+    __slots__ = ('account_id', 'permission_type', 'login_id', 'name', 'memo', 'created_at')
+    _hidden = ('account_id',)
+
+    def __init__(self, account_id, permission_type, login_id, name, memo, created_at):
+        self.account_id = account_id
+        self.permission_type = permission_type
+        self.login_id = login_id
+        self.name = name
+        self.memo = memo
+        self.created_at = created_at
+
+
+class LoginRecord(Record):
+    """
+        로그인 레코드
+    """
+
+    __slots__ = ('id', 'password', 'permission_type_id')
+
+    def __init__(self, id, password, permission_type_id):
+        self.id = id
+        self.password = password
+        self.permission_type_id = permission_type_id
@@ -0,0 +1,201 @@
+import heapq
+from itertools import islice
+from operator import attrgetter
+
+from utils.enums import PermissionTypeEnum
+from utils.metrics import QUERY_METRICS, instrument_queries
+from .records import UserRecord
+from .user_dao import UserDao, USER_ONLY_FILTERS
+
+
+@instrument_queries(QUERY_METRICS)
+class SqliteUserDao(UserDao):
+    """
+        유저앱 SQLite Dao
+
+        SqliteConnection(utils/sqlite_connection.py)이 pymysql 형식 SQL을 변환하므로
+        MySQL 문법을 사용하는 메서드만 다시 작성합니다.
+    """
+
+    def get_user_list(self, data, connection):
+        """
+            유저 목록 조회
+
+            SQLite는 UNION ALL의 각 SELECT에 ORDER BY, LIMIT을 쓸 수 없으므로
+            permission이 all이면 유저와 어드민을 정렬 순서대로 offset + limit개씩 따로 조회한 뒤 합칩니다.
+            같은 프로세스 안에서 실행하므로 쿼리가 하나 늘어도 왕복 비용은 없습니다.
+            나머지는 UserDao.get_user_list와 같습니다.
+
+        Args:
+            data: 유저 정보 (UserDao.get_user_list와 같음)
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            [UserRecord] 혹은 [AdminRecord] (all이면 [UserRecord])
+        """
+
+        if data['permission'] != 'all' or any(data.get(name) is not None for name in USER_ONLY_FILTERS):
+            return super().get_user_list(data, connection)
+
+        offset = 0 if data.get('cursor') else data['offset']
+        branch = dict(data, offset=0, limit=offset + data['limit'])
+
+        try:
+            users = super().get_user_list(dict(branch, permission=PermissionTypeEnum.user.name), connection)
+            admins = [
+                UserRecord(admin.account_id, admin.permission_type, admin.login_id, admin.name,
+                           None, None, admin.memo, admin.created_at)
+                for admin in super().get_user_list(dict(branch, permission=PermissionTypeEnum.admin.name), connection)
+            ]
+
+            sort = data.get('sort') or 'created_at'
+            merged = heapq.merge(
+                users, admins, key=attrgetter(sort.lstrip('-'), 'account_id'), reverse=sort.startswith('-'))
+            return list(islice(merged, offset, offset + data['limit']))
+
+        except Exception as e:
+            raise e
+
+    def change_account_count(self, permission_type_id, delta, connection):
+        """
+            유저, 어드민 수 변경
+
+            SQLite는 쓰기가 데이터베이스 단위로 하나씩 실행되므로 슬롯을 나누지 않고 0번 행만 갱신합니다.
+            유저 목록 ETag(get_user_list_version)가 바뀌도록 version도 1 올립니다.
+            가입, 수정, 삭제와 같은 트랜잭션에서 실행해야 합니다. (수정은 delta 0)
+
+        Args:
+            permission_type_id: 권한 타입 아이디
+            delta: 변경할 수
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        sql = """
+            INSERT INTO account_counters (
+                permission_type_id
+                , slot
+                , count
+                , version
+            ) VALUES (
+                %(permission_type_id)s
+                , 0
+                , %(delta)s
+                , 1
+            )
+            ON CONFLICT (permission_type_id, slot) DO UPDATE SET
+                count = count + excluded.count
+                , version = version + 1;
+        """
+
+        params = {
+            'permission_type_id': permission_type_id,
+            'delta': delta
+        }
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+        except Exception as e:
+            raise e
+
+    def reconcile_account_count(self, permission_type_id, connection):
+        """
+            유저, 어드민 수 보정
+
+            SELECT ... FOR UPDATE가 없으므로 값을 바꾸지 않는 UPDATE로 쓰기 트랜잭션(BEGIN IMMEDIATE)을 먼저 시작합니다.
+            commit 할 때까지 다른 가입, 삭제는 기다리므로 세는 동안 수가 바뀌지 않습니다.
+            목록 버전은 UserDao.reconcile_account_count처럼 합계에 1을 더해서 옮깁니다.
+
+        Args:
+            permission_type_id: 권한 타입 아이디
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            (보정 전 수, 실제 수)
+        """
+
+        lock_sql = """
+            UPDATE
+                account_counters
+            SET
+                count = count
+            WHERE
+                permission_type_id = %(permission_type_id)s;
+        """
+
+        counted_sql = """
+            SELECT
+                COALESCE(SUM(count), 0)
+                , COALESCE(SUM(version), 0)
+            FROM
+                account_counters
+            WHERE
+                permission_type_id = %(permission_type_id)s;
+        """
+
+        user_sql = """
+            SELECT
+                COUNT(*)
+            FROM
+                users
+            WHERE
+                is_deleted = 0;
+        """
+
+        admin_sql = """
+            SELECT
+                COUNT(*)
+            FROM
+                admins
+            WHERE
+                is_deleted = 0;
+        """
+
+        delete_sql = """
+            DELETE FROM
+                account_counters
+            WHERE
+                permission_type_id = %(permission_type_id)s;
+        """
+
+        insert_sql = """
+            INSERT INTO account_counters (
+                permission_type_id
+                , slot
+                , count
+                , version
+            ) VALUES (
+                %(permission_type_id)s
+                , 0
+                , %(count)s
+                , %(version)s
+            );
+        """
+
+        params = {'permission_type_id': permission_type_id}
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(lock_sql, params)
+                cursor.execute(counted_sql, params)
+                counted, version = cursor.fetchone()
+                counted = int(counted)
+
+                if permission_type_id == PermissionTypeEnum.admin.value:
+                    cursor.execute(admin_sql)
+                elif permission_type_id == PermissionTypeEnum.user.value:
+                    cursor.execute(user_sql)
+                actual = cursor.fetchone()[0]
+
+                if counted != actual:
+                    cursor.execute(delete_sql, params)
+                    cursor.execute(insert_sql, dict(params, count=actual, version=int(version) + 1))
+
+                return counted, actual
+
+        except Exception as e:
+            raise e
@@ -1,14 +1,51 @@
+import random
+
 import pymysql
 
-from utils.custom_exceptions import DatabaseException
+from utils.custom_exceptions import DatabaseException, DuplicateEntryError
 from utils.enums import PermissionTypeEnum
+from utils.metrics import QUERY_METRICS, instrument_queries
+from .records import UserRecord, AdminRecord, LoginRecord
+
+DUPLICATE_ENTRY = 1062
+COUNTER_SLOTS = 16
+
+USER_LIST_SORTS = ('created_at', '-created_at', 'name', '-name')
+USER_LIST_FILTERS = ('name', 'created_from', 'created_to', 'email_domain', 'birth_date_from', 'birth_date_to')
+USER_ONLY_FILTERS = ('email_domain', 'birth_date_from', 'birth_date_to')
+
+
+def duplicate_entry_error(e):
+    """
+        IntegrityError를 DuplicateEntryError로 변환
+
+        unique 인덱스 중복(1062)이 아니면 원래 에러를 그대로 돌려줍니다.
+        메시지 형식: Duplicate entry 'value' for key 'table.index_name'
 
+    Args:
+        e: pymysql IntegrityError
 
+    Returns:
+        DuplicateEntryError 혹은 e
+    """
+
+    if e.args[0] != DUPLICATE_ENTRY:
+        return e
+
+    key = e.args[1].rsplit("'", 2)[-2]
+    return DuplicateEntryError(key.split('.')[-1])
+
+
+@instrument_queries(QUERY_METRICS)
 class UserDao:
     """
         유저앱 Dao
+
+        record_queries가 True인 객체만 쿼리 지표를 기록합니다. (앱마다 init_service_metrics가 지정)
     """
 
+    record_queries = False
+
     def login_id_duplicate_check(self, login_id, connection):
         """
             로그인 아이디 중복 체크
@@ -74,52 +111,759 @@ class UserDao:
 
         try:
             with connection.cursor() as cursor:
-                cursor.execute(sql, email)
-                result = cursor.fetchone()[0]
-                return result
+                cursor.execute(sql, email)
+                result = cursor.fetchone()[0]
+                return result
+        except Exception as e:
+            raise e
+
+    def get_active_login_ids(self, connection, batch_size=10000):
+        """
+            사용 중인 login_id 전체 조회
+
+            서버 측 커서(SSCursor)로 uq_accounts_active_login_id 인덱스만 읽습니다.
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            batch_size: 한 번에 읽을 행 수
+
+        Returns:
+            login_id 제너레이터
+        """
+
+        sql = """
+            SELECT
+                active_login_id
+            FROM
+                accounts
+            WHERE
+                active_login_id IS NOT NULL;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(sql)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row[0]
+
+        except Exception as e:
+            raise e
+
+    def get_active_emails(self, connection, batch_size=10000):
+        """
+            사용 중인 이메일 전체 조회
+
+            서버 측 커서(SSCursor)로 uq_users_active_email 인덱스만 읽습니다.
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            batch_size: 한 번에 읽을 행 수
+
+        Returns:
+            이메일 제너레이터
+        """
+
+        sql = """
+            SELECT
+                active_email
+            FROM
+                users
+            WHERE
+                active_email IS NOT NULL;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(sql)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row[0]
+
+        except Exception as e:
+            raise e
+
+    def create_account(self, data, connection):
+        """
+            account 생성
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            account_id
+
+        Raises:
+            DuplicateEntryError: 사용 중인 login_id
+        """
+
+        sql = """
+            INSERT INTO accounts (
+                login_id
+                , password
+                , permission_type_id
+            ) VALUES (
+                %(login_id)s
+                , %(password)s
+                , %(permission_type_id)s
+            );
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.execute(sql, data)
+                if not result:
+                    raise DatabaseException('ACCOUNT_CREATE_FAIL')
+                return cursor.lastrowid
+
+        except pymysql.err.IntegrityError as e:
+            raise duplicate_entry_error(e)
+
+        except Exception as e:
+            raise e
+
+    def create_user(self, data, connection):
+        """
+            유저 생성
+
+            같은 트랜잭션에서 유저 수를 1 늘립니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+
+        Raises:
+            DuplicateEntryError: 사용 중인 email
+        """
+
+        sql = """
+            INSERT INTO users (
+                account_id
+                , name
+                , email
+                , birth_date
+                , memo
+            ) VALUES (
+                %(account_id)s
+                , %(name)s
+                , %(email)s
+                , %(birth_date)s
+                , %(memo)s
+            );
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.execute(sql, data)
+                if not result:
+                    raise DatabaseException('USER_CREATE_FAIL')
+
+            self.change_account_count(PermissionTypeEnum.user.value, 1, connection)
+
+        except pymysql.err.IntegrityError as e:
+            raise duplicate_entry_error(e)
+
+        except Exception as e:
+            raise e
+
+    def create_admin(self, data, connection):
+        """
+            어드민 생성
+
+            같은 트랜잭션에서 어드민 수를 1 늘립니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        sql = """
+            INSERT INTO admins (
+                account_id
+                , name
+                , memo
+            ) VALUES (
+                %(account_id)s
+                , %(name)s
+                , %(memo)s
+            );
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.execute(sql, data)
+                if not result:
+                    raise DatabaseException('ADMIN_CREATE_FAIL')
+
+            self.change_account_count(PermissionTypeEnum.admin.value, 1, connection)
+
+        except Exception as e:
+            raise e
+
+    def update_password(self, data, connection):
+        """
+            비밀번호 수정
+
+        Args:
+            data: 유저 정보
+                account_id: 어카운트 아이디
+                password: 암호화된 비밀번호
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        sql = """
+            UPDATE
+                accounts
+            SET
+                password = %(password)s
+            WHERE
+                id = %(account_id)s;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.execute(sql, data)
+                if not result:
+                    raise DatabaseException('PASSWORD_UPDATE_FAIL')
+
+        except Exception as e:
+            raise e
+
+    def get_existing_login_ids(self, login_ids, connection):
+        """
+            사용 중인 login_id 조회
+
+            uq_accounts_active_login_id 인덱스로 한 번에 조회합니다.
+
+        Args:
+            login_ids: [로그인 아이디]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            사용 중인 login_id 집합
+        """
+
+        sql = """
+            SELECT
+                active_login_id
+            FROM
+                accounts
+            WHERE
+                active_login_id IN %s;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (login_ids,))
+                return {row[0] for row in cursor.fetchall()}
+
+        except Exception as e:
+            raise e
+
+    def get_existing_emails(self, emails, connection):
+        """
+            사용 중인 이메일 조회
+
+            uq_users_active_email 인덱스로 한 번에 조회합니다.
+
+        Args:
+            emails: [이메일]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            사용 중인 이메일 집합
+        """
+
+        sql = """
+            SELECT
+                active_email
+            FROM
+                users
+            WHERE
+                active_email IN %s;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (emails,))
+                return {row[0] for row in cursor.fetchall()}
+
+        except Exception as e:
+            raise e
+
+    def bulk_create_accounts(self, data, connection):
+        """
+            account 여러 개 생성
+
+            executemany로 한 번의 다중 행 INSERT를 실행합니다.
+
+        Args:
+            data: [유저 정보]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            {login_id: account_id}
+
+        Raises:
+            DuplicateEntryError: 사용 중인 login_id
+        """
+
+        sql = """
+            INSERT INTO accounts (
+                login_id
+                , password
+                , permission_type_id
+            ) VALUES (
+                %(login_id)s
+                , %(password)s
+                , %(permission_type_id)s
+            );
+        """
+
+        id_sql = """
+            SELECT
+                id
+                , active_login_id
+            FROM
+                accounts
+            WHERE
+                active_login_id IN %s;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.executemany(sql, data)
+                if result != len(data):
+                    raise DatabaseException('ACCOUNT_CREATE_FAIL')
+
+                cursor.execute(id_sql, ([row['login_id'] for row in data],))
+                return {login_id: account_id for account_id, login_id in cursor.fetchall()}
+
+        except pymysql.err.IntegrityError as e:
+            raise duplicate_entry_error(e)
+
+        except Exception as e:
+            raise e
+
+    def bulk_create_users(self, data, connection):
+        """
+            유저 여러 명 생성
+
+            같은 트랜잭션에서 유저 수를 생성한 수만큼 늘립니다.
+
+        Args:
+            data: [유저 정보]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+
+        Raises:
+            DuplicateEntryError: 사용 중인 email
+        """
+
+        sql = """
+            INSERT INTO users (
+                account_id
+                , name
+                , email
+                , birth_date
+                , memo
+            ) VALUES (
+                %(account_id)s
+                , %(name)s
+                , %(email)s
+                , %(birth_date)s
+                , %(memo)s
+            );
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                result = cursor.executemany(sql, data)
+                if result != len(data):
+                    raise DatabaseException('USER_CREATE_FAIL')
+
+            self.change_account_count(PermissionTypeEnum.user.value, len(data), connection)
+
+        except pymysql.err.IntegrityError as e:
+            raise duplicate_entry_error(e)
+
+        except Exception as e:
+            raise e
+
+    def savepoint(self, name, connection):
+        """
+            savepoint 생성
+
+            트랜잭션 전체가 아니라 savepoint 이후의 변경만 되돌릴 수 있게 합니다.
+
+        Args:
+            name: savepoint 이름 (SQL에 그대로 들어가므로 상수만 사용)
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SAVEPOINT {};'.format(name))
+
+        except Exception as e:
+            raise e
+
+    def rollback_to_savepoint(self, name, connection):
+        """
+            savepoint 이후 변경 되돌리기
+
+            되돌린 뒤 savepoint를 해제합니다.
+
+        Args:
+            name: savepoint 이름
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('ROLLBACK TO SAVEPOINT {};'.format(name))
+                cursor.execute('RELEASE SAVEPOINT {};'.format(name))
+
+        except Exception as e:
+            raise e
+
+    def release_savepoint(self, name, connection):
+        """
+            savepoint 해제 (변경은 트랜잭션에 남음)
+
+        Args:
+            name: savepoint 이름
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('RELEASE SAVEPOINT {};'.format(name))
+
+        except Exception as e:
+            raise e
+
+    def get_login_user_information(self, login_id, connection):
+        """
+            유저 id, password, permission_type_id 조호;
+
+        Args:
+            login_id: 로그인 아이디
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            LoginRecord (없으면 None)
+        """
+
+        sql = """
+            SELECT
+                id
+                , password
+                , permission_type_id
+            FROM
+                accounts
+            WHERE
+                login_id = %s
+                AND is_deleted = 0;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, login_id)
+                result = cursor.fetchone()
+                return LoginRecord(*result) if result else None
+
+        except Exception as e:
+            raise e
+
+    def get_user_list_version(self, data, connection):
+        """
+            유저 목록 버전 조회
+
+            account_counters의 슬롯 행에서 유저, 어드민 수와 목록 버전 합계를 조회합니다.
+            가입, 수정, 삭제와 같은 트랜잭션에서 change_account_count가 version을 올리므로
+            목록이 바뀌면 항상 값이 달라집니다.
+            count_users처럼 유저 수와 상관없이 일정한 시간에 조회합니다.
+
+        Args:
+            data: 유저 정보
+                permission: user, admin 혹은 all
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            (삭제되지 않은 유저, 어드민 수, 목록 버전)
+        """
+
+        sql = """
+            SELECT
+                COALESCE(SUM(count), 0)
+                , COALESCE(SUM(version), 0)
+            FROM
+                account_counters
+            WHERE
+                permission_type_id IN %(permission_type_ids)s
+        """
+
+        if data['permission'] == 'all':
+            permission_type_ids = [permission_type.value for permission_type in PermissionTypeEnum]
+        else:
+            permission_type_ids = [PermissionTypeEnum[data['permission']].value]
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, {'permission_type_ids': permission_type_ids})
+                count, version = cursor.fetchone()
+                return int(count), int(version)
+
         except Exception as e:
             raise e
 
-    def create_account(self, data, connection):
+    def get_user_list(self, data, connection):
         """
-            account 생성
+            유저 목록 조회
+
+            sort 순서로 정렬하고 같은 값은 account_id로 정렬합니다. (기본값 created_at)
+            cursor가 있으면 커서 다음 행부터 조회하고 (키셋 페이지네이션)
+            없으면 offset을 사용합니다.
+
+            필터는 모두 인덱스로 조회합니다. (schema.sql의 idx_users_*, idx_admins_*)
+                name: 이름 앞부분 일치
+                created_from, created_to: 생성일 범위 (created_to는 포함하지 않음)
+                email_domain, birth_date_from, birth_date_to: 유저만 가능
+
+            permission이 all이면 유저와 어드민을 UNION ALL 쿼리 하나로 조회합니다.
+            각 테이블에서 정렬 순서대로 필요한 행 수만 읽은 뒤 합쳐서 다시 정렬합니다.
+            account_id는 두 테이블에서 겹치지 않으므로 커서 순서가 유지됩니다.
+            어드민 행의 email, birth_date는 NULL입니다.
+            유저 전용 필터가 있으면 어드민은 조회하지 않습니다.
 
         Args:
             data: 유저 정보
+                permission: user, admin 혹은 all
+                sort: USER_LIST_SORTS 중 하나 (-는 내림차순)
+                cursor: (sort, 정렬 값, account_id) 혹은 None
+                offset: cursor가 없을 때 건너뛸 행 수
+                limit: 조회할 행 수
+                USER_LIST_FILTERS: 값이 있는 것만 사용
             connection: 데이터베이스 연결 객체
 
         Returns:
-            account_id
+            [UserRecord] 혹은 [AdminRecord] (all이면 [UserRecord])
         """
 
-        sql = """
-            INSERT INTO accounts (
-                login_id
-                , password
-                , permission_type_id
-            ) VALUES (
-                %(login_id)s
-                , %(password)s
-                , %(permission_type_id)s
-            );
+        user_sql = """
+            SELECT
+                users.account_id AS account_id
+                , permission_types.permission_type AS permission_type
+                , accounts.login_id AS login_id
+                , users.name AS name
+                , users.email AS email
+                , users.birth_date AS birth_date
+                , users.memo AS memo
+                , users.created_at AS created_at
+            FROM
+                users
+                INNER JOIN accounts
+                    ON accounts.id = users.account_id
+                INNER JOIN permission_types
+                    ON accounts.permission_type_id = permission_types.id
+            WHERE
+                accounts.is_deleted = 0
+                AND users.is_deleted = 0
+        """
+
+        admin_sql = """
+            SELECT
+                admins.account_id AS account_id
+                , permission_types.permission_type AS permission_type
+                , accounts.login_id AS login_id
+                , admins.name AS name
+                , admins.memo AS memo
+                , admins.created_at AS created_at
+            FROM
+                admins
+                INNER JOIN accounts
+                    ON accounts.id = admins.account_id
+                INNER JOIN permission_types
+                    ON accounts.permission_type_id = permission_types.id
+            WHERE
+                accounts.is_deleted = 0
+                AND admins.is_deleted = 0
+        """
+
+        union_admin_sql = """
+            SELECT
+                admins.account_id AS account_id
+                , permission_types.permission_type AS permission_type
+                , accounts.login_id AS login_id
+                , admins.name AS name
+                , NULL AS email
+                , NULL AS birth_date
+                , admins.memo AS memo
+                , admins.created_at AS created_at
+            FROM
+                admins
+                INNER JOIN accounts
+                    ON accounts.id = admins.account_id
+                INNER JOIN permission_types
+                    ON accounts.permission_type_id = permission_types.id
+            WHERE
+                accounts.is_deleted = 0
+                AND admins.is_deleted = 0
+        """
+
+        filter_sql = {
+            'name': """
+                AND {table}.name LIKE %(name_prefix)s""",
+            'created_from': """
+                AND {table}.created_at >= %(created_from)s""",
+            'created_to': """
+                AND {table}.created_at < %(created_to)s""",
+            'email_domain': """
+                AND users.email_domain = %(email_domain)s""",
+            'birth_date_from': """
+                AND users.birth_date >= %(birth_date_from)s""",
+            'birth_date_to': """
+                AND users.birth_date <= %(birth_date_to)s"""
+        }
+
+        cursor_condition_sql = """
+                AND (
+                    {table}.{column} {operator} %(cursor_value)s
+                    OR (
+                        {table}.{column} = %(cursor_value)s
+                        AND {table}.account_id {operator} %(cursor_account_id)s
+                    )
+                )
+        """
+
+        order_sql = """
+            ORDER BY
+                {table}.{column} {direction}
+                , {table}.account_id {direction}
+            LIMIT
+                %(offset)s, %(limit)s
+        """
+
+        union_sql = """
+            (
+                {user_sql}
+                {user_condition_sql}
+                ORDER BY
+                    users.{column} {direction}
+                    , users.account_id {direction}
+                LIMIT
+                    %(branch_limit)s
+            )
+            UNION ALL
+            (
+                {admin_sql}
+                {admin_condition_sql}
+                ORDER BY
+                    admins.{column} {direction}
+                    , admins.account_id {direction}
+                LIMIT
+                    %(branch_limit)s
+            )
+            ORDER BY
+                {column} {direction}
+                , account_id {direction}
+            LIMIT
+                %(offset)s, %(limit)s;
         """
 
+        sort = data.get('sort') or 'created_at'
+        column = sort.lstrip('-')
+        descending = sort.startswith('-')
+        order = {
+            'column': column,
+            'direction': 'DESC' if descending else 'ASC',
+            'operator': '<' if descending else '>'
+        }
+
+        params = dict(data)
+        if data.get('name'):
+            params['name_prefix'] = data['name'] + '%'
+
+        page_cursor = data.get('cursor')
+        if page_cursor:
+            _, params['cursor_value'], params['cursor_account_id'] = page_cursor
+            params['offset'] = 0
+
+        filters = [name for name in USER_LIST_FILTERS if data.get(name) is not None]
+        permission = data['permission']
+        if permission == 'all' and any(name in USER_ONLY_FILTERS for name in filters):
+            permission = PermissionTypeEnum.user.name
+
+        def condition(table):
+            sql = ''.join(filter_sql[name] for name in filters).format(table=table)
+            if page_cursor:
+                sql += cursor_condition_sql.format(table=table, **order)
+            return sql
+
+        if permission == 'all':
+            params['branch_limit'] = params['offset'] + params['limit']
+            sql, record_type = union_sql.format(
+                user_sql=user_sql,
+                user_condition_sql=condition('users'),
+                admin_sql=union_admin_sql,
+                admin_condition_sql=condition('admins'),
+                **order
+            ), UserRecord
+        else:
+            if permission == PermissionTypeEnum.admin.name:
+                sql, table, record_type = admin_sql, 'admins', AdminRecord
+            elif permission == PermissionTypeEnum.user.name:
+                sql, table, record_type = user_sql, 'users', UserRecord
+            sql += condition(table) + order_sql.format(table=table, **order)
+
         try:
             with connection.cursor() as cursor:
-                result = cursor.execute(sql, data)
-                if not result:
-                    raise DatabaseException('ACCOUNT_CREATE_FAIL')
-                return cursor.lastrowid
+                cursor.execute(sql, params)
+                return record_type.from_rows(cursor.fetchall())
 
         except Exception as e:
             raise e
 
-    def create_user(self, data, connection):
+    def change_account_count(self, permission_type_id, delta, connection):
         """
-            유저 생성
+            유저, 어드민 수 변경
+
+            모든 가입이 같은 행을 갱신하면 commit 할 때까지 행 잠금을 기다리므로
+            COUNTER_SLOTS개의 행 중 하나를 골라서 갱신하고 조회할 때 합칩니다.
+            유저 목록 ETag(get_user_list_version)가 바뀌도록 version도 1 올립니다.
+            가입, 수정, 삭제와 같은 트랜잭션에서 실행해야 합니다. (수정은 delta 0)
 
         Args:
-            data: 유저 정보
+            permission_type_id: 권한 타입 아이디
+            delta: 변경할 수
             connection: 데이터베이스 연결 객체
 
         Returns:
@@ -127,111 +871,184 @@ class UserDao:
         """
 
         sql = """
-            INSERT INTO users (
-                account_id
-                , name
-                , email
-                , birth_date
-                , memo
+            INSERT INTO account_counters (
+                permission_type_id
+                , slot
+                , count
+                , version
             ) VALUES (
-                %(account_id)s
-                , %(name)s
-                , %(email)s
-                , %(birth_date)s
-                , %(memo)s
-            );
+                %(permission_type_id)s
+                , %(slot)s
+                , %(delta)s
+                , 1
+            )
+            ON DUPLICATE KEY UPDATE
+                count = count + VALUES(count)
+                , version = version + 1;
         """
 
+        params = {
+            'permission_type_id': permission_type_id,
+            'slot': random.randrange(COUNTER_SLOTS),
+            'delta': delta
+        }
+
         try:
             with connection.cursor() as cursor:
-                result = cursor.execute(sql, data)
-                if not result:
-                    raise DatabaseException('USER_CREATE_FAIL')
+                cursor.execute(sql, params)
 
         except Exception as e:
             raise e
 
-    def create_admin(self, data, connection):
+    def count_users(self, data, connection):
         """
-            어드민 생성
+            삭제되지 않은 유저, 어드민 수 조회
+
+            account_counters의 슬롯 행만 합치므로 유저 수와 상관없이 일정한 시간에 조회합니다.
 
         Args:
             data: 유저 정보
+                permission: user, admin 혹은 all
             connection: 데이터베이스 연결 객체
 
         Returns:
-            None
+            수
         """
 
         sql = """
-            INSERT INTO admins (
-                account_id
-                , name
-                , memo
-            ) VALUES (
-                %(account_id)s
-                , %(name)s
-                , %(memo)s
-            );
+            SELECT
+                COALESCE(SUM(count), 0)
+            FROM
+                account_counters
+            WHERE
+                permission_type_id IN %(permission_type_ids)s
         """
 
+        if data['permission'] == 'all':
+            permission_type_ids = [permission_type.value for permission_type in PermissionTypeEnum]
+        else:
+            permission_type_ids = [PermissionTypeEnum[data['permission']].value]
+
         try:
             with connection.cursor() as cursor:
-                result = cursor.execute(sql, data)
-                if not result:
-                    raise DatabaseException('ADMIN_CREATE_FAIL')
+                cursor.execute(sql, {'permission_type_ids': permission_type_ids})
+                return int(cursor.fetchone()[0])
 
         except Exception as e:
             raise e
 
-    def get_login_user_information(self, login_id, connection):
+    def reconcile_account_count(self, permission_type_id, connection):
         """
-            유저 id, password, permission_type_id 조호;
+            유저, 어드민 수 보정
+
+            카운터 행을 잠근 뒤 실제 수를 세서 하나의 행으로 다시 씁니다.
+            잠그는 동안 가입, 삭제의 카운터 갱신은 기다리므로
+            세는 동안 일어난 변경도 보정한 값 위에 더해집니다.
+            목록 버전은 슬롯 합계에 1을 더해서 옮기므로 줄어들지 않고 ETag도 바뀝니다. (total이 바뀜)
+            실제 수는 is_deleted 인덱스만 읽지만 테이블 크기에 비례하므로 주기 작업에서만 실행합니다.
 
         Args:
-            login_id: 로그인 아이디
+            permission_type_id: 권한 타입 아이디
             connection: 데이터베이스 연결 객체
 
         Returns:
-            유저 정보 객체
+            (보정 전 수, 실제 수)
         """
 
-        sql = """
+        lock_sql = """
             SELECT
-                id
-                , password
-                , permission_type_id
+                COALESCE(SUM(count), 0)
+                , COALESCE(SUM(version), 0)
             FROM
-                accounts
+                account_counters
             WHERE
-                login_id = %s
-                AND is_deleted = 0;
+                permission_type_id = %(permission_type_id)s
+            FOR UPDATE;
+        """
+
+        user_sql = """
+            SELECT
+                COUNT(*)
+            FROM
+                users
+            WHERE
+                is_deleted = 0;
+        """
+
+        admin_sql = """
+            SELECT
+                COUNT(*)
+            FROM
+                admins
+            WHERE
+                is_deleted = 0;
+        """
+
+        delete_sql = """
+            DELETE FROM
+                account_counters
+            WHERE
+                permission_type_id = %(permission_type_id)s;
+        """
+
+        insert_sql = """
+            INSERT INTO account_counters (
+                permission_type_id
+                , slot
+                , count
+                , version
+            ) VALUES (
+                %(permission_type_id)s
+                , 0
+                , %(count)s
+                , %(version)s
+            );
         """
 
+        params = {'permission_type_id': permission_type_id}
+
         try:
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                cursor.execute(sql, login_id)
-                result = cursor.fetchone()
-                return result
+            with connection.cursor() as cursor:
+                cursor.execute(lock_sql, params)
+                counted, version = cursor.fetchone()
+                counted = int(counted)
+
+                if permission_type_id == PermissionTypeEnum.admin.value:
+                    cursor.execute(admin_sql)
+                elif permission_type_id == PermissionTypeEnum.user.value:
+                    cursor.execute(user_sql)
+                actual = cursor.fetchone()[0]
+
+                if counted != actual:
+                    cursor.execute(delete_sql, params)
+                    cursor.execute(insert_sql, dict(params, count=actual, version=int(version) + 1))
+
+                return counted, actual
 
         except Exception as e:
             raise e
 
-    def get_user_list(self, data, connection):
+    def export_user_list(self, data, connection):
         """
-            유저 목록 조회
+            유저 목록 내보내기
+
+            서버 측 커서(SSCursor)로 결과를 메모리에 모두 올리지 않고 나눠서 읽습니다.
+            제너레이터를 모두 소비할 때까지 연결에 다른 쿼리를 실행할 수 없습니다.
 
         Args:
             data: 유저 정보
+                permission: user 혹은 admin
+                batch_size: 한 번에 읽을 행 수
             connection: 데이터베이스 연결 객체
 
         Returns:
-            [유저객체]
+            [UserRecord] 혹은 [AdminRecord] 묶음을 돌려주는 제너레이터
         """
 
         user_sql = """
             SELECT
-                permission_types.permission_type AS permission_type
+                users.account_id AS account_id
+                , permission_types.permission_type AS permission_type
                 , accounts.login_id AS login_id
                 , users.name AS name
                 , users.email AS email
@@ -247,38 +1064,81 @@ class UserDao:
             WHERE
                 accounts.is_deleted = 0
                 AND users.is_deleted = 0
-            LIMIT 
-                %(offset)s, %(limit)s;
+            ORDER BY
+                users.created_at
+                , users.account_id;
         """
 
         admin_sql = """
             SELECT
-                permission_types.permission_type AS permission_type
+                admins.account_id AS account_id
+                , permission_types.permission_type AS permission_type
                 , accounts.login_id AS login_id
                 , admins.name AS name
                 , admins.memo AS memo
                 , admins.created_at AS created_at
             FROM
-                accounts
-                INNER JOIN admins
+                admins
+                INNER JOIN accounts
                     ON accounts.id = admins.account_id
                 INNER JOIN permission_types
                     ON accounts.permission_type_id = permission_types.id
             WHERE
                 accounts.is_deleted = 0
                 AND admins.is_deleted = 0
-            LIMIT 
-                %(offset)s, %(limit)s;
+            ORDER BY
+                admins.created_at
+                , admins.account_id;
         """
 
+        if data['permission'] == PermissionTypeEnum.admin.name:
+            sql, record_type = admin_sql, AdminRecord
+        elif data['permission'] == PermissionTypeEnum.user.name:
+            sql, record_type = user_sql, UserRecord
+
         try:
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                if data['permission'] == PermissionTypeEnum.admin.name:
-                    cursor.execute(admin_sql, data)
-                elif data['permission'] == PermissionTypeEnum.user.name:
-                    cursor.execute(user_sql, data)
-                result = cursor.fetchall()
-                return result
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(sql)
+
+                while True:
+                    rows = cursor.fetchmany(data['batch_size'])
+                    if not rows:
+                        break
+                    yield record_type.from_rows(rows)
+
+        except Exception as e:
+            raise e
+
+    def get_account_version(self, data, connection):
+        """
+            account 버전 조회
+
+            유저 정보를 수정하거나 삭제할 때마다 1씩 늘어납니다. (ETag 생성용)
+            기본 키로 조회하므로 유저 정보 조회의 조인보다 가볍습니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            version (삭제된 account면 None)
+        """
+
+        sql = """
+            SELECT
+                version
+            FROM
+                accounts
+            WHERE
+                id = %(account_id)s
+                AND is_deleted = 0
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, data)
+                result = cursor.fetchone()
+                return result[0] if result else None
 
         except Exception as e:
             raise e
@@ -292,12 +1152,13 @@ class UserDao:
             connection: 데이터베이스 연결 객체
 
         Returns:
-            유저 객체
+            유저 객체 (account version 포함)
         """
 
         user_sql = """
             SELECT
-                permission_types.permission_type AS permission_type
+                accounts.version AS version
+                , permission_types.permission_type AS permission_type
                 , accounts.login_id AS login_id
                 , users.name AS name
                 , users.email AS email
@@ -318,7 +1179,8 @@ class UserDao:
 
         admin_sql = """
             SELECT
-                permission_types.permission_type AS permission_type
+                accounts.version AS version
+                , permission_types.permission_type AS permission_type
                 , accounts.login_id AS login_id
                 , admins.name AS name
                 , admins.memo AS memo
@@ -422,51 +1284,23 @@ class UserDao:
         except Exception as e:
             raise e
 
-    def put_email_duplicate_check(self, data, connection):
-        """
-            이메일 중복 검사
-
-        Args:
-            data: 유저 정보
-            connection: 데이터베이스 연결 객체
-
-        Returns:
-            0 혹은 1
-        """
-
-        sql = """
-            SELECT 
-                EXISTS
-                    (
-                        SELECT 
-                            account_id
-                        FROM
-                            users
-                        WHERE
-                            account_id != %(account_id)s
-                            AND email = %(email)s
-                            AND is_deleted = 0
-                    )
-                AS user_exist;
-        """
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute(sql, data)
-                result = cursor.fetchone()[0]
-                return result
-        except Exception as e:
-            raise e
-
     def put_user_information(self, data, connection):
         """
             유저 정보 수정
 
+            기존 정보와 같은 값으로 수정해도 FOUND_ROWS 플래그로 인해 성공으로 처리됩니다.
+            account version과 목록 버전(change_account_count)을 1 올려서 ETag가 바뀌도록 합니다.
+            (바뀐 정보가 없으면 서비스에서 update_exist_check로 먼저 끝내므로 호출되지 않음)
+
         Args:
             data: 유저 정보
             connection: 데이터베이스 연결 객체
 
         Returns:
             None
+
+        Raises:
+            DuplicateEntryError: 다른 유저가 사용 중인 email
         """
 
         user_sql = """
@@ -491,6 +1325,15 @@ class UserDao:
                 account_id = %(account_id)s
         """
 
+        version_sql = """
+            UPDATE
+                accounts
+            SET
+                version = version + 1
+            WHERE
+                id = %(account_id)s
+        """
+
         try:
             with connection.cursor() as cursor:
                 if data['permission_type_id'] == PermissionTypeEnum.user.value:
@@ -501,6 +1344,13 @@ class UserDao:
                 if not result:
                     raise DatabaseException('USER_INFORMATION_UPDATE_FAIL')
 
+                cursor.execute(version_sql, data)
+
+            self.change_account_count(data['permission_type_id'], 0, connection)
+
+        except pymysql.err.IntegrityError as e:
+            raise duplicate_entry_error(e)
+
         except Exception as e:
             raise e
 
@@ -617,6 +1467,9 @@ class UserDao:
             유저 삭제
 
             논리 삭제
+            account version을 1 올려서 유저 상세 정보 ETag가 바뀌도록 합니다.
+            실제로 삭제 상태가 바뀐 경우에만 같은 트랜잭션에서 유저, 어드민 수를 1 줄이고 목록 버전을 올립니다.
+            (동시에 두 번 삭제해도 한 번만 줄어듦)
 
         Args:
             data: 유저 정보
@@ -631,6 +1484,7 @@ class UserDao:
                 accounts
             SET
                 is_deleted = 1
+                , version = version + 1
             WHERE
                 id = %(account_id)s;
         """
@@ -641,7 +1495,8 @@ class UserDao:
             SET
                 is_deleted = 1
             WHERE
-                account_id = %(account_id)s;
+                account_id = %(account_id)s
+                AND is_deleted = 0;
         """
 
         admin_sql = """
@@ -650,16 +1505,20 @@ class UserDao:
             SET
                 is_deleted = 1
             WHERE
-                account_id = %(account_id)s;
+                account_id = %(account_id)s
+                AND is_deleted = 0;
         """
 
         try:
             with connection.cursor() as cursor:
                 cursor.execute(sql, data)
                 if data['permission_type_id'] == PermissionTypeEnum.admin.value:
-                    cursor.execute(admin_sql, data)
+                    deleted = cursor.execute(admin_sql, data)
                 elif data['permission_type_id'] == PermissionTypeEnum.user.value:
-                    cursor.execute(user_sql, data)
+                    deleted = cursor.execute(user_sql, data)
+
+            if deleted:
+                self.change_account_count(data['permission_type_id'], -deleted, connection)
 
         except Exception as e:
             raise e
@@ -0,0 +1,8 @@
+-- 삭제되지 않은 login_id, email 중복 방지 (회원가입, 정보 수정)
+ALTER TABLE accounts
+    ADD COLUMN active_login_id VARCHAR(30) AS (IF(is_deleted = 0, login_id, NULL)) STORED COMMENT '삭제되지 않은 아이디 (중복 방지용)'
+    , ADD UNIQUE KEY uq_accounts_active_login_id (active_login_id);
+
+ALTER TABLE users
+    ADD COLUMN active_email VARCHAR(411) AS (IF(is_deleted = 0, email, NULL)) STORED COMMENT '삭제되지 않은 이메일 (중복 방지용)'
+    , ADD UNIQUE KEY uq_users_active_email (active_email);
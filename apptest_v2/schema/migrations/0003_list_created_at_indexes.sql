@@ -0,0 +1,6 @@
+-- 유저, 어드민 목록 created_at 정렬과 커서 페이지네이션 (get_user_list, export_user_list)
+ALTER TABLE users
+    ADD KEY idx_users_is_deleted_created_at (is_deleted, created_at);
+
+ALTER TABLE admins
+    ADD KEY idx_admins_is_deleted_created_at (is_deleted, created_at);
@@ -0,0 +1,3 @@
+-- 유저 정보 ETag (get_account_version)
+ALTER TABLE accounts
+    ADD COLUMN version INT NOT NULL DEFAULT 0 COMMENT '수정 버전 (ETag 생성용)' AFTER is_deleted;
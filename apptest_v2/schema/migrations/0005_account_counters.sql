@@ -0,0 +1,23 @@
+-- 유저, 어드민 수 (count_users, change_account_count, reconcile_account_count)
+-- version: 가입, 수정, 삭제와 같은 트랜잭션에서 change_account_count가 올리는 유저 목록 버전
+-- (get_user_list_version이 accounts 전체를 세지 않고 카운터 슬롯 행만 읽어서 ETag를 만듦)
+CREATE TABLE account_counters (
+	permission_type_id INT NOT NULL COMMENT '권한 타입 아이디'
+    , slot INT NOT NULL COMMENT '슬롯 (가입이 몰릴 때 행 잠금을 나누기 위함)'
+    , count INT NOT NULL DEFAULT 0 COMMENT '삭제되지 않은 유저, 어드민 수'
+    , version BIGINT NOT NULL DEFAULT 0 COMMENT '유저 목록 버전 (슬롯 합계)'
+    , PRIMARY KEY (permission_type_id, slot)
+    , CONSTRAINT FK_account_counters_permission_type_id_permission_types_id
+		FOREIGN KEY (permission_type_id) REFERENCES permission_types (id)
+		ON DELETE RESTRICT ON UPDATE RESTRICT
+) COMMENT '유저, 어드민 수 테이블 (슬롯 합계)';
+
+-- 이미 있는 유저, 어드민 수로 시작
+INSERT INTO account_counters (
+	permission_type_id
+    , slot
+    , count
+)
+SELECT 1, 0, COUNT(*) FROM admins WHERE is_deleted = 0
+UNION ALL
+SELECT 2, 0, COUNT(*) FROM users WHERE is_deleted = 0;
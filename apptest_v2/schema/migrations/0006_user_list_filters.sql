@@ -0,0 +1,9 @@
+-- 유저 목록 이름 정렬, 이름 / 이메일 도메인 / 생년월일 필터 (get_user_list)
+ALTER TABLE users
+    ADD COLUMN email_domain VARCHAR(255) AS (SUBSTRING_INDEX(email, '@', -1)) STORED COMMENT '이메일 도메인 (검색용)' AFTER active_email
+    , ADD KEY idx_users_is_deleted_name (is_deleted, name)
+    , ADD KEY idx_users_is_deleted_email_domain_created_at (is_deleted, email_domain, created_at)
+    , ADD KEY idx_users_is_deleted_birth_date (is_deleted, birth_date);
+
+ALTER TABLE admins
+    ADD KEY idx_admins_is_deleted_name (is_deleted, name);
@@ -0,0 +1,8 @@
+-- login_id_duplicate_check, get_login_user_information
+-- 로그인에 필요한 password, permission_type_id까지 포함해서 테이블을 읽지 않음
+ALTER TABLE accounts
+    ADD KEY idx_accounts_login_id_is_deleted_password_permission_type_id (login_id, is_deleted, password, permission_type_id);
+
+-- email_duplicate_check (account_id는 기본 키라서 인덱스에 포함됨)
+ALTER TABLE users
+    ADD KEY idx_users_email_is_deleted (email, is_deleted);
@@ -1,3 +1,7 @@
+-- migrations/의 모든 마이그레이션을 적용한 것과 같은 스키마
+-- 스키마를 바꿀 때는 새 마이그레이션을 추가하고 이 파일도 같이 수정합니다.
+-- 이 파일로 만든 데이터베이스는 python -m scripts.migrate --baseline 으로 적용 기록을 남깁니다.
+
 DROP DATABASE IF EXISTS apptest_v2;
 CREATE DATABASE apptest_v2;
 USE apptest_v2;
@@ -16,7 +20,11 @@ CREATE TABLE accounts (
     , created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '생성일'
     , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일'
     , is_deleted INT NOT NULL DEFAULT 0 COMMENT '삭제 여부'
+    , version INT NOT NULL DEFAULT 0 COMMENT '수정 버전 (ETag 생성용)'
+    , active_login_id VARCHAR(30) AS (IF(is_deleted = 0, login_id, NULL)) STORED COMMENT '삭제되지 않은 아이디 (중복 방지용)'
     , PRIMARY KEY(id)
+    , UNIQUE KEY uq_accounts_active_login_id (active_login_id)
+    , KEY idx_accounts_login_id_is_deleted_password_permission_type_id (login_id, is_deleted, password, permission_type_id)
     , CONSTRAINT FK_accounts_permission_type_id_permission_types_id
 		FOREIGN KEY (permission_type_id) REFERENCES permission_types (id)
 		ON DELETE RESTRICT ON UPDATE RESTRICT
@@ -32,7 +40,15 @@ CREATE TABLE users (
     , created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '생성일'
     , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일'
     , is_deleted INT NOT NULL DEFAULT 0 COMMENT '삭제 여부'
+    , active_email VARCHAR(411) AS (IF(is_deleted = 0, email, NULL)) STORED COMMENT '삭제되지 않은 이메일 (중복 방지용)'
+    , email_domain VARCHAR(255) AS (SUBSTRING_INDEX(email, '@', -1)) STORED COMMENT '이메일 도메인 (검색용)'
     , PRIMARY KEY (account_id)
+    , UNIQUE KEY uq_users_active_email (active_email)
+    , KEY idx_users_email_is_deleted (email, is_deleted)
+    , KEY idx_users_is_deleted_created_at (is_deleted, created_at)
+    , KEY idx_users_is_deleted_name (is_deleted, name)
+    , KEY idx_users_is_deleted_email_domain_created_at (is_deleted, email_domain, created_at)
+    , KEY idx_users_is_deleted_birth_date (is_deleted, birth_date)
     , CONSTRAINT FK_users_accunts_id_accounts_id
 		FOREIGN KEY (account_id) REFERENCES accounts (id)
 		ON DELETE RESTRICT ON UPDATE RESTRICT
@@ -46,11 +62,24 @@ CREATE TABLE admins (
     , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일'
     , is_deleted INT NOT NULL DEFAULT 0 COMMENT '삭제 여부'
     , PRIMARY KEY (account_id)
+    , KEY idx_admins_is_deleted_created_at (is_deleted, created_at)
+    , KEY idx_admins_is_deleted_name (is_deleted, name)
     , CONSTRAINT FK_admins_accunts_id_accounts_id
 		FOREIGN KEY (account_id) REFERENCES accounts (id)
 		ON DELETE RESTRICT ON UPDATE RESTRICT
 ) COMMENT '어드민 정보 테이블';
 
+CREATE TABLE account_counters (
+	permission_type_id INT NOT NULL COMMENT '권한 타입 아이디'
+    , slot INT NOT NULL COMMENT '슬롯 (가입이 몰릴 때 행 잠금을 나누기 위함)'
+    , count INT NOT NULL DEFAULT 0 COMMENT '삭제되지 않은 유저, 어드민 수'
+    , version BIGINT NOT NULL DEFAULT 0 COMMENT '유저 목록 버전 (슬롯 합계)'
+    , PRIMARY KEY (permission_type_id, slot)
+    , CONSTRAINT FK_account_counters_permission_type_id_permission_types_id
+		FOREIGN KEY (permission_type_id) REFERENCES permission_types (id)
+		ON DELETE RESTRICT ON UPDATE RESTRICT
+) COMMENT '유저, 어드민 수 테이블 (슬롯 합계)';
+
 
 INSERT INTO permission_types (
 	id
@@ -101,3 +130,17 @@ begin
 	end while;
 end $$ 
 call user_data(); $$ 
+
+
+delimiter ;
+
+-- 위에서 넣은 유저, 어드민 수로 카운터 시작 (migrations/0005_account_counters.sql과 같음)
+-- 넣지 않으면 보정 작업(COUNTER_RECONCILE_ENABLED)이 돌기 전까지 total이 0입니다.
+INSERT INTO account_counters (
+	permission_type_id
+    , slot
+    , count
+)
+SELECT 1, 0, COUNT(*) FROM admins WHERE is_deleted = 0
+UNION ALL
+SELECT 2, 0, COUNT(*) FROM users WHERE is_deleted = 0;
@@ -0,0 +1,128 @@
+-- SQLite 스키마 (DATABASE_BACKEND = 'sqlite')
+-- migrations/의 0007까지 적용한 schema.sql과 같은 테이블, 인덱스입니다.
+-- MySQL 마이그레이션을 추가하거나 이 파일을 바꿀 때 user_version과
+-- utils/sqlite_connection.py의 SQLITE_SCHEMA_VERSION을 1 올립니다.
+-- 앱이 빈 데이터베이스(user_version 0)에 연결할 때 실행하므로 모든 문장은 IF NOT EXISTS로 작성합니다.
+-- SQLite 파일은 개발, 벤치마크용이므로 마이그레이션 없이 user_version이 더 작은 파일은 다시 만듭니다.
+--
+-- MySQL과 다른 점
+--   AUTO_INCREMENT 대신 INTEGER PRIMARY KEY (rowid)
+--   ON UPDATE CURRENT_TIMESTAMP 대신 updated_at 트리거
+--   TIMESTAMP, DATE는 'YYYY-MM-DD HH:MM:SS', 'YYYY-MM-DD' 문자열로 저장 (sqlite3 converter로 datetime, date 변환)
+--   MySQL collation(utf8mb4_general_ci)처럼 login_id, email은 대소문자를 구분하지 않도록 COLLATE NOCASE
+--   (unique 인덱스, 중복 검사가 MySQL과 같고 AvailabilityFilter.normalize의 소문자 비교와 맞음)
+
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS permission_types (
+    id INTEGER NOT NULL PRIMARY KEY
+    , permission_type TEXT NOT NULL
+);
+
+INSERT OR IGNORE INTO permission_types (
+    id
+    , permission_type
+) VALUES (
+    1
+    , 'admin'
+), (
+    2
+    , 'user'
+);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER NOT NULL PRIMARY KEY
+    , login_id TEXT NOT NULL COLLATE NOCASE
+    , password TEXT NOT NULL
+    , permission_type_id INTEGER NOT NULL REFERENCES permission_types (id)
+    , created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , is_deleted INTEGER NOT NULL DEFAULT 0
+    , version INTEGER NOT NULL DEFAULT 0
+    , active_login_id TEXT COLLATE NOCASE GENERATED ALWAYS AS (CASE WHEN is_deleted = 0 THEN login_id END) STORED
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_accounts_active_login_id
+    ON accounts (active_login_id);
+
+CREATE INDEX IF NOT EXISTS idx_accounts_login_id_is_deleted_password_permission_type_id
+    ON accounts (login_id, is_deleted, password, permission_type_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_accounts_updated_at
+    AFTER UPDATE ON accounts
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE accounts SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS users (
+    account_id INTEGER NOT NULL PRIMARY KEY REFERENCES accounts (id)
+    , name TEXT NOT NULL
+    , email TEXT NOT NULL COLLATE NOCASE
+    , birth_date DATE NULL
+    , memo TEXT NULL
+    , created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , is_deleted INTEGER NOT NULL DEFAULT 0
+    , active_email TEXT COLLATE NOCASE GENERATED ALWAYS AS (CASE WHEN is_deleted = 0 THEN email END) STORED
+    , email_domain TEXT COLLATE NOCASE GENERATED ALWAYS AS (substr(email, instr(email, '@') + 1)) STORED
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_users_active_email
+    ON users (active_email);
+
+CREATE INDEX IF NOT EXISTS idx_users_email_is_deleted
+    ON users (email, is_deleted);
+
+CREATE INDEX IF NOT EXISTS idx_users_is_deleted_created_at
+    ON users (is_deleted, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_users_is_deleted_name
+    ON users (is_deleted, name);
+
+CREATE INDEX IF NOT EXISTS idx_users_is_deleted_email_domain_created_at
+    ON users (is_deleted, email_domain, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_users_is_deleted_birth_date
+    ON users (is_deleted, birth_date);
+
+CREATE TRIGGER IF NOT EXISTS trg_users_updated_at
+    AFTER UPDATE ON users
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE account_id = NEW.account_id;
+END;
+
+CREATE TABLE IF NOT EXISTS admins (
+    account_id INTEGER NOT NULL PRIMARY KEY REFERENCES accounts (id)
+    , name TEXT NOT NULL
+    , memo TEXT NULL
+    , created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    , is_deleted INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_admins_is_deleted_created_at
+    ON admins (is_deleted, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_admins_is_deleted_name
+    ON admins (is_deleted, name);
+
+CREATE TRIGGER IF NOT EXISTS trg_admins_updated_at
+    AFTER UPDATE ON admins
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE admins SET updated_at = CURRENT_TIMESTAMP WHERE account_id = NEW.account_id;
+END;
+
+CREATE TABLE IF NOT EXISTS account_counters (
+    permission_type_id INTEGER NOT NULL REFERENCES permission_types (id)
+    , slot INTEGER NOT NULL
+    , count INTEGER NOT NULL DEFAULT 0
+    , version INTEGER NOT NULL DEFAULT 0
+    , PRIMARY KEY (permission_type_id, slot)
+);
+
+PRAGMA user_version = 9;
+
+COMMIT;
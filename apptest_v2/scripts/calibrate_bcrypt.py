@@ -0,0 +1,30 @@
+"""
+    bcrypt cost 측정
+
+    이 장비에서 비밀번호 하나를 목표 시간 안에 암호화하는 가장 높은 cost를 찾아서 출력합니다.
+    운영 서버와 같은 장비에서 다른 부하가 없을 때 한 번 실행하고 결과를 config.py의 BCRYPT_ROUNDS로 지정합니다.
+    (BCRYPT_TARGET_MS는 작업자마다 앱 생성 시 따로 측정하므로 작업자끼리 cost가 다를 수 있음)
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m scripts.calibrate_bcrypt --target-ms 250
+"""
+
+import argparse
+
+from utils.hashing import MIN_ROUNDS, MAX_ROUNDS, calibrate_rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='목표 시간에 맞는 bcrypt cost 측정')
+    parser.add_argument('--target-ms', type=float, default=250, help='비밀번호 하나를 암호화하는 목표 시간(ms)')
+    parser.add_argument('--samples', type=int, default=5, help='cost마다 측정 횟수 (중앙값 사용)')
+    parser.add_argument('--min-rounds', type=int, default=MIN_ROUNDS)
+    parser.add_argument('--max-rounds', type=int, default=MAX_ROUNDS)
+    args = parser.parse_args()
+
+    rounds = calibrate_rounds(args.target_ms / 1000, args.min_rounds, args.max_rounds, args.samples)
+    print('BCRYPT_ROUNDS = {}'.format(rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+    스크립트 공통 데이터베이스 옵션
+"""
+
+
+def add_database_arguments(parser):
+    """
+        데이터베이스 연결 옵션 추가
+
+    Args:
+        parser: argparse.ArgumentParser
+
+    Returns:
+        None
+    """
+
+    parser.add_argument('--host')
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--name')
+    parser.add_argument('--charset', default='utf8mb4')
+
+
+def database_from_args(args):
+    """
+        옵션으로 DB 설정 생성
+
+        --host가 없으면 config.py의 DB 설정을 사용합니다.
+        primary, replicas로 나눈 설정이면 primary를 사용합니다.
+
+    Args:
+        args: add_database_arguments 옵션을 파싱한 결과
+
+    Returns:
+        DB 설정
+    """
+
+    if args.host is None:
+        import config
+        return config.DB.get('primary', config.DB)
+
+    return {
+        'host': args.host,
+        'user': args.user,
+        'password': args.password,
+        'name': args.name,
+        'charset': args.charset
+    }
@@ -0,0 +1,348 @@
+"""
+    쿼리 실행 계획 검사
+
+    UserDao의 모든 메서드가 실제로 만드는 SQL을 기록한 뒤 EXPLAIN으로 실행해서
+    전체 테이블 스캔(type = ALL)이 있으면 실패합니다.
+    INSERT는 테이블을 읽지 않으므로 검사하지 않습니다.
+
+    데이터가 거의 없는 테이블에서는 MySQL이 인덱스 대신 전체 스캔을 고를 수 있으므로
+    실제와 비슷한 크기의 데이터가 있는 데이터베이스에서 실행합니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m scripts.explain --host localhost --user root --password ... --name apptest_v2
+        (옵션이 없으면 config.py의 DB 설정 사용)
+        python -m scripts.explain --sqlite apptest_v2.sqlite3
+        (SqliteUserDao 쿼리를 EXPLAIN QUERY PLAN으로 검사)
+"""
+
+import argparse
+import datetime
+import itertools
+import re
+import sys
+import types
+
+import pymysql
+
+from model import UserDao, SqliteUserDao
+from model.user_dao import USER_LIST_SORTS, USER_LIST_FILTERS, USER_ONLY_FILTERS
+from scripts.database import add_database_arguments, database_from_args
+from utils.connection import get_connection
+from utils.enums import PermissionTypeEnum
+from utils.sqlite_connection import SqliteConnection, get_sqlite_connection
+
+# 행이 몇 개뿐이어서 전체 스캔해도 되는 테이블 (account_counters는 권한 타입 수 x 슬롯 수)
+SMALL_TABLES = ('permission_types', 'account_counters')
+
+# EXPLAIN QUERY PLAN의 테이블 전체 스캔 (SCAN json_each VIRTUAL TABLE, SCAN CONSTANT ROW 제외)
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+# SQLite에서 전체 스캔해도 되는 쿼리
+# 사용 중인 값을 모두 읽는 쿼리이고, 생성 컬럼 인덱스는 커버링 인덱스로 쓰이지 않아서 인덱스로 읽어도 비용이 같음
+SQLITE_FULL_READS = ('get_active_login_ids', 'get_active_emails')
+
+FILTER_VALUES = {
+    'name': '김',
+    'created_from': datetime.date(2020, 1, 1),
+    'created_to': datetime.date(2021, 1, 1),
+    'email_domain': 'naver.com',
+    'birth_date_from': datetime.date(1990, 1, 1),
+    'birth_date_to': datetime.date(2000, 1, 1)
+}
+
+CURSOR_VALUES = {
+    'created_at': datetime.datetime(2020, 6, 1),
+    'name': '김'
+}
+
+
+class RecordingCursor:
+    """
+        실행하지 않고 SQL만 기록하는 cursor
+
+        Dao 메서드가 다음 SQL까지 실행하도록 execute는 1행을 바꾼 것처럼,
+        fetchone은 값이 0인 행을 돌려줍니다.
+    """
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        return 1
+
+    def executemany(self, sql, params):
+        self.statements.append((sql, params[0]))
+        return len(params)
+
+    def fetchone(self):
+        return (0, 0, 0)
+
+    def fetchmany(self, size=None):
+        return ()
+
+    def fetchall(self):
+        return ()
+
+
+class RecordingConnection:
+    """
+        Dao 메서드에 넘겨서 실행할 SQL을 모으는 연결 객체
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self.statements)
+
+
+def record(method, *args):
+    """
+        Dao 메서드가 실행하는 SQL 기록
+
+    Args:
+        method: Dao 메서드
+        args: 연결 객체를 뺀 인자
+
+    Returns:
+        [(sql, params)]
+    """
+
+    connection = RecordingConnection()
+    try:
+        result = method(*args, connection)
+        if isinstance(result, types.GeneratorType):
+            list(result)
+    except Exception:
+        # 가짜 결과를 처리하다 실패해도 그 전에 실행한 SQL은 기록되어 있음
+        pass
+    return connection.statements
+
+
+def is_explainable(sql):
+    """
+        EXPLAIN으로 검사할 SQL인지 확인 (INSERT 제외)
+    """
+
+    return not sql.lstrip().upper().startswith('INSERT')
+
+
+def explain(connection, sql, params):
+    """
+        EXPLAIN 실행
+
+        SQLite 연결이면 EXPLAIN QUERY PLAN을 실행하고
+        전체 스캔(SCAN table)은 MySQL처럼 type이 ALL인 행으로 바꿉니다.
+
+    Args:
+        connection: 데이터베이스 연결 객체
+        sql: 검사할 SQL
+        params: SQL 인자
+
+    Returns:
+        [실행 계획 행 딕셔너리]
+    """
+
+    if isinstance(connection, SqliteConnection):
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql.strip().rstrip(';'), params)
+            plan = []
+            for row in cursor.fetchall():
+                match = SQLITE_FULL_SCAN.match(row['detail'])
+                plan.append({
+                    'table': match.group(1) if match else None,
+                    'type': 'ALL' if match else None,
+                    'detail': row['detail']
+                })
+            return plan
+
+    with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+        cursor.execute('EXPLAIN ' + sql.strip().rstrip(';'), params)
+        return cursor.fetchall()
+
+
+def full_scans(plan):
+    """
+        실행 계획에서 전체 테이블 스캔 찾기
+
+        UNION, 파생 테이블의 임시 테이블(<union1,2> 등)과 SMALL_TABLES는 제외합니다.
+
+    Args:
+        plan: explain 결과
+
+    Returns:
+        [전체 스캔하는 테이블 이름]
+    """
+
+    return [
+        row['table'] for row in plan
+        if row['type'] == 'ALL'
+        and row['table']
+        and not row['table'].startswith('<')
+        and row['table'] not in SMALL_TABLES
+    ]
+
+
+def user_list_cases():
+    """
+        유저 목록 조회의 모든 권한, 정렬, 커서, 필터 조합
+
+        어드민 목록의 유저 전용 필터는 서비스에서 거절하므로 제외합니다.
+
+    Returns:
+        [(이름, get_user_list 인자)]
+    """
+
+    cases = []
+    for permission, sort, with_cursor in itertools.product(('user', 'admin', 'all'), USER_LIST_SORTS, (False, True)):
+        for size in range(len(USER_LIST_FILTERS) + 1):
+            for filters in itertools.combinations(USER_LIST_FILTERS, size):
+                if permission == 'admin' and any(name in USER_ONLY_FILTERS for name in filters):
+                    continue
+
+                data = {'permission': permission, 'sort': sort, 'offset': 0, 'limit': 11, 'cursor': None}
+                data.update({name: FILTER_VALUES[name] for name in filters})
+                if with_cursor:
+                    data['cursor'] = (sort, CURSOR_VALUES[sort.lstrip('-')], 100)
+
+                name = 'get_user_list permission={} sort={} cursor={} filters={}'.format(
+                    permission, sort, with_cursor, ','.join(filters) or '-')
+                cases.append((name, data))
+    return cases
+
+
+def dao_cases(user_dao):
+    """
+        UserDao의 모든 메서드와 분기에서 실행하는 SQL
+
+    Args:
+        user_dao: UserDao
+
+    Returns:
+        [(이름, [(sql, params)])]
+    """
+
+    user = PermissionTypeEnum.user.value
+    admin = PermissionTypeEnum.admin.value
+    login_id, email = 'testuser1', 'testuser1@naver.com'
+    user_data = {
+        'account_id': 1,
+        'login_id': login_id,
+        'password': 'password',
+        'permission_type_id': user,
+        'name': '유저',
+        'email': email,
+        'birth_date': datetime.date(2000, 1, 1),
+        'memo': None
+    }
+    admin_data = dict(user_data, permission_type_id=admin)
+
+    calls = [
+        ('login_id_duplicate_check', user_dao.login_id_duplicate_check, login_id),
+        ('email_duplicate_check', user_dao.email_duplicate_check, email),
+        ('get_active_login_ids', user_dao.get_active_login_ids),
+        ('get_active_emails', user_dao.get_active_emails),
+        ('create_account', user_dao.create_account, user_data),
+        ('create_user', user_dao.create_user, user_data),
+        ('create_admin', user_dao.create_admin, admin_data),
+        ('update_password', user_dao.update_password, user_data),
+        ('get_existing_login_ids', user_dao.get_existing_login_ids, [login_id, 'testuser2']),
+        ('get_existing_emails', user_dao.get_existing_emails, [email, 'testuser2@naver.com']),
+        ('bulk_create_accounts', user_dao.bulk_create_accounts, [user_data]),
+        ('bulk_create_users', user_dao.bulk_create_users, [user_data]),
+        ('get_login_user_information', user_dao.get_login_user_information, login_id),
+        ('reconcile_account_count user', user_dao.reconcile_account_count, user),
+        ('reconcile_account_count admin', user_dao.reconcile_account_count, admin),
+        ('get_account_version', user_dao.get_account_version, user_data),
+        ('get_user_information user', user_dao.get_user_information, user_data),
+        ('get_user_information admin', user_dao.get_user_information, admin_data),
+        ('put_user_information user', user_dao.put_user_information, user_data),
+        ('put_user_information admin', user_dao.put_user_information, admin_data),
+        ('account_exist_check', user_dao.account_exist_check, user_data),
+        ('admin_exist_check', user_dao.admin_exist_check, admin_data),
+        ('user_exist_check', user_dao.user_exist_check, user_data),
+        ('delete_user user', user_dao.delete_user, user_data),
+        ('delete_user admin', user_dao.delete_user, admin_data)
+    ]
+    for permission in ('user', 'admin', 'all'):
+        calls.append(('get_user_list_version ' + permission, user_dao.get_user_list_version, {'permission': permission}))
+        calls.append(('count_users ' + permission, user_dao.count_users, {'permission': permission}))
+    for permission in ('user', 'admin'):
+        calls.append((
+            'export_user_list ' + permission,
+            user_dao.export_user_list,
+            {'permission': permission, 'batch_size': 1000}
+        ))
+
+    cases = [(name, record(method, *args)) for name, method, *args in calls]
+    cases.extend(
+        (name, record(user_dao.get_user_list, data))
+        for name, data in user_list_cases()
+    )
+    return cases
+
+
+def check(connection, cases, verbose=False, full_reads=()):
+    """
+        검사 실행
+
+    Args:
+        connection: 데이터베이스 연결 객체
+        cases: [(이름, [(sql, params)])]
+        verbose: 통과한 경우도 출력
+        full_reads: 전체 스캔해도 되는 케이스 이름
+
+    Returns:
+        실패 수
+    """
+
+    failures = 0
+    for name, statements in cases:
+        for sql, params in statements:
+            if not is_explainable(sql):
+                continue
+
+            scans = full_scans(explain(connection, sql, params))
+            if scans and name not in full_reads:
+                failures += 1
+                print('FULL SCAN {} ({})'.format(name, ', '.join(scans)))
+            elif verbose:
+                print('ok        {}'.format(name))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UserDao 쿼리의 전체 테이블 스캔 검사')
+    add_database_arguments(parser)
+    parser.add_argument('--sqlite', metavar='PATH', help='MySQL 대신 검사할 SQLite 데이터베이스 파일')
+    parser.add_argument('--verbose', action='store_true', help='통과한 쿼리도 출력')
+    args = parser.parse_args()
+
+    if args.sqlite:
+        cases = dao_cases(SqliteUserDao())
+        connection = get_sqlite_connection({'path': args.sqlite})
+        full_reads = SQLITE_FULL_READS
+    else:
+        cases = dao_cases(UserDao())
+        connection = get_connection(database_from_args(args))
+        full_reads = ()
+
+    try:
+        failures = check(connection, cases, args.verbose, full_reads)
+    finally:
+        connection.close()
+
+    explained = sum(is_explainable(sql) for _, statements in cases for sql, _ in statements)
+    print('{} queries, {} full scans'.format(explained, failures))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""
+    벤치마크용 데이터 생성
+
+    accounts와 users, admins에 유저, 어드민을 대량으로 넣습니다.
+        이름: 성 + 이름 두 글자 (NameRule을 통과하는 한글)
+        login_id, email: 접두어 + u/a + 7자리 account id로 겹치지 않음 (email 도메인은 실제 비율과 비슷하게)
+        생년월일, 가입일, 삭제 여부(--deleted-ratio): 무작위
+    같은 --seed, 같은 시작 id(--start-id)면 항상 같은 데이터를 만듭니다.
+
+    bcrypt는 한 건에 수백 ms가 걸리므로 모든 계정이 같은 비밀번호 해시(--account-password)를 사용합니다.
+    행은 pymysql executemany의 다중 행 INSERT로 --batch-size개씩 넣고 묶음마다 commit 합니다.
+    account id를 직접 지정하므로 login_id로 id를 다시 조회하지 않습니다.
+    --disable-checks는 세션의 unique_checks, foreign_key_checks를 끕니다.
+    (빈 데이터베이스에 넣을 때만 사용)
+    다 넣은 뒤 account_counters를 실제 수로 보정합니다.
+
+    실행 (apptest_v2 디렉터리에서, 마이그레이션을 적용한 데이터베이스)
+        python -m scripts.generate_dataset --users 1000000 --admins 100 --seed 1
+        python -m scripts.generate_dataset --users 10 --dry-run
+        (연결 옵션이 없으면 config.py의 DB 설정 사용)
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import random
+import sys
+import time
+
+import bcrypt
+
+from model import UserDao
+from scripts.database import add_database_arguments, database_from_args
+from utils.connection import get_connection
+from utils.enums import PermissionTypeEnum
+from utils.rules import NAME_PATTERN, LOGIN_ID_PATTERN, EMAIL_PATTERN
+
+# 성 (대략적인 인구 비율)
+SURNAMES = (
+    ('김', 215), ('이', 147), ('박', 84), ('최', 47), ('정', 43), ('강', 24), ('조', 21), ('윤', 21),
+    ('장', 20), ('임', 17), ('한', 15), ('오', 15), ('서', 15), ('신', 15), ('권', 14), ('황', 14),
+    ('안', 14), ('송', 14), ('전', 13), ('홍', 11), ('유', 11), ('고', 9), ('문', 9), ('양', 9),
+    ('손', 9), ('배', 8), ('백', 8), ('허', 7), ('남', 6), ('심', 6), ('노', 6), ('하', 5),
+    ('곽', 4), ('성', 4), ('차', 4), ('주', 4), ('우', 4), ('구', 4), ('민', 3), ('나', 3)
+)
+
+GIVEN_NAME_SYLLABLES = (
+    '민', '서', '지', '현', '준', '우', '예', '도', '하', '윤', '은', '수', '영', '진', '유', '재',
+    '성', '혜', '연', '정', '승', '주', '경', '호', '희', '아', '원', '태', '시', '건', '채', '다',
+    '소', '미', '선', '상', '동', '한', '훈', '빈', '율', '린', '혁', '석', '나', '기', '람', '결'
+)
+
+EMAIL_DOMAINS = (
+    ('naver.com', 45), ('gmail.com', 30), ('daum.net', 10), ('hanmail.net', 6), ('kakao.com', 5), ('nate.com', 4)
+)
+
+BCRYPT_BASE64 = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/',
+    './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+)
+
+ACCOUNT_SQL = """
+    INSERT INTO accounts (
+        id
+        , login_id
+        , password
+        , permission_type_id
+        , created_at
+        , is_deleted
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s
+    )
+"""
+
+USER_SQL = """
+    INSERT INTO users (
+        account_id
+        , name
+        , email
+        , birth_date
+        , memo
+        , created_at
+        , is_deleted
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s, %s
+    )
+"""
+
+ADMIN_SQL = """
+    INSERT INTO admins (
+        account_id
+        , name
+        , memo
+        , created_at
+        , is_deleted
+    ) VALUES (
+        %s, %s, %s, %s, %s
+    )
+"""
+
+
+class DatasetGenerator:
+    """
+        결정적 유저, 어드민 행 생성기
+
+        행은 (account 행, users 혹은 admins 행) 튜플이고 INSERT 컬럼 순서와 같습니다.
+    """
+
+    def __init__(self, seed, password_hash, prefix='gen', deleted_ratio=0.05,
+                 birth_date_null_ratio=0.1, created_from=datetime.datetime(2019, 1, 1), created_days=1095):
+        self.random = random.Random(seed)
+        self.password_hash = password_hash
+        self.prefix = prefix
+        self.deleted_ratio = deleted_ratio
+        self.birth_date_null_ratio = birth_date_null_ratio
+        self.created_from = created_from
+        self.created_seconds = created_days * 86400
+
+        self.surnames, surname_weights = zip(*SURNAMES)
+        self.surname_weights = tuple(_cumulative(surname_weights))
+        self.domains, domain_weights = zip(*EMAIL_DOMAINS)
+        self.domain_weights = tuple(_cumulative(domain_weights))
+
+    def name(self):
+        choice = self.random.choice
+        return self.random.choices(self.surnames, cum_weights=self.surname_weights)[0] + \
+            choice(GIVEN_NAME_SYLLABLES) + choice(GIVEN_NAME_SYLLABLES)
+
+    def login_id(self, kind, account_id):
+        return '{}{}{:07d}'.format(self.prefix, kind, account_id)
+
+    def created_at(self):
+        return self.created_from + datetime.timedelta(seconds=self.random.randrange(self.created_seconds))
+
+    def birth_date(self):
+        if self.random.random() < self.birth_date_null_ratio:
+            return None
+        return datetime.date(1950, 1, 1) + datetime.timedelta(days=self.random.randrange(60 * 365))
+
+    def is_deleted(self):
+        return int(self.random.random() < self.deleted_ratio)
+
+    def user(self, account_id):
+        login_id = self.login_id('u', account_id)
+        domain = self.random.choices(self.domains, cum_weights=self.domain_weights)[0]
+        created_at = self.created_at()
+        is_deleted = self.is_deleted()
+        return (
+            (account_id, login_id, self.password_hash, PermissionTypeEnum.user.value, created_at, is_deleted),
+            (account_id, self.name(), '{}@{}'.format(login_id, domain), self.birth_date(), None, created_at, is_deleted)
+        )
+
+    def admin(self, account_id):
+        created_at = self.created_at()
+        is_deleted = self.is_deleted()
+        return (
+            (account_id, self.login_id('a', account_id), self.password_hash,
+             PermissionTypeEnum.admin.value, created_at, is_deleted),
+            (account_id, self.name(), None, created_at, is_deleted)
+        )
+
+    def batches(self, start_id, users, admins, batch_size):
+        """
+            행 묶음 생성
+
+            어드민을 먼저 만들고 이어서 유저를 만듭니다. 메모리에는 한 묶음만 올립니다.
+
+        Args:
+            start_id: 첫 account id
+            users: 유저 수
+            admins: 어드민 수
+            batch_size: 묶음 크기
+
+        Returns:
+            (kind, [account 행], [users 혹은 admins 행]) 제너레이터
+        """
+
+        account_id = start_id
+        for kind, count, make in (('admin', admins, self.admin), ('user', users, self.user)):
+            for start in range(0, count, batch_size):
+                rows = [make(account_id + index) for index in range(min(batch_size, count - start))]
+                account_id += len(rows)
+                yield kind, [account for account, _ in rows], [profile for _, profile in rows]
+
+
+def deterministic_salt(seed, rounds):
+    """
+        seed로 만드는 bcrypt salt
+
+        같은 seed면 비밀번호 해시까지 같도록 bcrypt.gensalt 대신 사용합니다.
+
+    Args:
+        seed: 난수 seed
+        rounds: bcrypt cost
+
+    Returns:
+        b'$2b$12$...' 형식의 salt
+    """
+
+    salt = random.Random(seed).getrandbits(128).to_bytes(16, 'big')
+    encoded = base64.b64encode(salt).decode('ascii')[:22].translate(BCRYPT_BASE64)
+    return '$2b${:02d}${}'.format(rounds, encoded).encode('ascii')
+
+
+def _cumulative(weights):
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
+
+
+def next_account_id(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM accounts;')
+        return cursor.fetchone()[0]
+
+
+def insert_batches(connection, batches):
+    """
+        묶음마다 다중 행 INSERT 후 commit
+
+    Returns:
+        (넣은 유저 수, 넣은 어드민 수)
+    """
+
+    inserted = {'user': 0, 'admin': 0}
+    started_at = time.perf_counter()
+    with connection.cursor() as cursor:
+        for kind, accounts, profiles in batches:
+            cursor.executemany(ACCOUNT_SQL, accounts)
+            cursor.executemany(USER_SQL if kind == 'user' else ADMIN_SQL, profiles)
+            connection.commit()
+
+            inserted[kind] += len(accounts)
+            total = inserted['user'] + inserted['admin']
+            print('\r{} rows {:.0f} accounts/s'.format(total, total / (time.perf_counter() - started_at)),
+                  end='', file=sys.stderr)
+    print(file=sys.stderr)
+    return inserted['user'], inserted['admin']
+
+
+def reconcile_counters(connection):
+    user_dao = UserDao()
+    for permission_type in PermissionTypeEnum:
+        user_dao.reconcile_account_count(permission_type.value, connection)
+        connection.commit()
+
+
+def dry_run(generator, args, start_id):
+    """
+        데이터베이스 없이 행 출력
+
+        --limit개 행과 전체 행의 sha256을 출력합니다. (같은 seed면 같은 값)
+        모든 행의 이름, login_id, email이 가입 규칙(utils/rules.py)을 통과하는지도 확인합니다.
+    """
+
+    digest = hashlib.sha256()
+    shown = 0
+    for kind, accounts, profiles in generator.batches(start_id, args.users, args.admins, args.batch_size):
+        for account, profile in zip(accounts, profiles):
+            digest.update(repr((account, profile)).encode('utf-8'))
+            valid = NAME_PATTERN.match(profile[1]) and LOGIN_ID_PATTERN.match(account[1])
+            if not valid or (kind == 'user' and not EMAIL_PATTERN.match(profile[2])):
+                raise ValueError('INVALID_ROW {} {}'.format(account, profile))
+            if shown < args.limit:
+                print(kind, account[:2] + account[3:], profile)
+                shown += 1
+    print('sha256', digest.hexdigest())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 유저, 어드민 데이터 생성')
+    add_database_arguments(parser)
+    parser.add_argument('--users', type=int, default=100000, help='유저 수')
+    parser.add_argument('--admins', type=int, default=10, help='어드민 수')
+    parser.add_argument('--seed', type=int, default=1, help='난수 seed')
+    parser.add_argument('--prefix', default='gen', help='login_id 접두어 (영어 소문자, 숫자)')
+    parser.add_argument('--deleted-ratio', type=float, default=0.05, help='삭제된 계정 비율')
+    parser.add_argument('--account-password', default='password1', help='모든 계정의 비밀번호')
+    parser.add_argument('--bcrypt-rounds', type=int, default=12)
+    parser.add_argument('--batch-size', type=int, default=5000, help='INSERT 한 번에 넣을 행 수')
+    parser.add_argument('--start-id', type=int, help='첫 account id (없으면 MAX(id) + 1)')
+    parser.add_argument('--disable-checks', action='store_true', help='unique_checks, foreign_key_checks 끄기')
+    parser.add_argument('--dry-run', action='store_true', help='데이터베이스 없이 행만 출력')
+    parser.add_argument('--limit', type=int, default=5, help='--dry-run에서 출력할 행 수')
+    args = parser.parse_args()
+
+    password_hash = bcrypt.hashpw(
+        args.account_password.encode('utf-8'), deterministic_salt(args.seed, args.bcrypt_rounds)).decode('utf-8')
+
+    generator = DatasetGenerator(args.seed, password_hash, args.prefix, args.deleted_ratio)
+
+    if args.dry_run:
+        dry_run(generator, args, args.start_id or 1)
+        return
+
+    connection = get_connection(database_from_args(args))
+    try:
+        if args.disable_checks:
+            with connection.cursor() as cursor:
+                cursor.execute('SET unique_checks = 0, foreign_key_checks = 0;')
+
+        start_id = args.start_id or next_account_id(connection)
+        started_at = time.perf_counter()
+        users, admins = insert_batches(
+            connection, generator.batches(start_id, args.users, args.admins, args.batch_size))
+        elapsed = time.perf_counter() - started_at
+
+        reconcile_counters(connection)
+        print('{} users, {} admins (account id {}-{}) in {:.1f}s, {:.0f} accounts/s'.format(
+            users, admins, start_id, start_id + users + admins - 1, elapsed, (users + admins) / elapsed))
+
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+    스키마 마이그레이션
+
+    schema/migrations/의 NNNN_이름.sql 파일을 번호 순서대로 적용하고
+    적용한 번호를 schema_migrations 테이블에 기록합니다.
+    이미 적용한 마이그레이션은 건너뛰므로 배포할 때마다 실행해도 됩니다.
+
+    MySQL의 DDL은 트랜잭션으로 묶이지 않으므로 마이그레이션 중간에 실패하면
+    실패한 문장 앞까지만 적용된 상태로 남습니다. 원인을 고친 뒤 남은 문장을 직접 적용하고
+    --baseline --target 번호로 기록하거나, 데이터베이스를 복구한 뒤 다시 실행합니다.
+    동시에 여러 서버에서 실행해도 GET_LOCK으로 한 곳에서만 적용합니다.
+
+    실행 (apptest_v2 디렉터리에서, 데이터베이스는 미리 생성)
+        python -m scripts.migrate                  모두 적용
+        python -m scripts.migrate --target 5       5번까지 적용
+        python -m scripts.migrate --status         적용 상태만 출력
+        python -m scripts.migrate --baseline       schema.sql로 만든 데이터베이스에 적용 기록만 남김
+        (연결 옵션이 없으면 config.py의 DB 설정 사용)
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from scripts.database import add_database_arguments, database_from_args
+from utils.connection import get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schema', 'migrations')
+
+FILE_NAME = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+STATEMENT_END = re.compile(r';[ \t]*$', re.MULTILINE)
+
+LOCK_NAME = 'apptest_v2_schema_migrations'
+
+LOCK_TIMEOUT = 60
+
+
+class Migration:
+    """
+        마이그레이션 파일 하나
+    """
+
+    __slots__ = ('version', 'name', 'path')
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def statements(self):
+        with open(self.path, encoding='utf-8') as f:
+            return split_statements(f.read())
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """
+        마이그레이션 파일 목록
+
+    Args:
+        directory: 마이그레이션 디렉터리
+
+    Returns:
+        번호 순서의 [Migration]
+
+    Raises:
+        ValueError: 번호가 중복된 파일
+    """
+
+    migrations = {}
+    for file_name in sorted(os.listdir(directory)):
+        match = FILE_NAME.match(file_name)
+        if not match:
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError('DUPLICATE_MIGRATION_VERSION ' + file_name)
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, file_name))
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql):
+    """
+        SQL 파일을 문장 단위로 나눔
+
+        줄 끝의 ;을 문장의 끝으로 봅니다. 주석만 있는 조각은 버립니다.
+
+    Args:
+        sql: SQL 파일 내용
+
+    Returns:
+        [SQL 문장]
+    """
+
+    statements = []
+    for statement in STATEMENT_END.split(sql):
+        lines = [line for line in statement.strip().splitlines() if not line.lstrip().startswith('--')]
+        if any(line.strip() for line in lines):
+            statements.append('\n'.join(lines).strip())
+    return statements
+
+
+def create_migration_table(connection):
+    sql = """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT NOT NULL COMMENT '마이그레이션 번호'
+            , name VARCHAR(100) NOT NULL COMMENT '마이그레이션 이름'
+            , applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '적용일'
+            , PRIMARY KEY (version)
+        ) COMMENT '적용한 스키마 마이그레이션';
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def get_applied_versions(connection):
+    """
+        적용한 마이그레이션 번호
+
+    Args:
+        connection: 데이터베이스 연결 객체
+
+    Returns:
+        번호 집합
+    """
+
+    sql = """
+        SELECT
+            version
+        FROM
+            schema_migrations;
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return {row[0] for row in cursor.fetchall()}
+
+
+def record_migration(migration, connection):
+    sql = """
+        INSERT INTO schema_migrations (
+            version
+            , name
+        ) VALUES (
+            %(version)s
+            , %(name)s
+        );
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'version': migration.version, 'name': migration.name})
+    connection.commit()
+
+
+def apply_migration(migration, connection):
+    """
+        마이그레이션 하나 적용
+
+        데이터를 바꾸는 문장이 있을 수 있으므로 모든 문장을 실행한 뒤 커밋하고 기록합니다.
+
+    Args:
+        migration: Migration
+        connection: 데이터베이스 연결 객체
+
+    Returns:
+        None
+    """
+
+    with connection.cursor() as cursor:
+        for statement in migration.statements():
+            cursor.execute(statement)
+    connection.commit()
+    record_migration(migration, connection)
+
+
+def pending_migrations(migrations, applied, target=None):
+    """
+        적용할 마이그레이션
+
+    Args:
+        migrations: load_migrations 결과
+        applied: 적용한 번호 집합
+        target: 이 번호까지만 적용 (없으면 전부)
+
+    Returns:
+        [Migration]
+    """
+
+    return [
+        migration for migration in migrations
+        if migration.version not in applied
+        and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(connection, migrations, target=None, baseline=False):
+    """
+        마이그레이션 실행
+
+    Args:
+        connection: 데이터베이스 연결 객체
+        migrations: load_migrations 결과
+        target: 이 번호까지만 적용 (없으면 전부)
+        baseline: True면 실행하지 않고 적용 기록만 남김
+
+    Returns:
+        적용한 [Migration]
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT GET_LOCK(%s, %s);', (LOCK_NAME, LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError('MIGRATION_LOCK_TIMEOUT')
+
+    try:
+        create_migration_table(connection)
+        pending = pending_migrations(migrations, get_applied_versions(connection), target)
+        for migration in pending:
+            print('{} {:04d}_{}'.format('baseline' if baseline else 'apply   ', migration.version, migration.name))
+            if baseline:
+                record_migration(migration, connection)
+            else:
+                apply_migration(migration, connection)
+        return pending
+
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT RELEASE_LOCK(%s);', (LOCK_NAME,))
+
+
+def print_status(connection, migrations):
+    create_migration_table(connection)
+    applied = get_applied_versions(connection)
+    for migration in migrations:
+        print('{} {:04d}_{}'.format('applied ' if migration.version in applied else 'pending ', migration.version, migration.name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스키마 마이그레이션')
+    add_database_arguments(parser)
+    parser.add_argument('--target', type=int, help='이 번호까지만 적용')
+    parser.add_argument('--status', action='store_true', help='적용 상태만 출력')
+    parser.add_argument('--baseline', action='store_true', help='실행하지 않고 적용 기록만 남김')
+    args = parser.parse_args()
+
+    migrations = load_migrations()
+    connection = get_connection(database_from_args(args))
+    try:
+        if args.status:
+            print_status(connection, migrations)
+        else:
+            applied = migrate(connection, migrations, args.target, args.baseline)
+            print('{} migrations {}'.format(len(applied), 'recorded' if args.baseline else 'applied'))
+
+    except Exception as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+    프로파일링 요청 헤더 값 생성
+
+    PROFILE_ENABLED인 서버에 X-Profile-Token 헤더로 보내면 그 요청을 프로파일링하고
+    Server-Timing 헤더를 붙입니다. 프로파일 파일 이름은 X-Profile-Id 응답 헤더로 돌려줍니다.
+
+    실행 (apptest_v2 디렉터리에서)
+        python -m scripts.profile_token
+        python -m scripts.profile_token --secret ... --ttl 60
+        (--secret이 없으면 config.py의 PROFILE_SECRET 사용)
+
+    예
+        curl -H "X-Profile-Token: $(python -m scripts.profile_token)" -H "Authorization: ..." localhost:6000/users
+"""
+
+import argparse
+
+from utils.profiling import sign_profile_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description='X-Profile-Token 헤더 값 생성')
+    parser.add_argument('--secret', help='PROFILE_SECRET')
+    parser.add_argument('--ttl', type=int, default=300, help='유효 시간(초)')
+    args = parser.parse_args()
+
+    secret = args.secret
+    if secret is None:
+        import config
+        secret = config.PROFILE_SECRET
+
+    print(sign_profile_token(secret, args.ttl))
+
+
+if __name__ == '__main__':
+    main()
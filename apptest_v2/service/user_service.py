@@ -1,9 +1,55 @@
-import bcrypt
 import jwt
 
+from flask_request_validator.exceptions import RuleError
+
 from model import UserDao
-from utils.custom_exceptions import UserAlreadyExist, UserDoesNotExist, LoginException, PutUserInformationError
-from utils.enums import PermissionTypeEnum
+from model.user_dao import USER_LIST_FILTERS, USER_ONLY_FILTERS
+from utils.custom_exceptions import (
+    UserAlreadyExist,
+    UserDoesNotExist,
+    LoginException,
+    PutUserInformationError,
+    DuplicateEntryError,
+    BulkSignUpError,
+    UserListError
+)
+from utils.bloom_filter import AvailabilityFilter
+from utils.cache import create_cache
+from utils.conditional import make_etag
+from utils.enums import PermissionTypeEnum, UniqueKeyEnum
+from utils.hashing import PasswordHasher
+from utils.pagination import encode_cursor
+from utils.rules import LoginIdRule, PasswordRule, NameRule, EmailRule, BirthDateRule, MemoRule
+
+# 수정 직후임을 나타내는 profile_cache 값 (이 값이 있으면 primary에서 다시 채움)
+PROFILE_REFILL = 'refill'
+
+SIGN_UP_RULES = (
+    ('login_id', True, LoginIdRule()),
+    ('password', True, PasswordRule()),
+    ('name', True, NameRule()),
+    ('email', True, EmailRule()),
+    ('birth_date', False, BirthDateRule()),
+    ('memo', False, MemoRule())
+)
+
+
+def already_exist_message(login_id_check, email_check):
+    """
+        중복 에러 메시지 생성
+
+    Args:
+        login_id_check: login_id 중복 여부 (0 혹은 1)
+        email_check: email 중복 여부 (0 혹은 1)
+
+    Returns:
+        'login_id, email ALREADY EXISTS' 형식의 메시지
+    """
+
+    return ', '.join((
+        login_id_check * ' login_id' +
+        email_check * ' email'
+    ).split()) + ' ALREADY EXISTS'
 
 
 class UserService:
@@ -11,17 +57,89 @@ class UserService:
         유저앱 service
     """
 
-    def __init__(self, config):
+    def __init__(self, config, user_dao=None):
         self.config = config
-        self.user_dao = UserDao()
+        self.user_dao = user_dao or UserDao()
+        self.hasher = PasswordHasher.from_config(config)
+        self.profile_cache = create_cache(config, 'PROFILE')
+        self.last_reconciliation = None
+        self.availability_filter = AvailabilityFilter.from_config(config, ('login_id', 'email'))
+
+    def build_availability_filter(self, pool):
+        """
+            login_id, email 블룸 필터 생성
+
+            사용 중인 login_id, email을 서버 측 커서로 읽어서 필터를 만듭니다.
+            앱 생성 시와 AVAILABILITY_FILTER_REBUILD_INTERVAL마다 실행합니다.
+
+        Args:
+            pool: 커넥션 풀
+
+        Returns:
+            None
+        """
+
+        connection = pool.get_connection()
+        try:
+            self.availability_filter.build({
+                'login_id': self.user_dao.get_active_login_ids(connection),
+                'email': self.user_dao.get_active_emails(connection)
+            })
+
+        finally:
+            pool.release(connection)
+
+    def key_exists(self, name, key, check, connection):
+        """
+            login_id, email 사용 여부 조회
+
+            블룸 필터가 "확실히 없음"이면 쿼리를 실행하지 않습니다.
+            필터는 다른 프로세스의 가입을 다음 재생성까지 모르므로
+            단건 회원가입의 중복 메시지에만 사용하고 중복 여부는 unique 인덱스가 판단합니다.
+
+        Args:
+            name: login_id 혹은 email
+            key: 검사할 값
+            check: 중복 체크 Dao 메서드
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            0 혹은 1
+        """
+
+        if not self.availability_filter.might_contain(name, key):
+            return 0
+
+        exists = check(key, connection)
+        self.availability_filter.record_result(exists)
+        return exists
+
+    def remember_keys(self, data, connection):
+        """
+            가입한 login_id, email을 commit 후 블룸 필터에 추가
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 세션
+
+        Returns:
+            None
+        """
+
+        def add():
+            self.availability_filter.add('login_id', data['login_id'])
+            if data.get('email'):
+                self.availability_filter.add('email', data['email'])
+
+        connection.after_commit(add)
 
     def sign_up_logic(self, data, connection):
         """
             회원가입 로직
 
-            login_id, email의 중복 검사를 실시
-            bcrypt로 비밀번호 암호화
+            bcrypt로 비밀번호 암호화 (PasswordHasher 프로세스 풀)
             account 먼저 생성하고 user를 생성
+            login_id, email 중복은 미리 조회하지 않고 unique 인덱스 에러로 판단
 
         Args:
             data: 유저 정보
@@ -31,32 +149,275 @@ class UserService:
             None
         """
 
-        login_id_check = self.user_dao.login_id_duplicate_check(data['login_id'], connection)
-        email_check = self.user_dao.email_duplicate_check(data['email'], connection)
+        data['permission_type_id'] = PermissionTypeEnum.user.value
+        data['password'] = self.hasher.hash(data['password'])
+
+        try:
+            account_id = self.user_dao.create_account(data, connection)
+
+            data['account_id'] = account_id
+            self.user_dao.create_user(data, connection)
+
+        except DuplicateEntryError as e:
+            raise self.sign_up_duplicate_error(e, data, connection)
+
+        self.remember_keys(data, connection)
+
+    def sign_up_duplicate_error(self, e, data, connection):
+        """
+            회원가입 중복 에러 변환
+
+            account 생성에서 login_id가 중복되면 user 생성까지 가지 못하므로
+            기존과 같은 메시지를 위해 이때만 email 중복을 조회합니다.
+
+        Args:
+            e: DuplicateEntryError
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            UserAlreadyExist 혹은 e
+        """
+
+        if e.key == UniqueKeyEnum.email.value:
+            login_id_check, email_check = 0, 1
+        elif e.key == UniqueKeyEnum.login_id.value:
+            login_id_check = 1
+            email_check = self.key_exists('email', data['email'], self.user_dao.email_duplicate_check, connection)
+        else:
+            return e
+
+        return UserAlreadyExist(already_exist_message(login_id_check, email_check))
+
+    def validate_sign_up_record(self, record):
+        """
+            회원가입 정보 유효성 검사
+
+            회원가입 뷰와 같은 utils/rules.py의 규칙을 사용합니다.
+
+        Args:
+            record: 유저 정보
+
+        Returns:
+            검사한 유저 정보, {필드: 에러 메시지}
+        """
+
+        data, errors = {}, {}
+        if not isinstance(record, dict):
+            return data, {'record': 'invalid type, expected object'}
+
+        for name, required, rule in SIGN_UP_RULES:
+            value = record.get(name)
+            if value is None:
+                if required:
+                    errors[name] = 'value is required'
+                data[name] = None
+                continue
+
+            if not isinstance(value, str):
+                errors[name] = 'invalid type'
+                continue
 
-        if login_id_check or email_check:
-            raise UserAlreadyExist(
-                ', '.join((
-                    login_id_check * ' login_id' +
-                    email_check * ' email'
-                ).split()) + ' ALREADY EXISTS'
+            try:
+                data[name] = rule.validate(value)
+            except (RuleError, ValueError) as e:
+                errors[name] = str(e) if isinstance(e, RuleError) else 'INVALID_' + name.upper()
+
+        return data, errors
+
+    def bulk_sign_up(self, records, connection):
+        """
+            일괄 회원가입 로직
+
+            1. 행마다 유효성 검사
+            2. 요청 안에서 login_id, email 중복 검사
+            3. 사용 중인 login_id, email을 IN 쿼리로 한 번에 조회
+               (블룸 필터는 다른 프로세스의 가입을 모르므로 사용하지 않음, 묶음마다 쿼리 한 번)
+            4. 비밀번호를 병렬로 암호화
+            5. account, user를 executemany로 나눠서 생성
+
+            생성 중 unique 인덱스 에러가 나면 (조회 후 다른 요청이 같은 값으로 가입)
+            그 묶음만 되돌리고 행마다 다시 생성해서 겹친 행만 DUPLICATE로 표시합니다. (bulk_create_chunk)
+
+        Args:
+            records: [유저 정보]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            [행 결과] (index, login_id, result, message)
+        """
+
+        max_size = self.config.get('BULK_SIGN_UP_MAX_SIZE', 1000)
+        if len(records) > max_size:
+            raise BulkSignUpError('BULK_SIZE_EXCEEDED ' + str(max_size))
+
+        results = [None] * len(records)
+        seen_login_ids, seen_emails = set(), set()
+        candidates = []
+
+        for index, record in enumerate(records):
+            data, errors = self.validate_sign_up_record(record)
+            if errors:
+                results[index] = {
+                    'index': index,
+                    'login_id': record.get('login_id') if isinstance(record, dict) else None,
+                    'result': 'INVALID',
+                    'message': errors
+                }
+                continue
+
+            login_id_check = int(data['login_id'] in seen_login_ids)
+            email_check = int(data['email'].lower() in seen_emails)
+            seen_login_ids.add(data['login_id'])
+            seen_emails.add(data['email'].lower())
+
+            if login_id_check or email_check:
+                results[index] = {
+                    'index': index,
+                    'login_id': data['login_id'],
+                    'result': 'DUPLICATE',
+                    'message': already_exist_message(login_id_check, email_check)
+                }
+                continue
+
+            candidates.append((index, data))
+
+        chunk_size = self.config.get('BULK_INSERT_CHUNK_SIZE', 500)
+        existing_login_ids, existing_emails = set(), set()
+        for start in range(0, len(candidates), chunk_size):
+            chunk = [data for _, data in candidates[start:start + chunk_size]]
+            existing_login_ids.update(
+                login_id.lower()
+                for login_id in self.user_dao.get_existing_login_ids([data['login_id'] for data in chunk], connection)
+            )
+            existing_emails.update(
+                email.lower()
+                for email in self.user_dao.get_existing_emails([data['email'] for data in chunk], connection)
             )
 
-        data['permission_type_id'] = PermissionTypeEnum.user.value
-        data['password'] = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        new_users = []
+        for index, data in candidates:
+            login_id_check = int(data['login_id'] in existing_login_ids)
+            email_check = int(data['email'].lower() in existing_emails)
+            if login_id_check or email_check:
+                results[index] = {
+                    'index': index,
+                    'login_id': data['login_id'],
+                    'result': 'DUPLICATE',
+                    'message': already_exist_message(login_id_check, email_check)
+                }
+                continue
+
+            data['permission_type_id'] = PermissionTypeEnum.user.value
+            new_users.append((index, data))
+
+        passwords = self.hasher.hash_many([data['password'] for _, data in new_users])
+        for (_, data), password in zip(new_users, passwords):
+            data['password'] = password
+
+        created = []
+        for start in range(0, len(new_users), chunk_size):
+            created.extend(self.bulk_create_chunk(new_users[start:start + chunk_size], results, connection))
+
+        for index, data in created:
+            self.remember_keys(data, connection)
+            results[index] = {
+                'index': index,
+                'login_id': data['login_id'],
+                'result': 'CREATED',
+                'message': 'SUCCESS'
+            }
+
+        return results
+
+    def bulk_create_chunk(self, chunk, results, connection):
+        """
+            일괄 회원가입 묶음 생성
 
-        account_id = self.user_dao.create_account(data, connection)
+            묶음 전체를 savepoint 안에서 생성하고 unique 인덱스 에러가 나면 savepoint로 되돌린 뒤
+            행마다 savepoint를 두고 다시 생성합니다.
+            중복 조회를 다시 하지 않는 이유: MySQL(REPEATABLE READ)의 일반 SELECT는 트랜잭션 시작 시점의
+            스냅샷을 읽어서 그 뒤에 commit된 가입을 볼 수 없습니다. unique 인덱스가 겹친 행을 정확히 알려줍니다.
 
-        data['account_id'] = account_id
-        self.user_dao.create_user(data, connection)
+        Args:
+            chunk: [(index, 유저 정보)]
+            results: 행 결과 (겹친 행의 결과를 채움)
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            생성한 [(index, 유저 정보)]
+        """
+
+        try:
+            self.create_bulk_rows([data for _, data in chunk], connection)
+            return chunk
+
+        except DuplicateEntryError as e:
+            if e.key not in (UniqueKeyEnum.login_id.value, UniqueKeyEnum.email.value):
+                raise e
+
+        created = []
+        for index, data in chunk:
+            try:
+                self.create_bulk_rows([data], connection)
+
+            except DuplicateEntryError as e:
+                if e.key == UniqueKeyEnum.login_id.value:
+                    message = already_exist_message(1, 0)
+                elif e.key == UniqueKeyEnum.email.value:
+                    message = already_exist_message(0, 1)
+                else:
+                    raise e
+
+                results[index] = {
+                    'index': index,
+                    'login_id': data['login_id'],
+                    'result': 'DUPLICATE',
+                    'message': message
+                }
+                continue
+
+            created.append((index, data))
+
+        return created
+
+    def create_bulk_rows(self, rows, connection):
+        """
+            account, user를 savepoint 안에서 생성
+
+            실패하면 savepoint로 되돌려서 account만 생성된 행이 남지 않게 합니다.
+
+        Args:
+            rows: [유저 정보]
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            None
+
+        Raises:
+            DuplicateEntryError: 사용 중인 login_id 혹은 email
+        """
+
+        self.user_dao.savepoint('bulk_sign_up', connection)
+        try:
+            account_ids = self.user_dao.bulk_create_accounts(rows, connection)
+            for data in rows:
+                data['account_id'] = account_ids[data['login_id']]
+            self.user_dao.bulk_create_users(rows, connection)
+
+        except Exception as e:
+            self.user_dao.rollback_to_savepoint('bulk_sign_up', connection)
+            raise e
+
+        self.user_dao.release_savepoint('bulk_sign_up', connection)
 
     def admin_sign_up_logic(self, data, connection):
         """
             어드민 가입 로직
 
-            login_id 중복 검사 실시
-            bcrypt로 비밀번호 암호화
+            bcrypt로 비밀번호 암호화 (PasswordHasher 프로세스 풀)
             account를 먼저 생성하고 admin 생성
+            login_id 중복은 unique 인덱스 에러로 판단
 
         Args:
             data: 어드민 정보
@@ -66,18 +427,20 @@ class UserService:
             None
         """
 
-        login_id_check = self.user_dao.login_id_duplicate_check(data['login_id'], connection)
-
-        if login_id_check:
-            raise UserAlreadyExist('login_id ALREADY EXISTS')
-
         data['permission_type_id'] = PermissionTypeEnum.admin.value
-        data['password'] = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        data['password'] = self.hasher.hash(data['password'])
+
+        try:
+            account_id = self.user_dao.create_account(data, connection)
 
-        account_id = self.user_dao.create_account(data, connection)
+        except DuplicateEntryError as e:
+            if e.key == UniqueKeyEnum.login_id.value:
+                raise UserAlreadyExist('login_id ALREADY EXISTS')
+            raise e
 
         data['account_id'] = account_id
         self.user_dao.create_admin(data, connection)
+        self.remember_keys(data, connection)
 
     def token_generator(self, user):
         """
@@ -91,8 +454,8 @@ class UserService:
         """
 
         payload = {
-            'account_id': user['id'],
-            'permission_type_id': user['permission_type_id']
+            'account_id': user.id,
+            'permission_type_id': user.permission_type_id
         }
 
         token = jwt.encode(
@@ -108,6 +471,7 @@ class UserService:
             로그인 로직
 
             비밀번호 일치 여부를 검사
+            저장된 비밀번호의 bcrypt cost가 현재 설정과 다르면 다시 암호화해서 저장
             일치하면 토큰 전달
 
         Args:
@@ -122,47 +486,265 @@ class UserService:
         if not user:
             raise UserDoesNotExist('USER_DOES_NOT_EXIST')
 
-        if not bcrypt.checkpw(data['password'].encode('utf-8'), user['password'].encode('utf-8')):
+        if not self.hasher.check(data['password'], user.password):
             raise LoginException('INVALID_PASSWORD')
 
+        if self.hasher.needs_rehash(user.password):
+            self.user_dao.update_password({
+                'account_id': user.id,
+                'password': self.hasher.hash(data['password'])
+            }, connection)
+
         token = self.token_generator(user)
 
         return token
 
-    def get_user_list_logic(self, data, connection):
+    def get_user_list_version(self, data, connection):
+        """
+            유저 목록 버전 조회
+
+            account_counters의 슬롯 행만 읽으므로 유저 수와 상관없이 일정한 시간에 조회합니다.
+
+        Args:
+            data: 유저 목록 조회 조건
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            (유저, 어드민 수, 목록 버전)
+        """
+
+        return self.user_dao.get_user_list_version(data, connection)
+
+    def get_user_list_etag(self, data, counters):
+        """
+            유저 목록 ETag 생성
+
+            목록을 조회하지 않고 조회 조건과 get_user_list_version 결과로 만듭니다.
+            같은 트랜잭션에서 목록을 조회하면 같은 스냅샷을 읽으므로 ETag와 본문이 일치합니다.
+
+        Args:
+            data: 유저 목록 조회 조건
+            counters: get_user_list_version 결과
+
+        Returns:
+            ETag
+        """
+
+        return make_etag('users', sorted(data.items()), *counters)
+
+    def get_user_list_logic(self, data, connection, counters=None):
         """
             유저 목록 조회 로직
 
+            limit보다 한 행 더 조회해서 다음 페이지가 있으면
+            마지막 행으로 다음 페이지 커서를 만듭니다.
+            필터가 있으면 전체 수를 알 수 없으므로 (카운터는 필터별로 관리하지 않음) None을 돌려줍니다.
+            전체 수와 ETag는 카운터를 한 번 조회해서 함께 만듭니다. (ETag 검사에서 조회했으면 그 값을 사용)
+
         Args:
             data: 유저 정보
             connection: 데이터베이스 연결 객체
+            counters: get_user_list_version 결과 (없으면 조회)
 
         Returns:
-            [user 객체]
+            [user 객체], 다음 페이지 커서 (마지막 페이지면 None), 전체 수 (필터가 있으면 None), ETag
         """
 
-        return self.user_dao.get_user_list(data, connection)
+        sort = data['sort']
+        if data.get('cursor') and data['cursor'][0] != sort:
+            raise UserListError('CURSOR_SORT_MISMATCH')
 
-    def get_user_information_logic(self, data, connection):
+        filters = [name for name in USER_LIST_FILTERS if data.get(name) is not None]
+        if data['permission'] == PermissionTypeEnum.admin.name and any(name in USER_ONLY_FILTERS for name in filters):
+            raise UserListError('USER_ONLY_FILTER')
+
+        limit = data['limit']
+        user_list = self.user_dao.get_user_list(dict(data, limit=limit + 1), connection)
+        if counters is None:
+            counters = self.get_user_list_version(data, connection)
+        total = None if filters else counters[0]
+        etag = self.get_user_list_etag(data, counters)
+
+        if len(user_list) <= limit:
+            return user_list, None, total, etag
+
+        user_list = user_list[:limit]
+        last = user_list[-1]
+        return user_list, encode_cursor(getattr(last, sort.lstrip('-')), last.account_id, sort), total, etag
+
+    def count_users(self, data, connection):
         """
-            유저 상세 정보 조회 로직
+            유저, 어드민 수 조회
+
+            가입, 삭제와 같은 트랜잭션에서 갱신하는 account_counters를 읽습니다. (COUNT(*) 없음)
 
         Args:
             data: 유저 정보
+                permission: user, admin 혹은 all
             connection: 데이터베이스 연결 객체
 
         Returns:
-            user 객체
+            수
+        """
+
+        return self.user_dao.count_users(data, connection)
+
+    def reconcile_counters(self, pool):
+        """
+            유저, 어드민 수 보정
+
+            직접 수정한 데이터나 카운터가 생기기 전의 데이터로 어긋난 수를 실제 수로 맞춥니다.
+            앱 생성 시와 COUNTER_RECONCILE_INTERVAL마다 실행합니다.
+
+        Args:
+            pool: 커넥션 풀
+
+        Returns:
+            {권한: {'counted': 보정 전 수, 'actual': 실제 수}}
+        """
+
+        result = {}
+        connection = pool.get_connection()
+        try:
+            for permission_type in PermissionTypeEnum:
+                counted, actual = self.user_dao.reconcile_account_count(permission_type.value, connection)
+                connection.commit()
+                result[permission_type.name] = {'counted': counted, 'actual': actual}
+
+        finally:
+            pool.release(connection)
+
+        self.last_reconciliation = result
+        return result
+
+    def export_user_list_logic(self, data, connection):
         """
+            유저 목록 내보내기 로직
 
-        return self.user_dao.get_user_information(data, connection)
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체
+
+        Returns:
+            [user 객체] 묶음을 돌려주는 제너레이터
+        """
+
+        data['batch_size'] = self.config.get('EXPORT_BATCH_SIZE', 1000)
+        return self.user_dao.export_user_list(data, connection)
+
+    def get_user_information_logic(self, data, connection, primary=None):
+        """
+            유저 상세 정보 조회 로직
+
+            profile_cache를 먼저 조회하고 없으면 데이터베이스(복제본)에서 조회해서 저장합니다.
+            캐시에는 account version을 함께 저장하고 응답에서는 ETag로 바꿉니다.
+            수정 후 commit 하면 캐시를 PROFILE_REFILL로 바꾸므로 (invalidate_profile_cache)
+            그 동안은 늦을 수 있는 복제본 대신 primary에서 읽어서 수정 전 값이 캐시에 남지 않게 합니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체 (복제본)
+            primary: 쓰기용 데이터베이스 연결 객체 (없으면 connection 사용)
+
+        Returns:
+            user 객체, ETag (없는 유저면 None, None)
+        """
+
+        key = self.profile_cache_key(data)
+        user_info = self.profile_cache.get(key)
+        if user_info is None or user_info == PROFILE_REFILL:
+            source = primary if user_info == PROFILE_REFILL and primary is not None else connection
+            user_info = self.user_dao.get_user_information(data, source)
+            if user_info is None:
+                return None, None
+            self.profile_cache.set(key, user_info)
+
+        user_info = dict(user_info)
+        version = user_info.pop('version')
+        return user_info, self.profile_etag(data, version)
+
+    def get_user_information_etag(self, data, connection, primary=None):
+        """
+            유저 상세 정보 ETag 조회
+
+            캐시에 있으면 캐시의 version을, 없으면 account version만 기본 키로 조회합니다.
+            (유저 정보 조인 없이 304 여부 판단)
+            수정 직후(PROFILE_REFILL)에는 복제본이 수정 전 version으로 304를 줄 수 있으므로 primary에서 조회합니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 연결 객체 (복제본)
+            primary: 쓰기용 데이터베이스 연결 객체 (없으면 connection 사용)
+
+        Returns:
+            ETag (삭제된 유저면 None)
+        """
+
+        user_info = self.profile_cache.get(self.profile_cache_key(data))
+        if user_info == PROFILE_REFILL:
+            version = self.user_dao.get_account_version(data, primary or connection)
+        elif user_info is not None:
+            version = user_info['version']
+        else:
+            version = self.user_dao.get_account_version(data, connection)
+
+        if version is None:
+            return None
+        return self.profile_etag(data, version)
+
+    def profile_etag(self, data, version):
+        """
+            유저 상세 정보 ETag
+
+        Args:
+            data: account_id, permission_type_id를 가진 유저 정보
+            version: account version
+
+        Returns:
+            ETag
+        """
+
+        return make_etag('my-page', data['account_id'], data['permission_type_id'], version)
+
+    def profile_cache_key(self, data):
+        """
+            유저 상세 정보 캐시 키
+
+        Args:
+            data: account_id, permission_type_id를 가진 유저 정보
+
+        Returns:
+            'account_id:permission_type_id'
+        """
+
+        return '{account_id}:{permission_type_id}'.format(**data)
+
+    def invalidate_profile_cache(self, data, connection):
+        """
+            유저 상세 정보 캐시 무효화
+
+            commit 전에 바꾸면 다른 요청이 commit 전 값을 다시 캐시할 수 있으므로 commit 후에 바꿉니다.
+            지우지 않고 PROFILE_REFILL을 PROFILE_PRIMARY_READ_SECONDS(기본값 60, 복제 지연보다 길게) 동안 저장해서
+            그 동안의 조회는 primary에서 캐시를 다시 채웁니다. 이후에는 복제본도 수정한 값을 가지고 있습니다.
+
+        Args:
+            data: 유저 정보
+            connection: 데이터베이스 세션
+
+        Returns:
+            None
+        """
+
+        key = self.profile_cache_key(data)
+        ttl = self.config.get('PROFILE_PRIMARY_READ_SECONDS', 60)
+        connection.after_commit(lambda: self.profile_cache.set(key, PROFILE_REFILL, ttl))
 
     def put_user_information_logic(self, data, connection):
         """
             유저 정보 수정 로직
 
-            유저 정보가 동일한지 체크
-            이메일 중복 검사를 실시
+            유저 정보가 동일한지 체크 (동일하면 버전을 올리지 않아서 ETag가 유지됨)
+            이메일 중복은 unique 인덱스 에러로 판단
 
         Args:
             data: 유저 정보
@@ -176,12 +758,17 @@ class UserService:
         if update_check:
             return
 
-        if data['permission_type_id'] == PermissionTypeEnum.user.value:
-            email_check = self.user_dao.put_email_duplicate_check(data, connection)
-            if email_check:
+        try:
+            self.user_dao.put_user_information(data, connection)
+
+        except DuplicateEntryError as e:
+            if e.key == UniqueKeyEnum.email.value:
                 raise PutUserInformationError('EMAIL_ALREADY_EXIST')
+            raise e
 
-        self.user_dao.put_user_information(data, connection)
+        self.invalidate_profile_cache(data, connection)
+        if data.get('email'):
+            connection.after_commit(lambda: self.availability_filter.add('email', data['email']))
 
     def delete_user_logic(self, data, connection):
         """
@@ -205,3 +792,4 @@ class UserService:
             raise UserDoesNotExist('USER_DOES_NOT_EXIST')
 
         self.user_dao.delete_user(data, connection)
+        self.invalidate_profile_cache(data, connection)
@@ -0,0 +1,63 @@
+"""
+    앱 테스트 공용 fixture
+
+    테스트마다 임시 SQLite 파일을 데이터베이스로 사용하는 앱을 만듭니다.
+    (MySQL 서버 없이 DATABASE_BACKEND = 'sqlite'로 같은 Dao SQL을 실행)
+"""
+
+import pytest
+
+from app import create_app
+
+TEST_CONFIG = {
+    'DATABASE_BACKEND': 'sqlite',
+    'JWT_SECRET_KEY': 'test-secret',
+    'JWT_ALGORITHM': 'HS256',
+    'BCRYPT_ROUNDS': 4,
+    'HASH_EXECUTOR': 'thread'
+}
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+        임시 SQLite 데이터베이스를 사용하는 앱
+    """
+
+    app = create_app(dict(TEST_CONFIG, DB={'path': str(tmp_path / 'app.sqlite3')}))
+    app.debug = False
+    yield app
+
+    app.extensions['services'].user_service.hasher.shutdown()
+    app.extensions['database'].close()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_token(client):
+    """
+        어드민 (admin01) 로그인 토큰
+    """
+
+    client.post('/admin/sign-up', json={'login_id': 'admin01', 'password': 'admin1234', 'name': '관리자'})
+    return client.post('/login', json={'login_id': 'admin01', 'password': 'admin1234'}).get_json()['token']
+
+
+@pytest.fixture
+def user_token(client):
+    """
+        유저 (user01) 로그인 토큰
+    """
+
+    client.post('/sign-up', json={
+        'login_id': 'user01',
+        'password': 'pass1234',
+        'name': '김철수',
+        'email': 'user01@naver.com',
+        'birth_date': '1990-01-02'
+    })
+    return client.post('/login', json={'login_id': 'user01', 'password': 'pass1234'}).get_json()['token']
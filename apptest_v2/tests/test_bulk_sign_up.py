@@ -0,0 +1,105 @@
+"""
+    일괄 회원가입 행 결과
+
+    잘못된 행, 요청 안의 중복, 사용 중인 값, 조회 후 다른 요청이 먼저 가입한 값(unique 인덱스 에러)이
+    각 행 결과로 표시되고 나머지 행은 생성되는지 검사합니다.
+"""
+
+import pytest
+
+
+def bulk_user(number, **changes):
+    return dict({
+        'login_id': 'bulk{:03d}'.format(number),
+        'password': 'pass1234',
+        'name': '박민수',
+        'email': 'bulk{}@gmail.com'.format(number)
+    }, **changes)
+
+
+@pytest.fixture
+def existing_user(client):
+    client.post('/sign-up', json={'login_id': 'taken01', 'password': 'pass1234', 'name': '김철수', 'email': 'taken@a.com'})
+
+
+def bulk_sign_up(client, token, users):
+    response = client.post('/admin/users/bulk', headers={'Authorization': token}, json={'users': users})
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def test_bulk_sign_up_row_results(client, admin_token, existing_user):
+    users = [
+        bulk_user(0),
+        bulk_user(1, login_id='taken01'),
+        bulk_user(2, email='TAKEN@a.com'),
+        bulk_user(3, login_id='bulk000'),
+        bulk_user(4, email='bulk0@gmail.com'),
+        bulk_user(5, email='not-an-email'),
+        bulk_user(6)
+    ]
+
+    data = bulk_sign_up(client, admin_token, users)
+
+    assert (data['created'], data['failed']) == (2, 5)
+    assert [row['index'] for row in data['results']] == list(range(len(users)))
+    assert [(row['result'], row['message']) for row in data['results'][:5]] == [
+        ('CREATED', 'SUCCESS'),
+        ('DUPLICATE', 'login_id ALREADY EXISTS'),
+        ('DUPLICATE', 'email ALREADY EXISTS'),
+        ('DUPLICATE', 'login_id ALREADY EXISTS'),
+        ('DUPLICATE', 'email ALREADY EXISTS')
+    ]
+    assert data['results'][5]['result'] == 'INVALID'
+    assert (data['results'][6]['result'], data['results'][6]['message']) == ('CREATED', 'SUCCESS')
+
+    body = client.get('/users?permission=user', headers={'Authorization': admin_token}).get_json()
+    assert sorted(user['login_id'] for user in body['data']) == ['bulk000', 'bulk006', 'taken01']
+    assert body['total'] == 3
+
+
+def test_concurrent_duplicate_marks_only_clashing_rows(app, client, admin_token, existing_user, monkeypatch):
+    """
+        사용 중인 값 조회 뒤 다른 요청이 같은 값으로 가입한 경우
+
+        조회 결과를 비워서 조회와 생성 사이에 가입된 것처럼 만듭니다.
+        겹친 행이 있는 묶음만 행마다 다시 생성하고 나머지 묶음은 그대로 생성되어야 합니다.
+    """
+
+    app.config['BULK_INSERT_CHUNK_SIZE'] = 3
+    user_dao = app.extensions['services'].user_service.user_dao
+    monkeypatch.setattr(user_dao, 'get_existing_login_ids', lambda keys, connection: set())
+    monkeypatch.setattr(user_dao, 'get_existing_emails', lambda keys, connection: set())
+
+    users = [bulk_user(number) for number in range(7)]
+    users[1]['login_id'] = 'taken01'
+    users[4]['email'] = 'TAKEN@a.com'
+
+    data = bulk_sign_up(client, admin_token, users)
+
+    assert [row['result'] for row in data['results']] == [
+        'CREATED', 'DUPLICATE', 'CREATED', 'CREATED', 'DUPLICATE', 'CREATED', 'CREATED'
+    ]
+    assert data['results'][1]['message'] == 'login_id ALREADY EXISTS'
+    assert data['results'][4]['message'] == 'email ALREADY EXISTS'
+
+    body = client.get('/users?permission=user&limit=50', headers={'Authorization': admin_token}).get_json()
+    assert len(body['data']) == body['total'] == 6
+
+    connection = app.extensions['database'].get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*) FROM accounts
+                WHERE NOT EXISTS (SELECT 1 FROM users WHERE users.account_id = accounts.id)
+                    AND NOT EXISTS (SELECT 1 FROM admins WHERE admins.account_id = accounts.id)
+            """)
+            assert cursor.fetchone()[0] == 0
+    finally:
+        app.extensions['database'].release(connection)
+
+
+def test_bulk_sign_up_requires_admin(client, user_token):
+    response = client.post('/admin/users/bulk', headers={'Authorization': user_token}, json={'users': [bulk_user(0)]})
+
+    assert response.status_code == 403
@@ -0,0 +1,121 @@
+"""
+    커넥션 풀, 복제본 풀
+
+    복제본에 연결할 수 없거나 복제본 풀이 가득 차면 primary 풀을 사용하는지,
+    끊어진 유휴 연결은 pre_ping으로 걸러지는지 검사합니다.
+    primary는 임시 SQLite 파일, 연결할 수 없는 복제본은 MySQL 연결 에러를 발생시키는 연결 함수로 만듭니다.
+"""
+
+import pymysql
+import pytest
+
+from utils.connection import ConnectionPool, ReplicaPool
+from utils.custom_exceptions import DatabaseException
+from utils.sqlite_connection import get_sqlite_connection
+
+
+class DownReplica:
+    """
+        연결할 수 없는 복제본의 연결 함수 (호출 수 기록)
+    """
+
+    def __init__(self):
+        self.attempts = 0
+
+    def __call__(self, database):
+        self.attempts += 1
+        raise pymysql.err.OperationalError(2003, "Can't connect to MySQL server")
+
+
+@pytest.fixture
+def primary(tmp_path):
+    pool = ConnectionPool({'path': str(tmp_path / 'primary.sqlite3'), 'pool_max_size': 2}, connect=get_sqlite_connection)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    pool = ConnectionPool({'path': str(tmp_path / 'replica.sqlite3'), 'pool_max_size': 1, 'pool_timeout': 0},
+                          connect=get_sqlite_connection)
+    yield pool
+    pool.close()
+
+
+def test_down_replica_falls_back_to_primary(primary):
+    connect = DownReplica()
+    pool = ReplicaPool([ConnectionPool({}, connect=connect)], primary, retry_interval=30)
+
+    for _ in range(2):
+        connection = pool.get_connection()
+        assert primary.in_use == 1
+        pool.release(connection)
+
+    statistics = pool.statistics()
+    assert connect.attempts == 1
+    assert (statistics['primary_fallbacks'], statistics['replica_failures']) == (2, 1)
+    assert statistics['replicas'][0]['down']
+    assert primary.statistics()['in_use'] == 0
+
+
+def test_down_replica_is_retried_after_interval(primary):
+    connect = DownReplica()
+    pool = ReplicaPool([ConnectionPool({}, connect=connect)], primary, retry_interval=0)
+
+    pool.release(pool.get_connection())
+    pool.release(pool.get_connection())
+
+    assert connect.attempts == 2
+
+
+def test_full_replica_falls_back_without_marking_down(primary, replica):
+    pool = ReplicaPool([replica], primary)
+
+    first = pool.get_connection()
+    second = pool.get_connection()
+
+    assert (replica.in_use, primary.in_use) == (1, 1)
+    statistics = pool.statistics()
+    assert (statistics['replica_checkouts'], statistics['primary_fallbacks']) == (1, 1)
+    assert not statistics['replicas'][0]['down']
+
+    pool.release(first)
+    pool.release(second)
+    assert (replica.in_use, primary.in_use) == (0, 0)
+
+
+def test_pool_timeout(replica):
+    connection = replica.get_connection()
+
+    with pytest.raises(DatabaseException):
+        replica.get_connection()
+
+    replica.release(connection)
+    assert replica.statistics()['timeouts'] == 1
+
+
+def test_pre_ping_replaces_broken_connection(primary):
+    connection = primary.get_connection()
+    primary.release(connection)
+    connection.raw.close()
+
+    replacement = primary.get_connection()
+    try:
+        assert replacement is not connection
+        with replacement.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,)
+    finally:
+        primary.release(replacement)
+
+    statistics = primary.statistics()
+    assert (statistics['ping_failures'], statistics['created'], statistics['size']) == (1, 2, 1)
+
+
+def test_app_reads_from_primary_when_replica_is_down(app, client, admin_token, user_token):
+    pool = ReplicaPool([ConnectionPool({}, connect=DownReplica())], app.extensions['database'])
+    app.extensions['read_database'] = pool
+
+    assert client.get('/users', headers={'Authorization': admin_token}).get_json()['total'] == 1
+    assert client.get('/my-page', headers={'Authorization': user_token}).get_json()['data']['login_id'] == 'user01'
+    assert pool.statistics()['primary_fallbacks'] >= 1
@@ -0,0 +1,71 @@
+"""
+    /my-page, /users ETag
+
+    If-None-Match가 현재 ETag와 같으면 304, 정보가 바뀌면 새 ETag로 200을 응답하는지 검사합니다.
+    바뀐 정보가 없는 수정(PUT)은 ETag를 바꾸지 않아야 합니다.
+"""
+
+import pytest
+
+PROFILE = {'name': '김철수', 'email': 'user01@naver.com', 'birth_date': '1990-01-02', 'memo': '메모'}
+
+
+@pytest.fixture
+def profile(client, user_token):
+    response = client.put('/my-page', headers={'Authorization': user_token}, json=PROFILE)
+    assert response.status_code == 200
+
+
+def get_etag(client, path, token):
+    response = client.get(path, headers={'Authorization': token})
+    assert response.status_code == 200
+    return response.headers['ETag']
+
+
+def get_status(client, path, token, etag):
+    return client.get(path, headers={'Authorization': token, 'If-None-Match': etag}).status_code
+
+
+def test_my_page_not_modified(client, user_token, profile):
+    etag = get_etag(client, '/my-page', user_token)
+
+    assert get_status(client, '/my-page', user_token, etag) == 304
+    assert get_status(client, '/my-page', user_token, '"other"') == 200
+
+
+def test_users_not_modified(client, admin_token, user_token, profile):
+    etag = get_etag(client, '/users', admin_token)
+
+    assert get_status(client, '/users', admin_token, etag) == 304
+    assert get_status(client, '/users?limit=5', admin_token, etag) == 200
+
+
+def test_unchanged_put_keeps_etags(client, admin_token, user_token, profile):
+    my_page_etag = get_etag(client, '/my-page', user_token)
+    users_etag = get_etag(client, '/users', admin_token)
+
+    response = client.put('/my-page', headers={'Authorization': user_token}, json=PROFILE)
+
+    assert response.status_code == 200
+    assert get_status(client, '/my-page', user_token, my_page_etag) == 304
+    assert get_status(client, '/users', admin_token, users_etag) == 304
+
+
+def test_changed_put_changes_etags(client, admin_token, user_token, profile):
+    my_page_etag = get_etag(client, '/my-page', user_token)
+    users_etag = get_etag(client, '/users', admin_token)
+
+    response = client.put('/my-page', headers={'Authorization': user_token}, json=dict(PROFILE, memo='새 메모'))
+
+    assert response.status_code == 200
+    assert get_status(client, '/my-page', user_token, my_page_etag) == 200
+    assert get_status(client, '/users', admin_token, users_etag) == 200
+    assert client.get('/my-page', headers={'Authorization': user_token}).get_json()['data']['memo'] == '새 메모'
+
+
+def test_sign_up_changes_users_etag(client, admin_token, user_token):
+    etag = get_etag(client, '/users', admin_token)
+
+    client.post('/sign-up', json={'login_id': 'user02', 'password': 'pass1234', 'name': '이영희', 'email': 'user02@naver.com'})
+
+    assert get_status(client, '/users', admin_token, etag) == 200
@@ -0,0 +1,88 @@
+"""
+    scripts.explain --sqlite 검사
+
+    임시 SQLite 데이터베이스에 데이터를 넣고 ANALYZE 한 뒤
+    python -m scripts.explain --sqlite를 실행해서 전체 테이블 스캔이 하나라도 있으면 실패합니다.
+    (빈 테이블에서는 통계가 없어 인덱스 검사가 의미 없으므로 데이터를 넣습니다)
+"""
+
+import datetime
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from utils.enums import PermissionTypeEnum
+from utils.sqlite_connection import get_sqlite_connection
+
+APP_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ACCOUNTS = 500
+ADMIN_EVERY = 50
+EMAIL_DOMAINS = ('naver.com', 'gmail.com', 'daum.net')
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    """
+        유저, 어드민이 들어 있는 임시 SQLite 데이터베이스 파일 경로
+    """
+
+    path = str(tmp_path / 'explain.sqlite3')
+    connection = get_sqlite_connection({'path': path})
+    raw = connection.raw
+    generator = random.Random(1)
+
+    try:
+        counts = {PermissionTypeEnum.admin.value: 0, PermissionTypeEnum.user.value: 0}
+        for account_id in range(1, ACCOUNTS + 1):
+            is_admin = account_id % ADMIN_EVERY == 0
+            permission_type_id = PermissionTypeEnum.admin.value if is_admin else PermissionTypeEnum.user.value
+            created_at = datetime.datetime(2019, 1, 1) + datetime.timedelta(minutes=generator.randrange(10 ** 6))
+            name = generator.choice('김이박최정강조윤장임') + '가나'
+            counts[permission_type_id] += 1
+
+            raw.execute(
+                'INSERT INTO accounts (id, login_id, password, permission_type_id, created_at) VALUES (?, ?, ?, ?, ?)',
+                (account_id, 'user{:07d}'.format(account_id), 'x', permission_type_id, created_at)
+            )
+            if is_admin:
+                raw.execute(
+                    'INSERT INTO admins (account_id, name, created_at) VALUES (?, ?, ?)',
+                    (account_id, name, created_at)
+                )
+            else:
+                raw.execute(
+                    'INSERT INTO users (account_id, name, email, birth_date, created_at) VALUES (?, ?, ?, ?, ?)',
+                    (
+                        account_id, name,
+                        'u{}@{}'.format(account_id, generator.choice(EMAIL_DOMAINS)),
+                        datetime.date(1970, 1, 1) + datetime.timedelta(days=generator.randrange(15000)),
+                        created_at
+                    )
+                )
+
+        raw.executemany(
+            'INSERT INTO account_counters (permission_type_id, slot, count) VALUES (?, 0, ?)',
+            counts.items()
+        )
+        raw.commit()
+        raw.execute('ANALYZE')
+    finally:
+        connection.close()
+
+    return path
+
+
+def test_sqlite_queries_have_no_full_scan(sqlite_path):
+    result = subprocess.run(
+        [sys.executable, '-m', 'scripts.explain', '--sqlite', sqlite_path],
+        cwd=APP_DIRECTORY,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True
+    )
+
+    assert result.returncode == 0, result.stdout
+    assert ' 0 full scans' in result.stdout
@@ -0,0 +1,124 @@
+"""
+    유저 상세 정보 캐시 무효화
+
+    캐시는 commit 후에만 바뀌고 (rollback 되면 그대로), 수정 직후에는 늦은 복제본 대신
+    primary에서 다시 채우는지 검사합니다.
+    늦은 복제본은 수정 전 데이터베이스 파일을 복사해서 읽기용 풀로 사용합니다.
+"""
+
+import jwt
+import pytest
+
+from service.user_service import PROFILE_REFILL
+from utils.connection import ConnectionPool
+from utils.database_session import DatabaseSession
+from utils.sqlite_connection import get_sqlite_connection
+
+
+@pytest.fixture
+def user_service(app):
+    return app.extensions['services'].user_service
+
+
+@pytest.fixture
+def account(app, user_token):
+    """
+        user_token의 account_id, permission_type_id
+    """
+
+    return jwt.decode(user_token, app.config['JWT_SECRET_KEY'], algorithms=[app.config['JWT_ALGORITHM']])
+
+
+@pytest.fixture
+def cache_key(user_service, account):
+    return user_service.profile_cache_key(account)
+
+
+@pytest.fixture
+def stale_replica(app, tmp_path):
+    """
+        지금 상태를 복사한 파일을 읽기용 풀로 사용 (이후 수정이 복제되지 않는 복제본)
+    """
+
+    path = str(tmp_path / 'replica.sqlite3')
+    connection = app.extensions['database'].get_connection()
+    try:
+        connection.raw.execute('VACUUM INTO ?', (path,))
+    finally:
+        app.extensions['database'].release(connection)
+
+    replica = ConnectionPool({'path': path}, connect=get_sqlite_connection)
+    app.extensions['read_database'] = replica
+    yield replica
+
+    app.extensions['read_database'] = app.extensions['database']
+    replica.close()
+
+
+def get_name(client, token):
+    return client.get('/my-page', headers={'Authorization': token}).get_json()['data']['name']
+
+
+def test_after_commit_callbacks_run_only_on_commit(app):
+    session = DatabaseSession(app.extensions['database'])
+    called = []
+
+    session.after_commit(lambda: called.append('rolled back'))
+    session.rollback()
+    session.after_commit(lambda: called.append('committed'))
+    session.commit()
+    session.close()
+
+    assert called == ['committed']
+
+
+def test_put_refills_cache_from_primary(client, user_token, user_service, cache_key, stale_replica):
+    assert get_name(client, user_token) == '김철수'
+
+    response = client.put('/my-page', headers={'Authorization': user_token}, json={
+        'name': '이영희',
+        'email': 'user01@naver.com'
+    })
+
+    assert response.status_code == 200
+    assert user_service.profile_cache.get(cache_key) == PROFILE_REFILL
+    assert get_name(client, user_token) == '이영희'
+    assert user_service.profile_cache.get(cache_key)['name'] == '이영희'
+    assert get_name(client, user_token) == '이영희'
+
+
+def test_etag_check_after_put_uses_primary(client, user_token, stale_replica):
+    etag = client.get('/my-page', headers={'Authorization': user_token}).headers['ETag']
+
+    client.put('/my-page', headers={'Authorization': user_token}, json={'name': '이영희', 'email': 'user01@naver.com'})
+    response = client.get('/my-page', headers={'Authorization': user_token, 'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['name'] == '이영희'
+
+
+def test_rolled_back_put_keeps_cache(app, client, user_token, user_service, account, cache_key):
+    assert get_name(client, user_token) == '김철수'
+    cached = user_service.profile_cache.get(cache_key)
+    assert cached['name'] == '김철수'
+
+    session = DatabaseSession(app.extensions['database'])
+    try:
+        user_service.put_user_information_logic(
+            dict(account, name='박민수', email='user01@naver.com', birth_date=None, memo=None),
+            session
+        )
+        session.rollback()
+    finally:
+        session.close()
+
+    assert user_service.profile_cache.get(cache_key) == cached
+    assert get_name(client, user_token) == '김철수'
+
+
+def test_deleted_user_is_not_served_from_cache(client, user_token):
+    assert get_name(client, user_token) == '김철수'
+
+    assert client.delete('/my-page', headers={'Authorization': user_token}).status_code == 200
+
+    assert client.get('/my-page', headers={'Authorization': user_token}).get_json()['data'] is None
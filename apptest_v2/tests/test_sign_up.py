@@ -0,0 +1,61 @@
+"""
+    회원가입 중복 메시지
+
+    unique 인덱스 에러로 판단하는 login_id, email 중복이 이전과 같은 메시지를 돌려주는지 검사합니다.
+"""
+
+import pytest
+
+USER = {
+    'login_id': 'user01',
+    'password': 'pass1234',
+    'name': '김철수',
+    'email': 'user01@naver.com',
+    'birth_date': '1990-01-02'
+}
+
+
+@pytest.fixture
+def signed_up(client):
+    response = client.post('/sign-up', json=USER)
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize('changes, message', [
+    ({'email': 'other@naver.com'}, 'login_id ALREADY EXISTS'),
+    ({'login_id': 'user02'}, 'email ALREADY EXISTS'),
+    ({'login_id': 'user02', 'email': 'USER01@Naver.com'}, 'email ALREADY EXISTS'),
+    ({}, 'login_id, email ALREADY EXISTS')
+])
+def test_duplicate_sign_up_message(client, signed_up, changes, message):
+    response = client.post('/sign-up', json=dict(USER, **changes))
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
+
+
+def test_admin_duplicate_login_id(client, signed_up):
+    response = client.post('/admin/sign-up', json={'login_id': 'user01', 'password': 'admin1234', 'name': '관리자'})
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'login_id ALREADY EXISTS'
+
+
+def test_deleted_user_keys_can_be_reused(client, signed_up):
+    token = client.post('/login', json={'login_id': 'user01', 'password': 'pass1234'}).get_json()['token']
+    assert client.delete('/my-page', headers={'Authorization': token}).status_code == 200
+
+    response = client.post('/sign-up', json=USER)
+
+    assert response.status_code == 200
+    assert response.get_json()['message'] == 'SUCCESS'
+
+
+def test_duplicate_sign_up_does_not_change_total(client, signed_up, admin_token):
+    client.post('/sign-up', json=USER)
+
+    body = client.get('/users?permission=user', headers={'Authorization': admin_token}).get_json()
+
+    assert body['total'] == 1
+    assert [user['login_id'] for user in body['data']] == ['user01']
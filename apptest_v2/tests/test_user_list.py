@@ -0,0 +1,87 @@
+"""
+    유저 목록 커서 페이지네이션
+
+    next_cursor로 끝까지 넘긴 결과가 한 번에 조회한 목록과 같은지 (빠지거나 겹치는 행 없음),
+    정렬 값이 같은 행(같은 초에 가입)도 account_id로 이어지는지 검사합니다.
+"""
+
+import base64
+
+import pytest
+
+NAMES = ('김철수', '이영희', '박민수', '김철수', '최지우', '정다은', '이영희', '강호동', '김민지', '박민수')
+
+
+@pytest.fixture
+def users(client, admin_token):
+    """
+        일괄 회원가입으로 만든 유저 10명 (같은 초에 가입해서 created_at이 겹침)
+    """
+
+    response = client.post('/admin/users/bulk', headers={'Authorization': admin_token}, json={'users': [
+        {
+            'login_id': 'list{:03d}'.format(number),
+            'password': 'pass1234',
+            'name': name,
+            'email': 'list{}@naver.com'.format(number)
+        }
+        for number, name in enumerate(NAMES)
+    ]})
+    assert response.get_json()['data']['created'] == len(NAMES)
+
+
+def get_users(client, token, **params):
+    query = '&'.join('{}={}'.format(key, value) for key, value in params.items())
+    response = client.get('/users?' + query, headers={'Authorization': token})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def walk_pages(client, token, **params):
+    login_ids, cursor = [], None
+    while True:
+        page_params = dict(params, cursor=cursor) if cursor else params
+        body = get_users(client, token, **page_params)
+        login_ids.extend(user['login_id'] for user in body['data'])
+        assert body['has_next'] == (body['next_cursor'] is not None)
+
+        cursor = body['next_cursor']
+        if cursor is None:
+            return login_ids
+
+
+@pytest.mark.parametrize('permission', ['user', 'all'])
+@pytest.mark.parametrize('sort', ['created_at', '-created_at', 'name', '-name'])
+def test_cursor_pages_match_single_page(client, admin_token, users, sort, permission):
+    expected = [
+        user['login_id']
+        for user in get_users(client, admin_token, permission=permission, sort=sort, limit=100)['data']
+    ]
+
+    assert len(expected) == len(NAMES) + (permission == 'all')
+    assert walk_pages(client, admin_token, permission=permission, sort=sort, limit=3) == expected
+
+
+def test_list_rows_do_not_expose_account_id(client, admin_token, users):
+    body = get_users(client, admin_token, limit=3)
+
+    assert body['total'] == len(NAMES)
+    assert all('account_id' not in user for user in body['data'])
+
+
+def test_cursor_sort_mismatch(client, admin_token, users):
+    cursor = get_users(client, admin_token, limit=3, sort='name')['next_cursor']
+
+    response = client.get('/users?limit=3&sort=-name&cursor=' + cursor, headers={'Authorization': admin_token})
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'CURSOR_SORT_MISMATCH'
+
+
+@pytest.mark.parametrize('payload', [b'["2020-01-01T00:00:00",3]', b'not json', b'["name",1,2]'])
+def test_invalid_cursor(client, admin_token, users, payload):
+    cursor = base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    response = client.get('/users?cursor=' + cursor, headers={'Authorization': admin_token})
+
+    assert response.status_code == 400
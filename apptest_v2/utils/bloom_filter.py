@@ -0,0 +1,234 @@
+import hashlib
+import math
+import threading
+import time
+
+
+class BloomFilter:
+    """
+        블룸 필터
+
+        키가 "확실히 없음" 혹은 "있을 수도 있음"인지 메모리만으로 판단합니다.
+        없는 키를 있다고 할 확률(false positive)이 error_rate 이하가 되도록 크기를 정합니다.
+        있는 키를 없다고 하는 경우는 없습니다.
+
+        비트 수 m = -n * ln(p) / ln(2)^2, 해시 수 k = m / n * ln(2)
+        키 100만 개 기준 메모리
+            p = 1%: 약 9.6 bit/키, 1.2MB
+            p = 0.1%: 약 14.4 bit/키, 1.8MB
+
+        삭제는 지원하지 않습니다.
+        삭제된 키는 false positive가 될 뿐이므로 (데이터베이스 조회로 넘어감) 주기적으로 다시 만들어 정리합니다.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key):
+        """
+            키 추가 (스레드 안전하지 않음, AvailabilityFilter가 잠금 안에서 호출)
+        """
+
+        for index in self._indexes(key):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key))
+
+    @property
+    def memory_bytes(self):
+        return len(self._bits)
+
+    def _indexes(self, key):
+        """
+            비트 위치 계산
+
+            해시 한 번으로 두 값을 만들고 h1 + i * h2로 k개의 위치를 만듭니다. (double hashing)
+        """
+
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+
+class AvailabilityFilter:
+    """
+        login_id, email 사용 여부 사전 검사
+
+        이름(login_id, email)마다 블룸 필터를 두고
+        "확실히 없음"이면 중복 조회 쿼리를 건너뛸 수 있게 합니다.
+        build 전이거나 build에 실패하면 모든 키를 "있을 수도 있음"으로 처리합니다.
+        다른 프로세스에서 가입한 키는 알 수 없으므로 unique 인덱스가 최종 판단을 합니다.
+
+        설정
+            AVAILABILITY_FILTER_ENABLED: 사용 여부 (기본값 True, test_config로 만든 앱은 False)
+            AVAILABILITY_FILTER_CAPACITY: 이름마다 예상 키 수 (기본값 1000000)
+            AVAILABILITY_FILTER_ERROR_RATE: false positive 목표 (기본값 0.01)
+            AVAILABILITY_FILTER_REBUILD_INTERVAL: 다시 만드는 주기(초) (기본값 3600, 0이면 안 함)
+    """
+
+    def __init__(self, names, capacity=1000000, error_rate=0.01):
+        self.names = names
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self._filters = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'checks': 0,
+            'skipped_queries': 0,
+            'false_positives': 0,
+            'true_positives': 0,
+            'rebuilds': 0,
+            'rebuild_seconds': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config, names):
+        return cls(
+            names,
+            capacity=config.get('AVAILABILITY_FILTER_CAPACITY', 1000000),
+            error_rate=config.get('AVAILABILITY_FILTER_ERROR_RATE', 0.01)
+        )
+
+    @property
+    def ready(self):
+        return self._filters is not None
+
+    def build(self, sources):
+        """
+            필터 생성
+
+            새 필터를 모두 만든 뒤 한 번에 교체하므로 만드는 동안에도 기존 필터를 사용합니다.
+            만드는 동안 add된 키는 모아 두었다가 새 필터에도 추가합니다.
+            기존 필터의 키 수가 capacity의 절반을 넘었으면 두 배 크기로 만듭니다.
+
+        Args:
+            sources: {이름: 키를 돌려주는 이터러블}
+
+        Returns:
+            None
+        """
+
+        started_at = time.perf_counter()
+        with self._lock:
+            self._pending = []
+
+        filters = {}
+        previous = self._filters or {}
+        for name in self.names:
+            count = previous[name].count if name in previous else 0
+            capacity = max(self.capacity, 2 * count)
+            bloom_filter = BloomFilter(capacity, self.error_rate)
+            for key in sources[name]:
+                bloom_filter.add(self.normalize(key))
+            filters[name] = bloom_filter
+
+        elapsed = time.perf_counter() - started_at
+        with self._lock:
+            for name, key in self._pending:
+                filters[name].add(key)
+            self._pending = None
+            self._filters = filters
+            self._stats['rebuilds'] += 1
+            self._stats['rebuild_seconds'] = elapsed
+
+    def add(self, name, key):
+        """
+            키 추가
+
+            BloomFilter.add는 바이트를 읽고 다시 쓰므로 동시에 추가하면 비트를 잃을 수 있습니다.
+            (있는 키를 "확실히 없음"으로 판단) 잠금 안에서 추가합니다.
+
+        Args:
+            name: login_id 혹은 email
+            key: 추가할 값
+
+        Returns:
+            None
+        """
+
+        key = self.normalize(key)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((name, key))
+            if self._filters is not None:
+                self._filters[name].add(key)
+
+    def might_contain(self, name, key):
+        """
+            키 존재 가능성 검사
+
+        Args:
+            name: login_id 혹은 email
+            key: 검사할 값
+
+        Returns:
+            False면 확실히 없음, True면 데이터베이스 확인 필요
+        """
+
+        filters = self._filters
+        absent = filters is not None and self.normalize(key) not in filters[name]
+        with self._lock:
+            self._stats['checks'] += 1
+            if absent:
+                self._stats['skipped_queries'] += 1
+        return not absent
+
+    def record_result(self, exists):
+        """
+            "있을 수도 있음" 이후 실제 조회 결과 기록 (false positive 비율 계산용)
+
+        Args:
+            exists: 데이터베이스 조회 결과
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._stats['true_positives' if exists else 'false_positives'] += 1
+
+    def statistics(self):
+        """
+            필터 상태 조회
+
+            hit_rate: 쿼리를 건너뛴 비율
+            false_positive_rate: 없는 키인데 "있을 수도 있음"이었던 비율
+
+        Returns:
+            통계 딕셔너리
+        """
+
+        with self._lock:
+            statistics = dict(self._stats)
+            filters = self._filters
+
+        negatives = statistics['skipped_queries'] + statistics['false_positives']
+        statistics['ready'] = filters is not None
+        statistics['hit_rate'] = statistics['skipped_queries'] / statistics['checks'] if statistics['checks'] else 0.0
+        statistics['false_positive_rate'] = statistics['false_positives'] / negatives if negatives else 0.0
+        statistics['filters'] = {
+            name: {
+                'count': bloom_filter.count,
+                'capacity': bloom_filter.capacity,
+                'memory_bytes': bloom_filter.memory_bytes
+            }
+            for name, bloom_filter in (filters or {}).items()
+        }
+        return statistics
+
+    def normalize(self, key):
+        """
+            대소문자를 구분하지 않는 데이터베이스 collation에 맞춰 소문자로 비교합니다.
+        """
+
+        return key.lower()
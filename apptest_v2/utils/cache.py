@@ -0,0 +1,301 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+        TTL LRU 캐시
+
+        max_size개를 넘으면 가장 오래 사용하지 않은 항목부터 버립니다.
+        항목마다 만료 시간을 두고 만료된 항목은 조회할 때 지웁니다.
+        여러 스레드에서 함께 사용할 수 있습니다.
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def get(self, key):
+        """
+            캐시 조회
+
+        Args:
+            key: 키
+
+        Returns:
+            값 (없거나 만료되었으면 None)
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[1] <= now:
+                if item is not None:
+                    del self._items[key]
+                self._stats['misses'] += 1
+                return None
+
+            self._items.move_to_end(key)
+            self._stats['hits'] += 1
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        """
+            캐시 저장
+
+        Args:
+            key: 키
+            value: 값
+            ttl: 유지 시간(초) (없으면 기본 ttl)
+
+        Returns:
+            None
+        """
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def statistics(self):
+        """
+            캐시 상태 조회
+
+        Returns:
+            통계 딕셔너리
+        """
+
+        with self._lock:
+            statistics = dict(self._stats)
+            statistics['size'] = len(self._items)
+
+        statistics['max_size'] = self.max_size
+        return statistics
+
+
+class NullCache:
+    """
+        캐시를 사용하지 않을 때 쓰는 빈 캐시
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def statistics(self):
+        return {}
+
+
+class SharedCache:
+    """
+        여러 프로세스가 함께 쓰는 캐시
+
+        redis 클라이언트처럼 get, set(ex=), delete를 가진 객체를 감쌉니다.
+        같은 메서드를 가진 객체라면 로컬 대체 구현으로 바꿔 쓸 수 있습니다.
+        값은 pickle로 저장합니다.
+    """
+
+    def __init__(self, client, prefix='', ttl=300):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'errors': 0
+        }
+
+    def get(self, key):
+        """
+            캐시 조회
+
+            캐시 서버 오류는 캐시 없음으로 처리합니다.
+        """
+
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception:
+            self._count('errors')
+            return None
+
+        if value is None:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(self.ttl if ttl is None else ttl)))
+        except Exception:
+            self._count('errors')
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception:
+            self._count('errors')
+
+    def clear(self):
+        pass
+
+    def statistics(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+def create_cache(config, name):
+    """
+        설정으로 캐시 생성
+
+        설정 키는 name을 앞에 붙여서 읽습니다. (name이 PROFILE이면 PROFILE_CACHE_BACKEND)
+            {name}_CACHE_BACKEND: local, redis, None (기본값 local)
+            {name}_CACHE_SIZE: local 캐시 최대 항목 수 (기본값 10000)
+            {name}_CACHE_TTL: 유지 시간(초) (기본값 60)
+            {name}_CACHE_URL: redis 주소
+            {name}_CACHE_CLIENT: redis 대신 사용할 클라이언트 객체
+
+    Args:
+        config: 앱 설정
+        name: 캐시 이름
+
+    Returns:
+        LRUCache, SharedCache 혹은 NullCache
+    """
+
+    backend = config.get(name + '_CACHE_BACKEND', 'local')
+    ttl = config.get(name + '_CACHE_TTL', 60)
+
+    if backend is None:
+        return NullCache()
+
+    if backend == 'local':
+        return LRUCache(config.get(name + '_CACHE_SIZE', 10000), ttl)
+
+    if backend == 'redis':
+        client = config.get(name + '_CACHE_CLIENT')
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(config[name + '_CACHE_URL'])
+        return SharedCache(client, name.lower() + ':', ttl)
+
+    raise ValueError('INVALID_CACHE_BACKEND ' + backend)
+
+
+class TokenCache:
+    """
+        검증된 JWT 캐시
+
+        같은 토큰으로 다시 요청하면 서명 검증(jwt.decode)을 건너뛰고 저장해둔 payload를 사용합니다.
+        토큰 원문 대신 sha256 digest를 키로 사용합니다.
+        payload에 exp가 있으면 exp가 지나면 캐시에서도 만료됩니다.
+        JWT_SECRET_KEY나 JWT_ALGORITHM이 바뀌면 캐시를 비웁니다.
+
+        설정
+            TOKEN_CACHE_SIZE: 최대 토큰 수 (기본값 10000, 0이면 사용 안 함)
+            TOKEN_CACHE_TTL: 유지 시간(초) (기본값 300)
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.cache = LRUCache(max_size, ttl)
+        self._secret = None
+        self._lock = threading.Lock()
+
+    def get(self, token, secret, algorithm):
+        """
+            검증된 payload 조회
+
+        Args:
+            token: JWT
+            secret: JWT_SECRET_KEY
+            algorithm: JWT_ALGORITHM
+
+        Returns:
+            payload (없으면 None)
+        """
+
+        self._check_secret(secret, algorithm)
+        return self.cache.get(self._key(token))
+
+    def set(self, token, payload, secret, algorithm):
+        """
+            검증된 payload 저장
+
+        Args:
+            token: JWT
+            payload: jwt.decode 결과
+            secret: JWT_SECRET_KEY
+            algorithm: JWT_ALGORITHM
+
+        Returns:
+            None
+        """
+
+        self._check_secret(secret, algorithm)
+
+        ttl = self.cache.ttl
+        if 'exp' in payload:
+            ttl = min(ttl, payload['exp'] - time.time())
+            if ttl <= 0:
+                return
+
+        self.cache.set(self._key(token), payload, ttl)
+
+    def statistics(self):
+        return self.cache.statistics()
+
+    def _key(self, token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def _check_secret(self, secret, algorithm):
+        """
+            비밀키 변경 확인
+
+            비밀키 원문을 들고 있지 않도록 digest로 비교합니다.
+        """
+
+        fingerprint = hashlib.sha256(repr((secret, algorithm)).encode('utf-8')).digest()
+        if fingerprint == self._secret:
+            return
+
+        with self._lock:
+            if fingerprint != self._secret:
+                self.cache.clear()
+                self._secret = fingerprint
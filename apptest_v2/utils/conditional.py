@@ -0,0 +1,69 @@
+import hashlib
+
+from flask import request, Response
+
+
+def make_etag(*parts):
+    """
+        ETag 생성
+
+        행 버전 정보를 이어 붙여 해시합니다.
+        응답 본문을 만들지 않고도 같은 값을 계산할 수 있습니다.
+
+    Args:
+        parts: 응답 내용을 결정하는 값들
+
+    Returns:
+        ETag 문자열 (따옴표 제외)
+    """
+
+    return hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def is_not_modified(etag):
+    """
+        If-None-Match 검사
+
+    Args:
+        etag: 현재 ETag
+
+    Returns:
+        클라이언트가 가진 ETag와 같으면 True
+    """
+
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag):
+    """
+        304 응답 생성
+
+    Args:
+        etag: 현재 ETag
+
+    Returns:
+        본문 없는 304 응답
+    """
+
+    return set_etag(Response(status=304), etag)
+
+
+def set_etag(response, etag):
+    """
+        응답에 ETag 설정
+
+        클라이언트가 매번 ETag로 다시 확인하도록 no-cache를 함께 설정합니다.
+        (로그인 유저별 응답이므로 private)
+
+    Args:
+        response: 응답 객체
+        etag: 현재 ETag (None이면 설정하지 않음)
+
+    Returns:
+        response
+    """
+
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,10 +1,24 @@
+import itertools
+import threading
+import time
+from collections import deque
+
 import pymysql
+from pymysql.constants import CLIENT
+
+from utils.custom_exceptions import DatabaseException
+from utils.sqlite_connection import get_sqlite_connection
+
+DATABASE_BACKENDS = ('mysql', 'sqlite')
 
 
 def get_connection(database):
     """
         mysql 연결 함수
 
+        UPDATE의 결과 행 수가 변경된 행이 아닌 조건에 맞는 행 수가 되도록 FOUND_ROWS 플래그를 사용합니다.
+        (값이 같은 UPDATE도 성공으로 처리하기 위함)
+
     Args:
         database: 데이터베이스 정보
 
@@ -16,7 +30,406 @@ def get_connection(database):
         user=database['user'],
         password=database['password'],
         db=database['name'],
-        charset=database['charset']
+        charset=database['charset'],
+        client_flag=CLIENT.FOUND_ROWS
     )
 
     return connection
+
+
+class ConnectionPool:
+    """
+        mysql 커넥션 풀
+
+        요청마다 새 연결을 맺지 않고 열어둔 연결을 재사용합니다.
+        최대 max_size개까지 연결을 만들고, 모두 사용 중이면 timeout초 동안 반납을 기다립니다.
+        idle_timeout초 이상 쉬고 있는 연결은 min_size개를 남기고 닫습니다.
+        pre_ping이 켜져 있으면 꺼낼 때 ping으로 끊어진 연결을 걸러냅니다.
+
+        설정은 DB 설정의 pool_* 키로 지정합니다.
+            pool_min_size: 유지할 최소 유휴 연결 수 (기본값 1)
+            pool_max_size: 최대 연결 수 (기본값 10)
+            pool_timeout: 연결 대기 시간(초) (기본값 5)
+            pool_idle_timeout: 유휴 연결 유지 시간(초) (기본값 300)
+            pool_pre_ping: 꺼낼 때 ping 여부 (기본값 True)
+    """
+
+    def __init__(self, database, connect=get_connection):
+        self.database = database
+        self.min_size = database.get('pool_min_size', 1)
+        self.max_size = database.get('pool_max_size', 10)
+        self.timeout = database.get('pool_timeout', 5)
+        self.idle_timeout = database.get('pool_idle_timeout', 300)
+        self.pre_ping = database.get('pool_pre_ping', True)
+
+        self._connect = connect
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'ping_failures': 0
+        }
+
+    def get_connection(self):
+        """
+            풀에서 연결 꺼내기
+
+            유휴 연결이 있으면 가장 최근에 반납된 연결을 꺼냅니다.
+            없으면 max_size까지 새로 연결하고, 가득 찼으면 반납을 기다립니다.
+
+        Returns:
+            데이터베이스 연결 객체
+        """
+
+        deadline = time.monotonic() + self.timeout
+        connection = None
+
+        with self._condition:
+            expired = self._pop_expired()
+            waited = False
+            while True:
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    self._close_all(expired)
+                    raise DatabaseException('CONNECTION_POOL_TIMEOUT')
+
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._waiting += 1
+                self._condition.wait(remaining)
+                self._waiting -= 1
+
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+
+        self._close_all(expired)
+
+        try:
+            if connection is None:
+                connection = self._create()
+            elif self.pre_ping and not self._ping(connection):
+                self._close(connection)
+                connection = self._create()
+
+        except Exception as e:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._stats['checkouts'] -= 1
+                self._condition.notify()
+            raise e
+
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+            풀에 연결 반납
+
+            조회만 한 연결에도 트랜잭션 스냅샷이 남아 있으므로 rollback 후 반납합니다.
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            discard: True면 재사용하지 않고 닫음
+
+        Returns:
+            None
+        """
+
+        if not discard and connection.open:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        if discard or not connection.open:
+            self._close(connection)
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._in_use -= 1
+            self._condition.notify()
+
+    def close(self):
+        """
+            유휴 연결 모두 닫기
+
+        Returns:
+            None
+        """
+
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        self._close_all(idle)
+
+    @property
+    def in_use(self):
+        """
+            사용 중인 연결 수
+        """
+
+        return self._in_use
+
+    def statistics(self):
+        """
+            풀 상태 조회
+
+        Returns:
+            풀 통계 딕셔너리
+        """
+
+        with self._condition:
+            statistics = dict(self._stats)
+            statistics.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+            return statistics
+
+    def _pop_expired(self):
+        """
+            idle_timeout이 지난 유휴 연결을 꺼냄
+
+            오래된 연결은 deque 왼쪽에 쌓이므로 왼쪽부터 검사합니다.
+            실제로 닫는 작업은 락 밖에서 합니다.
+        """
+
+        expired = []
+        limit = time.monotonic() - self.idle_timeout
+        while self._idle and self._size > self.min_size and self._idle[0][1] < limit:
+            connection, _ = self._idle.popleft()
+            expired.append(connection)
+            self._size -= 1
+        return expired
+
+    def _create(self):
+        connection = self._connect(self.database)
+        with self._condition:
+            self._stats['created'] += 1
+        return connection
+
+    def _ping(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+
+        except Exception:
+            with self._condition:
+                self._stats['ping_failures'] += 1
+            return False
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+        with self._condition:
+            self._stats['closed'] += 1
+
+    def _close_all(self, connections):
+        for connection in connections:
+            self._close(connection)
+
+
+class ReplicaPool:
+    """
+        읽기 전용 복제본 풀
+
+        복제본마다 ConnectionPool을 하나씩 두고 연결을 꺼낼 때 복제본을 고릅니다.
+            round_robin: 복제본을 차례대로 사용
+            least_connections: 사용 중인 연결이 가장 적은 복제본 사용
+        연결에 실패한 복제본은 retry_interval초 동안 제외하고,
+        사용할 수 있는 복제본이 없으면 primary 풀에서 연결을 꺼냅니다.
+    """
+
+    def __init__(self, replicas, primary, selection='round_robin', retry_interval=30):
+        if selection not in ('round_robin', 'least_connections'):
+            raise ValueError('INVALID_REPLICA_SELECTION ' + selection)
+
+        self.replicas = replicas
+        self.primary = primary
+        self.selection = selection
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._owners = {}
+        self._stats = {
+            'replica_checkouts': 0,
+            'primary_fallbacks': 0,
+            'replica_failures': 0
+        }
+
+    def get_connection(self):
+        """
+            복제본에서 연결 꺼내기
+
+        Returns:
+            데이터베이스 연결 객체
+        """
+
+        for pool in self._candidates():
+            try:
+                connection = pool.get_connection()
+
+            except pymysql.err.OperationalError:
+                with self._lock:
+                    self._down_until[id(pool)] = time.monotonic() + self.retry_interval
+                    self._stats['replica_failures'] += 1
+                continue
+
+            except DatabaseException:
+                continue
+
+            with self._lock:
+                self._owners[id(connection)] = pool
+                self._stats['replica_checkouts'] += 1
+            return connection
+
+        connection = self.primary.get_connection()
+        with self._lock:
+            self._owners[id(connection)] = self.primary
+            self._stats['primary_fallbacks'] += 1
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+            연결을 꺼낸 풀에 반납
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            discard: True면 재사용하지 않고 닫음
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            pool = self._owners.pop(id(connection))
+        pool.release(connection, discard)
+
+    def close(self):
+        for pool in self.replicas:
+            pool.close()
+
+    def statistics(self):
+        """
+            복제본 풀 상태 조회
+
+        Returns:
+            복제본 통계 딕셔너리
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            statistics = dict(self._stats)
+            down = [self._down_until.get(id(pool), 0) > now for pool in self.replicas]
+
+        statistics['selection'] = self.selection
+        statistics['replicas'] = [
+            dict(pool.statistics(), down=is_down)
+            for pool, is_down in zip(self.replicas, down)
+        ]
+        return statistics
+
+    def _candidates(self):
+        """
+            연결을 시도할 복제본 순서
+
+            제외 기간이 지나지 않은 복제본은 건너뜁니다.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            alive = [pool for pool in self.replicas if self._down_until.get(id(pool), 0) <= now]
+
+        if not alive:
+            return []
+
+        if self.selection == 'least_connections':
+            return sorted(alive, key=lambda pool: pool.in_use)
+
+        start = next(self._counter) % len(alive)
+        return alive[start:] + alive[:start]
+
+
+def create_pools(database, backend='mysql'):
+    """
+        DB 설정으로 쓰기용, 읽기용 풀 생성
+
+        backend가 sqlite면 DB 설정의 path 파일에 연결하는 풀 하나를 쓰기용, 읽기용으로 함께 사용합니다.
+        (설정 키는 get_sqlite_connection 참고)
+        mysql이면 DB 설정은 연결 정보 하나이거나 primary와 replicas를 가진 딕셔너리입니다.
+            {
+                'primary': {...},
+                'replicas': [{...}, {...}],
+                'replica_selection': 'round_robin' 혹은 'least_connections',
+                'replica_retry_interval': 30
+            }
+        복제본이 없으면 읽기용 풀도 primary 풀을 사용합니다.
+
+    Args:
+        database: DB 설정
+        backend: mysql 혹은 sqlite (DATABASE_BACKEND)
+
+    Returns:
+        (쓰기용 풀, 읽기용 풀)
+
+    Raises:
+        ValueError: 지원하지 않는 backend
+    """
+
+    if backend not in DATABASE_BACKENDS:
+        raise ValueError('UNSUPPORTED_DATABASE_BACKEND ' + str(backend))
+
+    if backend == 'sqlite':
+        pool = ConnectionPool(database, connect=get_sqlite_connection)
+        return pool, pool
+
+    if 'primary' not in database:
+        pool = ConnectionPool(database)
+        return pool, pool
+
+    primary = ConnectionPool(database['primary'])
+    replicas = [ConnectionPool(replica) for replica in database.get('replicas', [])]
+    if not replicas:
+        return primary, primary
+
+    read_pool = ReplicaPool(
+        replicas,
+        primary,
+        selection=database.get('replica_selection', 'round_robin'),
+        retry_interval=database.get('replica_retry_interval', 30)
+    )
+    return primary, read_pool
@@ -35,6 +35,20 @@ class DatabaseException(CustomException):
         super().__init__(status_code, message)
 
 
+class DuplicateEntryError(DatabaseException):
+    """
+        unique 인덱스 중복 에러
+
+        key에 중복이 발생한 인덱스 이름을 담습니다.
+        서비스에서 key를 보고 알맞은 에러로 바꿔서 전달합니다.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        message = 'DUPLICATE_ENTRY ' + key
+        super().__init__(message)
+
+
 class UserDoesNotExist(CustomException):
     """
         해당 유저 없음
@@ -77,3 +91,36 @@ class PutUserInformationError(CustomException):
         status_code = 400
         message = message
         super().__init__(status_code, message)
+
+
+class BulkSignUpError(CustomException):
+    """
+        일괄 가입 요청 에러
+    """
+
+    def __init__(self, message):
+        status_code = 400
+        message = message
+        super().__init__(status_code, message)
+
+
+class UserListError(CustomException):
+    """
+        유저 목록 조회 조건 에러
+    """
+
+    def __init__(self, message):
+        status_code = 400
+        message = message
+        super().__init__(status_code, message)
+
+
+class ServerBusyError(CustomException):
+    """
+        서버 처리량 초과 에러
+    """
+
+    def __init__(self, message):
+        status_code = 503
+        message = message
+        super().__init__(status_code, message)
@@ -1,10 +1,23 @@
+import time
 from datetime import date, datetime
 
 from flask.json import JSONEncoder
 
+from model.records import Record
+from utils.profiling import add_timing
+
 
 class CustomJSONEncoder(JSONEncoder):
+    def encode(self, obj):
+        started_at = time.perf_counter()
+        try:
+            return JSONEncoder.encode(self, obj)
+        finally:
+            add_timing('serialization', started_at)
+
     def default(self, obj):
+        if isinstance(obj, Record):
+            return obj.to_dict()
         if isinstance(obj, datetime):
             return obj.isoformat(sep=' ')
         if isinstance(obj, date):
@@ -0,0 +1,128 @@
+from flask import g, current_app, request
+
+
+class DatabaseSession:
+    """
+        요청 단위 데이터베이스 세션
+
+        Dao가 처음 cursor를 요청할 때 풀에서 연결을 꺼냅니다.
+        로그인 데코레이터나 유효성 검사에서 거절된 요청은 연결을 꺼내지 않습니다.
+        commit, rollback, 반납은 init_session에서 등록한 훅이 처리합니다.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connection = None
+        self.commit_callbacks = []
+
+    def cursor(self, *args, **kwargs):
+        """
+            cursor 생성
+
+            연결이 없으면 이때 풀에서 꺼냅니다.
+        """
+
+        if self.connection is None:
+            self.connection = self.pool.get_connection()
+        return self.connection.cursor(*args, **kwargs)
+
+    def after_commit(self, callback):
+        """
+            commit 후 실행할 함수 등록
+
+            rollback 되면 실행하지 않습니다. (캐시 무효화 등)
+
+        Args:
+            callback: 인자 없는 함수
+
+        Returns:
+            None
+        """
+
+        self.commit_callbacks.append(callback)
+
+    def commit(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self.commit_callbacks = []
+        if self.connection is not None:
+            self.connection.rollback()
+
+    def close(self):
+        """
+            연결 반납
+
+        Returns:
+            None
+        """
+
+        if self.connection is not None:
+            connection, self.connection = self.connection, None
+            self.pool.release(connection)
+
+
+def get_session(read_only=False):
+    """
+        현재 요청의 세션 조회
+
+        세션 객체만 만들고 연결은 열지 않습니다.
+        read_only면 복제본 풀을 사용하는 읽기 전용 세션을 돌려줍니다.
+
+    Args:
+        read_only: 읽기 전용 여부
+
+    Returns:
+        DatabaseSession
+    """
+
+    if read_only:
+        if 'db_read_session' not in g:
+            g.db_read_session = DatabaseSession(current_app.extensions['read_database'])
+        return g.db_read_session
+
+    if 'db_session' not in g:
+        g.db_session = DatabaseSession(current_app.extensions['database'])
+    return g.db_session
+
+
+def init_session(app, pool, read_pool=None):
+    """
+        요청 단위 세션 훅 등록
+
+        응답 상태 코드가 400 미만이면 commit, 아니면 rollback 합니다.
+        조회 요청(GET, HEAD)과 읽기 전용 세션은 반납할 때 풀이 rollback 하므로 commit 하지 않습니다.
+        commit은 after_request에서 실행해서 commit이 실패하면 500 응답이 나가도록 합니다.
+        teardown_request에서는 처리되지 않은 예외가 있었던 경우까지 포함해 연결을 반납합니다.
+
+    Args:
+        app: Flask 객체
+        pool: 쓰기용 커넥션 풀
+        read_pool: 읽기용 커넥션 풀 (없으면 pool 사용)
+
+    """
+
+    app.extensions['database'] = pool
+    app.extensions['read_database'] = read_pool or pool
+
+    @app.after_request
+    def finish_session(response):
+        session = g.get('db_session')
+        if session is not None and request.method not in ('GET', 'HEAD'):
+            if response.status_code < 400:
+                session.commit()
+            else:
+                session.rollback()
+        return response
+
+    @app.teardown_request
+    def close_session(exc):
+        for name in ('db_session', 'db_read_session'):
+            session = g.pop(name, None)
+            if session is not None:
+                session.close()
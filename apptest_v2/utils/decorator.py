@@ -1,9 +1,12 @@
+import time
 from functools import wraps
 
 import jwt
 
 from flask import request, current_app, g, jsonify
 
+from utils.profiling import add_timing
+
 
 def login_decorator(func):
     """
@@ -11,6 +14,7 @@ def login_decorator(func):
 
         로그인 확인 작업을 합니다.
         g객체를 활용해서 account_id와 permission_type_id를 전달합니다.
+        한 번 검증한 토큰은 TokenCache에 저장해서 다시 검증하지 않습니다.
 
     Args:
         func: 타겟 함수
@@ -21,15 +25,27 @@ def login_decorator(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        started_at = time.perf_counter()
         try:
 
             token = request.headers.get('Authorization')
+            secret = current_app.config['JWT_SECRET_KEY']
+            algorithm = current_app.config['JWT_ALGORITHM']
+            token_cache = current_app.extensions.get('token_cache')
+
+            user = None
+            if token and token_cache:
+                user = token_cache.get(token, secret, algorithm)
 
-            user = jwt.decode(
-                token,
-                current_app.config['JWT_SECRET_KEY'],
-                algorithms=current_app.config['JWT_ALGORITHM']
-            )
+            if user is None:
+                user = jwt.decode(
+                    token,
+                    secret,
+                    algorithms=algorithm
+                )
+
+                if token and token_cache:
+                    token_cache.set(token, user, secret, algorithm)
 
             g.account_id = user['account_id']
             g.permission_type_id = user['permission_type_id']
@@ -37,5 +53,8 @@ def login_decorator(func):
         except jwt.exceptions.InvalidTokenError:
             return jsonify({'message': 'INVALID_USER'}), 401
 
+        finally:
+            add_timing('auth', started_at)
+
         return func(*args, **kwargs)
     return wrapper
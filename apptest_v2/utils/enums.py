@@ -9,3 +9,11 @@ class PermissionTypeEnum(Enum):
     admin = 1
     user = 2
 
+
+class UniqueKeyEnum(Enum):
+    """
+        unique 인덱스 이름 상수 클래스
+    """
+
+    login_id = 'uq_accounts_active_login_id'
+    email = 'uq_users_active_email'
@@ -1,3 +1,5 @@
+import traceback
+
 from flask import jsonify
 
 from flask_request_validator.exceptions import InvalidRequestError
@@ -18,6 +20,7 @@ def error_handle(app):
 
     @app.errorhandler(Exception)
     def handle_internal_server_error(e):
+        traceback.print_exc()
         return jsonify({'message': format(e)}), 500
 
     @app.errorhandler(KeyError)
@@ -0,0 +1,313 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from statistics import median
+
+import bcrypt
+
+from utils.custom_exceptions import ServerBusyError
+
+
+DEFAULT_ROUNDS = 12
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def _hashpw(password, rounds, submitted_at):
+    started_at = time.time()
+    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+    return hashed, started_at - submitted_at
+
+
+def _checkpw(password, hashed, submitted_at):
+    started_at = time.time()
+    result = bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return result, started_at - submitted_at
+
+
+def get_rounds(hashed):
+    """
+        암호화된 비밀번호의 bcrypt cost 조회
+
+        형식: $2b$12$...
+
+    Args:
+        hashed: 암호화된 비밀번호
+
+    Returns:
+        cost
+    """
+
+    return int(hashed.split('$')[2])
+
+
+def calibrate_rounds(target_seconds, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, samples=5):
+    """
+        목표 시간 안에 끝나는 가장 높은 bcrypt cost 찾기
+
+        cost가 1 오를 때마다 시간이 두 배가 되므로
+        min_rounds부터 올려가며 목표 시간을 넘기 직전의 cost를 고릅니다.
+        min_rounds에서도 목표 시간을 넘으면 min_rounds를 사용합니다.
+        한 번 잰 시간은 다른 프로세스와 CPU를 나눠 쓰면 튀므로 cost마다 samples번 재서 중앙값을 사용합니다.
+
+    Args:
+        target_seconds: 비밀번호 하나를 암호화하는 목표 시간(초)
+        min_rounds: 최소 cost
+        max_rounds: 최대 cost
+        samples: cost마다 측정 횟수
+
+    Returns:
+        cost
+    """
+
+    rounds = min_rounds
+    while rounds < max_rounds:
+        timings = []
+        for _ in range(samples):
+            started_at = time.perf_counter()
+            bcrypt.hashpw(b'calibration', bcrypt.gensalt(rounds))
+            timings.append(time.perf_counter() - started_at)
+        elapsed = median(timings)
+        if elapsed * 2 > target_seconds:
+            break
+        rounds += 1
+    return rounds
+
+
+class PasswordHasher:
+    """
+        bcrypt 작업 실행기
+
+        bcrypt 암호화, 검사를 요청 스레드가 아닌 별도 프로세스 풀에서 실행합니다.
+        로그인이 몰려도 다른 API 요청을 처리하는 스레드가 CPU를 빼앗기지 않습니다.
+
+        동시에 맡길 수 있는 작업 수를 queue_size로 제한하고,
+        queue_timeout초 안에 자리가 나지 않으면 ServerBusyError(503)를 발생시킵니다.
+        일괄 암호화(hash_many)는 동시에 bulk_limit개까지만 맡겨서
+        큰 일괄 가입이 대기열을 채워 로그인이 503이 되지 않도록 나머지 자리와 작업자를 남겨둡니다.
+        작업 수, 대기 시간은 statistics()와 /metrics(init_service_metrics)로 확인합니다.
+        wait_observer를 지정하면 작업마다 대기 시간(초)을 넘깁니다.
+
+        bcrypt cost는 BCRYPT_ROUNDS로 지정하거나,
+        BCRYPT_TARGET_MS를 지정하면 앱 생성 시 이 장비에서 목표 시간에 맞는 cost를 측정해서 사용합니다.
+        둘 다 없으면 12를 사용합니다.
+        측정은 프로세스마다 따로 하므로 작업자끼리 cost가 다를 수 있습니다.
+        그래서 측정한 cost는 저장된 cost보다 높을 때만 다시 암호화하고 (upgrade_only)
+        BCRYPT_ROUNDS는 다를 때 다시 암호화합니다.
+        운영에서는 python -m scripts.calibrate_bcrypt로 한 번 측정한 값을 BCRYPT_ROUNDS로 지정합니다.
+
+        설정
+            BCRYPT_ROUNDS: bcrypt cost
+            BCRYPT_TARGET_MS: 비밀번호 하나를 암호화하는 목표 시간(ms)
+            HASH_EXECUTOR: process 혹은 thread (기본값 process)
+            HASH_WORKERS: 작업자 수 (기본값 CPU 코어 수)
+            HASH_QUEUE_SIZE: 실행 중인 작업을 포함한 최대 작업 수 (기본값 작업자 수 * 4)
+            HASH_QUEUE_TIMEOUT: 자리를 기다리는 시간(초) (기본값 5)
+            HASH_BULK_IN_FLIGHT: 일괄 암호화가 동시에 맡기는 최대 작업 수 (기본값 작업자 수 / 2, 최소 1)
+    """
+
+    def __init__(self, rounds=DEFAULT_ROUNDS, executor='process', workers=None, queue_size=None, queue_timeout=5,
+                 bulk_limit=None, upgrade_only=False):
+        if executor not in ('process', 'thread'):
+            raise ValueError('INVALID_HASH_EXECUTOR ' + executor)
+
+        self.rounds = rounds
+        self.upgrade_only = upgrade_only
+        self.executor_type = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * 4
+        self.queue_timeout = queue_timeout
+        self.bulk_limit = min(bulk_limit or max(1, self.workers // 2), self.queue_size)
+
+        self.wait_observer = None
+
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._bulk_slots = threading.BoundedSemaphore(self.bulk_limit)
+        self._lock = threading.Lock()
+        self._stats = {
+            'depth': 0,
+            'max_depth': 0,
+            'bulk_depth': 0,
+            'submitted': 0,
+            'rejected': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        rounds = config.get('BCRYPT_ROUNDS')
+        calibrated = rounds is None and bool(config.get('BCRYPT_TARGET_MS'))
+        if calibrated:
+            rounds = calibrate_rounds(config['BCRYPT_TARGET_MS'] / 1000)
+
+        return cls(
+            rounds=rounds or DEFAULT_ROUNDS,
+            executor=config.get('HASH_EXECUTOR', 'process'),
+            workers=config.get('HASH_WORKERS'),
+            queue_size=config.get('HASH_QUEUE_SIZE'),
+            queue_timeout=config.get('HASH_QUEUE_TIMEOUT', 5),
+            bulk_limit=config.get('HASH_BULK_IN_FLIGHT'),
+            upgrade_only=calibrated
+        )
+
+    def hash(self, password):
+        """
+            비밀번호 암호화
+
+        Args:
+            password: 비밀번호
+
+        Returns:
+            암호화된 비밀번호
+        """
+
+        return self._result(self._submit(_hashpw, password, self.rounds))
+
+    def hash_many(self, passwords):
+        """
+            비밀번호 여러 개를 병렬로 암호화
+
+            모든 일괄 요청을 합쳐 bulk_limit개까지만 동시에 맡기고
+            하나가 끝나면 다음 비밀번호를 맡깁니다.
+
+        Args:
+            passwords: [비밀번호]
+
+        Returns:
+            [암호화된 비밀번호]
+        """
+
+        futures = []
+        for password in passwords:
+            self._bulk_slots.acquire()
+            with self._lock:
+                self._stats['bulk_depth'] += 1
+
+            try:
+                future = self._submit(_hashpw, password, self.rounds)
+            except Exception as e:
+                self._bulk_done(None)
+                raise e
+
+            future.add_done_callback(self._bulk_done)
+            futures.append(future)
+
+        return [self._result(future) for future in futures]
+
+    def check(self, password, hashed):
+        """
+            비밀번호 검사
+
+        Args:
+            password: 비밀번호
+            hashed: 암호화된 비밀번호
+
+        Returns:
+            일치 여부
+        """
+
+        return self._result(self._submit(_checkpw, password, hashed))
+
+    def needs_rehash(self, hashed):
+        """
+            다시 암호화가 필요한지 검사
+
+        Args:
+            hashed: 암호화된 비밀번호
+
+        Returns:
+            저장된 cost가 현재 cost와 다르면 True (upgrade_only면 낮을 때만 True)
+        """
+
+        if self.upgrade_only:
+            return get_rounds(hashed) < self.rounds
+        return get_rounds(hashed) != self.rounds
+
+    def statistics(self):
+        """
+            실행기 상태 조회
+
+            depth: 대기 중이거나 실행 중인 작업 수
+            bulk_depth: 그중 일괄 암호화 작업 수 (bulk_limit 이하)
+            wait_seconds_*: 작업을 맡긴 뒤 작업자가 시작하기까지 걸린 시간
+
+        Returns:
+            통계 딕셔너리
+        """
+
+        with self._lock:
+            statistics = dict(self._stats)
+
+        statistics.update({
+            'rounds': self.rounds,
+            'executor': self.executor_type,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'bulk_limit': self.bulk_limit
+        })
+        return statistics
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _get_executor(self):
+        """
+            실행기 생성
+
+            앱 생성 시점이 아닌 처음 사용할 때 만들어서
+            WSGI 서버가 작업 프로세스를 fork한 뒤에 프로세스 풀이 생기도록 합니다.
+        """
+
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, func, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise ServerBusyError('HASHING_QUEUE_FULL')
+
+        with self._lock:
+            self._stats['depth'] += 1
+            self._stats['submitted'] += 1
+            self._stats['max_depth'] = max(self._stats['max_depth'], self._stats['depth'])
+
+        try:
+            future = self._get_executor().submit(func, *args, time.time())
+        except Exception as e:
+            self._done(None)
+            raise e
+
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._stats['depth'] -= 1
+        self._slots.release()
+
+    def _bulk_done(self, future):
+        with self._lock:
+            self._stats['bulk_depth'] -= 1
+        self._bulk_slots.release()
+
+    def _result(self, future):
+        result, waited = future.result()
+        waited = max(waited, 0.0)
+        with self._lock:
+            self._stats['wait_seconds_total'] += waited
+            self._stats['wait_seconds_max'] = max(self._stats['wait_seconds_max'], waited)
+        if self.wait_observer is not None:
+            self.wait_observer(waited)
+        return result
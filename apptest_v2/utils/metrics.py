@@ -0,0 +1,658 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from inspect import signature
+
+import pymysql
+from flask import g, request
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+HASH_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values, extra=''):
+    """
+        Prometheus 라벨 문자열
+
+    Args:
+        names: 라벨 이름 튜플
+        values: 라벨 값 튜플
+        extra: 뒤에 붙일 라벨 (히스토그램의 le)
+
+    Returns:
+        '{name="value",...}' (라벨이 없으면 '')
+    """
+
+    pairs = ['{}="{}"'.format(name, escape_label(value)) for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+        라벨별 누적 값
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        """
+            값 증가
+
+        Args:
+            labels: 라벨 값 튜플 (labelnames 순서)
+            amount: 증가량
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+
+        return [
+            self.name + format_labels(self.labelnames, labels) + ' ' + format_value(value)
+            for labels, value in values
+        ]
+
+
+class Gauge:
+    """
+        수집할 때 읽는 현재 값
+
+        collect는 [(라벨 값 튜플, 값)]을 돌려주는 함수입니다.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, description, labelnames, collect):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def samples(self):
+        return [
+            self.name + format_labels(self.labelnames, labels) + ' ' + format_value(value)
+            for labels, value in self.collect()
+        ]
+
+
+class CollectedCounter(Gauge):
+    """
+        수집할 때 읽는 누적 값
+
+        다른 객체가 세고 있는 값(statistics())을 counter로 내보냅니다.
+    """
+
+    kind = 'counter'
+
+
+class Histogram:
+    """
+        라벨별 히스토그램
+
+        구간마다 개수만 세고 누적 개수는 출력할 때 계산합니다.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def observe(self, labels, value):
+        """
+            값 기록
+
+        Args:
+            labels: 라벨 값 튜플 (labelnames 순서)
+            value: 값
+
+        Returns:
+            None
+        """
+
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._values.get(labels)
+            if child is None:
+                child = self._values[labels] = [[0] * (len(self.buckets) + 1), 0]
+            child[0][index] += 1
+            child[1] += value
+
+    def count(self, labels=()):
+        with self._lock:
+            child = self._values.get(labels)
+            return sum(child[0]) if child else 0
+
+    def totals(self, labels=()):
+        """
+            (기록 수, 합계)
+        """
+
+        with self._lock:
+            child = self._values.get(labels)
+            return (sum(child[0]), child[1]) if child else (0, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted((labels, list(counts), total) for labels, (counts, total) in self._values.items())
+
+        samples = []
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(
+                    self.name + '_bucket' +
+                    format_labels(self.labelnames, labels, 'le="{}"'.format(format_value(float(bound)))) +
+                    ' ' + str(cumulative)
+                )
+            label_text = format_labels(self.labelnames, labels)
+            samples.append(self.name + '_sum' + label_text + ' ' + format_value(total))
+            samples.append(self.name + '_count' + label_text + ' ' + str(cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+        지표 모음
+
+        render로 Prometheus 텍스트 형식(0.0.4)을 만듭니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, metric):
+        """
+            지표 등록
+
+            같은 이름이 이미 있으면 새 지표로 바꿉니다. (앱을 다시 만드는 경우)
+
+        Args:
+            metric: Counter, Gauge 혹은 Histogram
+
+        Returns:
+            metric
+        """
+
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name):
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append('# HELP {} {}'.format(metric.name, metric.description))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.kind))
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class QueryMetrics:
+    """
+        Dao 쿼리 지표
+
+        쿼리 이름(Dao 메서드 이름)별 실행 시간, 행 수, 에러 수와 요청별 쿼리 수를 기록합니다.
+        요청별 쿼리 수와 시간은 스레드마다 세고 start_request 이후 finish_request, request_seconds로 읽습니다.
+    """
+
+    def __init__(self, registry):
+        self.duration = registry.register(Histogram(
+            'apptest_query_duration_seconds', 'UserDao query latency in seconds.', ('query',)))
+        self.rows = registry.register(Counter(
+            'apptest_query_rows_total', 'Rows returned or affected by UserDao queries.', ('query',)))
+        self.errors = registry.register(Counter(
+            'apptest_query_errors_total', 'UserDao queries that raised an error.', ('query',)))
+        self._local = threading.local()
+
+    def observe(self, name, seconds, rows):
+        labels = (name,)
+        self.duration.observe(labels, seconds)
+        if rows > 0:
+            self.rows.inc(labels, rows)
+        local = self._local
+        local.queries = getattr(local, 'queries', 0) + 1
+        local.seconds = getattr(local, 'seconds', 0.0) + seconds
+
+    def add_rows(self, name, rows):
+        if rows:
+            self.rows.inc((name,), rows)
+
+    def error(self, name):
+        self.errors.inc((name,))
+
+    def start_request(self):
+        self._local.queries = 0
+        self._local.seconds = 0.0
+
+    def finish_request(self):
+        """
+            현재 스레드에서 start_request 이후 실행한 쿼리 수
+        """
+
+        return getattr(self._local, 'queries', 0)
+
+    def request_seconds(self):
+        """
+            현재 스레드에서 start_request 이후 쿼리 실행에 쓴 시간(초)
+        """
+
+        return getattr(self._local, 'seconds', 0.0)
+
+
+class InstrumentedCursor:
+    """
+        실행 시간, 행 수, 에러를 기록하는 cursor
+
+        기록하지 않는 속성과 메서드(fetchone, lastrowid 등)는 원래 cursor에 넘깁니다.
+        서버 측 커서(SSCursor, SQLite의 unbuffered cursor)는 execute가 행 수를 모르므로
+        fetchmany로 읽은 행 수를 셉니다.
+    """
+
+    __slots__ = ('_cursor', '_name', '_metrics', '_unbuffered')
+
+    def __init__(self, cursor, name, metrics):
+        self._cursor = cursor
+        self._name = name
+        self._metrics = metrics
+        self._unbuffered = isinstance(cursor, pymysql.cursors.SSCursor) or getattr(cursor, 'unbuffered', False)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        return self._cursor.__exit__(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, query, args=None):
+        return self._run(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._run(self._cursor.executemany, query, args)
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size)
+        if self._unbuffered:
+            self._metrics.add_rows(self._name, len(rows))
+        return rows
+
+    def _run(self, execute, query, args):
+        started_at = time.perf_counter()
+        try:
+            result = execute(query, args)
+        except Exception:
+            self._metrics.error(self._name)
+            raise
+
+        self._metrics.observe(self._name, time.perf_counter() - started_at, result or 0)
+        return result
+
+
+class InstrumentedConnection:
+    """
+        cursor를 InstrumentedCursor로 감싸는 연결 객체
+
+        나머지 속성과 메서드(after_commit, commit 등)는 원래 연결에 넘깁니다.
+    """
+
+    __slots__ = ('_connection', '_name', '_metrics')
+
+    def __init__(self, connection, name, metrics):
+        self._connection = connection
+        self._name = name
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._name, self._metrics)
+
+
+def instrument_queries(metrics):
+    """
+        Dao 클래스 데코레이터
+
+        connection 인자를 받는 공개 메서드마다 connection을 InstrumentedConnection으로 감싸서
+        그 메서드에서 실행하는 쿼리를 메서드 이름으로 기록합니다.
+        다른 Dao 메서드를 호출하면 (상위 클래스 메서드 포함) 감싼 연결을 풀어서 다시 감싸므로
+        안쪽 메서드 이름으로 한 번만 기록됩니다.
+        Dao 객체의 record_queries가 False면 감싸지 않습니다.
+        (앱마다 자기 Dao 객체에 지정하므로 한 프로세스의 여러 앱이 서로의 설정을 바꾸지 않음)
+
+    Args:
+        metrics: QueryMetrics
+
+    Returns:
+        클래스 데코레이터
+    """
+
+    def instrument(name, method):
+        position = list(signature(method).parameters).index('connection')
+
+        def wrap(connection):
+            if isinstance(connection, InstrumentedConnection):
+                connection = connection._connection
+            return InstrumentedConnection(connection, name, metrics)
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not getattr(args[0], 'record_queries', False):
+                return method(*args, **kwargs)
+
+            if 'connection' in kwargs:
+                kwargs['connection'] = wrap(kwargs['connection'])
+            elif len(args) > position:
+                args = args[:position] + (wrap(args[position]),) + args[position + 1:]
+            return method(*args, **kwargs)
+        return wrapper
+
+    def decorator(cls):
+        for name, method in list(vars(cls).items()):
+            if name.startswith('_') or not callable(method):
+                continue
+            if 'connection' in signature(method).parameters:
+                setattr(cls, name, instrument(name, method))
+        return cls
+    return decorator
+
+
+REGISTRY = MetricsRegistry()
+
+QUERY_METRICS = QueryMetrics(REGISTRY)
+
+
+def pool_collector(app):
+    """
+        커넥션 풀 연결 수 수집 함수
+
+        수집할 때 app.extensions의 쓰기용, 읽기용 풀을 읽습니다.
+
+    Args:
+        app: Flask 객체
+
+    Returns:
+        Gauge collect 함수
+    """
+
+    def collect():
+        pools = {'primary': app.extensions['database']}
+        if app.extensions['read_database'] is not pools['primary']:
+            pools['read'] = app.extensions['read_database']
+
+        samples = []
+        for pool_name, pool in pools.items():
+            statistics = pool.statistics()
+            for replica_index, replica in enumerate(statistics.get('replicas', ())):
+                name = '{}_replica{}'.format(pool_name, replica_index)
+                samples.extend(((name, state), replica[state]) for state in ('size', 'idle', 'in_use', 'waiting'))
+            if 'size' in statistics:
+                samples.extend(((pool_name, state), statistics[state]) for state in ('size', 'idle', 'in_use', 'waiting'))
+        return samples
+    return collect
+
+
+def init_metrics(app, registry=REGISTRY, query_metrics=QUERY_METRICS):
+    """
+        요청 지표 훅 등록
+
+        엔드포인트별 처리 시간과 요청별 쿼리 수를 기록하고 커넥션 풀 연결 수를 등록합니다.
+        after_request는 등록의 역순으로 실행되므로 init_session보다 먼저 호출해야
+        commit 시간까지 처리 시간에 포함됩니다.
+        METRICS_ENABLED(기본값 False)가 False면 쿼리 기록도 끕니다.
+        다만 프로파일러(init_profiling)가 있으면 Server-Timing의 db 시간을 위해 쿼리를 기록합니다.
+        쿼리 기록 여부는 app.extensions['record_queries']에 두고 init_service_metrics가 이 앱의 Dao에 지정합니다.
+        스트리밍 응답(export)은 본문을 보내기 전까지의 시간입니다.
+
+    Args:
+        app: Flask 객체
+        registry: MetricsRegistry
+        query_metrics: QueryMetrics
+
+    """
+
+    record_queries = app.config.get('METRICS_ENABLED', False) or 'profiler' in app.extensions
+    app.extensions['metrics'] = registry
+    app.extensions['record_queries'] = record_queries
+    if not record_queries:
+        return
+
+    request_duration = registry.register(Histogram(
+        'apptest_request_duration_seconds', 'Request latency in seconds.', ('endpoint', 'method', 'status')))
+    request_queries = registry.register(Histogram(
+        'apptest_request_queries', 'UserDao queries per request.', ('endpoint',), QUERY_COUNT_BUCKETS))
+
+    registry.register(Gauge(
+        'apptest_db_pool_connections', 'Connection pool connections by state.', ('pool', 'state'),
+        pool_collector(app)))
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started_at = time.perf_counter()
+        query_metrics.start_request()
+
+    @app.after_request
+    def finish_request_metrics(response):
+        started_at = g.get('metrics_started_at')
+        if started_at is not None:
+            endpoint = request.endpoint or 'unknown'
+            request_duration.observe(
+                (endpoint, request.method, str(response.status_code)),
+                time.perf_counter() - started_at
+            )
+            request_queries.observe((endpoint,), query_metrics.finish_request())
+        return response
+
+
+def hasher_collector(hasher, names):
+    """
+        bcrypt 실행기 상태 수집 함수
+
+    Args:
+        hasher: PasswordHasher
+        names: 읽을 statistics() 키 튜플
+
+    Returns:
+        Gauge collect 함수 (라벨 없음, 키가 여러 개면 state 라벨)
+    """
+
+    def collect():
+        statistics = hasher.statistics()
+        if len(names) == 1:
+            return [((), statistics[names[0]])]
+        return [((name,), statistics[name]) for name in names]
+    return collect
+
+
+def cache_collector(caches, names):
+    """
+        캐시 상태 수집 함수
+
+        statistics()에 없는 키는 건너뜁니다. (NullCache는 모두 없음, SharedCache는 크기 없음)
+
+    Args:
+        caches: {캐시 이름: 캐시} (없는 캐시는 None)
+        names: {statistics() 키: 라벨 값}
+
+    Returns:
+        Gauge collect 함수 (cache 라벨, 키가 여러 개면 두 번째 라벨)
+    """
+
+    def collect():
+        samples = []
+        for cache_name, cache in caches.items():
+            if cache is None:
+                continue
+            statistics = cache.statistics()
+            for key, label in names.items():
+                if key in statistics:
+                    samples.append(((cache_name, label) if len(names) > 1 else (cache_name,), statistics[key]))
+        return samples
+    return collect
+
+
+def availability_filter_collector(availability_filter, names=None, filter_names=None):
+    """
+        블룸 필터 상태 수집 함수
+
+    Args:
+        availability_filter: AvailabilityFilter
+        names: {statistics() 키: 라벨 값} (값이 None이면 라벨 없음)
+        filter_names: 이름(login_id, email)별 필터에서 읽을 키 (names 대신 사용)
+
+    Returns:
+        Gauge collect 함수
+    """
+
+    def collect():
+        statistics = availability_filter.statistics()
+        if filter_names is not None:
+            return [
+                ((name, key), bloom_filter[key])
+                for name, bloom_filter in sorted(statistics['filters'].items())
+                for key in filter_names
+            ]
+        return [(() if label is None else (label,), float(statistics[key])) for key, label in names.items()]
+    return collect
+
+
+def init_service_metrics(app, user_service, registry=REGISTRY):
+    """
+        서비스 지표 등록
+
+        UserService가 가진 bcrypt 실행기의 상태를 수집할 때 읽도록 등록합니다.
+            apptest_hash_queue_jobs: 대기 중이거나 실행 중인 작업 수 (depth), 최대 작업 수 (queue_size), 최댓값 (max_depth),
+                일괄 암호화 작업 수와 최대 수 (bulk_depth, bulk_limit)
+            apptest_hash_jobs_total, apptest_hash_rejected_total: 맡긴 작업 수, 자리가 없어 503으로 거절한 작업 수
+            apptest_hash_wait_seconds: 작업을 맡긴 뒤 작업자가 시작하기까지 걸린 시간 (CPU 포화)
+        검증된 JWT 캐시(token), 유저 상세 정보 캐시(profile)의 적중 수도 등록합니다.
+            apptest_cache_requests_total: 조회 결과별 수 (hit, miss, error)
+            apptest_cache_evictions_total, apptest_cache_entries: 크기 제한으로 버린 항목 수, 항목 수와 최대 항목 수
+        login_id, email 블룸 필터(AvailabilityFilter) 상태도 등록합니다.
+            apptest_availability_filter_checks_total: 검사 결과별 수
+                (skipped: 쿼리 생략, true_positive: 조회 결과 있음, false_positive: 조회 결과 없음)
+            apptest_availability_filter_ratio: hit_rate, false_positive_rate
+            apptest_availability_filter_rebuilds_total, apptest_availability_filter_rebuild_seconds: 생성 횟수, 마지막 생성 시간
+            apptest_availability_filter_keys, apptest_availability_filter_memory_bytes: 필터별 키 수와 용량, 메모리
+        UserService의 Dao에 이 앱의 쿼리 기록 여부(init_metrics)를 지정합니다.
+        METRICS_ENABLED가 False면 지표는 등록하지 않습니다.
+
+    Args:
+        app: Flask 객체
+        user_service: UserService
+        registry: MetricsRegistry
+
+    """
+
+    user_service.user_dao.record_queries = app.extensions.get('record_queries', False)
+    if not app.config.get('METRICS_ENABLED', False):
+        return
+
+    hasher = user_service.hasher
+    registry.register(Gauge(
+        'apptest_hash_queue_jobs', 'bcrypt jobs queued or running, queue capacity, peak depth and bulk jobs.', ('state',),
+        hasher_collector(hasher, ('depth', 'queue_size', 'max_depth', 'bulk_depth', 'bulk_limit'))))
+    registry.register(Gauge(
+        'apptest_hash_workers', 'bcrypt executor workers.', (), hasher_collector(hasher, ('workers',))))
+    registry.register(CollectedCounter(
+        'apptest_hash_jobs_total', 'bcrypt jobs submitted.', (), hasher_collector(hasher, ('submitted',))))
+    registry.register(CollectedCounter(
+        'apptest_hash_rejected_total', 'bcrypt jobs rejected because the queue was full.', (),
+        hasher_collector(hasher, ('rejected',))))
+
+    wait_seconds = registry.register(Histogram(
+        'apptest_hash_wait_seconds', 'Time bcrypt jobs waited for a worker in seconds.', (), HASH_WAIT_BUCKETS))
+    hasher.wait_observer = lambda seconds: wait_seconds.observe((), seconds)
+
+    caches = {'token': app.extensions.get('token_cache'), 'profile': user_service.profile_cache}
+    registry.register(CollectedCounter(
+        'apptest_cache_requests_total', 'Cache lookups by result.', ('cache', 'result'),
+        cache_collector(caches, {'hits': 'hit', 'misses': 'miss', 'errors': 'error'})))
+    registry.register(CollectedCounter(
+        'apptest_cache_evictions_total', 'Cache entries evicted by the size limit.', ('cache',),
+        cache_collector(caches, {'evictions': 'evictions'})))
+    registry.register(Gauge(
+        'apptest_cache_entries', 'Cache entries and maximum entries.', ('cache', 'state'),
+        cache_collector(caches, {'size': 'size', 'max_size': 'max_size'})))
+
+    availability_filter = user_service.availability_filter
+    registry.register(CollectedCounter(
+        'apptest_availability_filter_checks_total', 'Availability Bloom filter checks by result.', ('result',),
+        availability_filter_collector(availability_filter, {
+            'skipped_queries': 'skipped',
+            'true_positives': 'true_positive',
+            'false_positives': 'false_positive'
+        })))
+    registry.register(Gauge(
+        'apptest_availability_filter_ratio', 'Availability Bloom filter hit and false positive rates.', ('ratio',),
+        availability_filter_collector(availability_filter, {
+            'hit_rate': 'hit_rate',
+            'false_positive_rate': 'false_positive_rate'
+        })))
+    registry.register(Gauge(
+        'apptest_availability_filter_ready', 'Whether the availability Bloom filter has been built.', (),
+        availability_filter_collector(availability_filter, {'ready': None})))
+    registry.register(CollectedCounter(
+        'apptest_availability_filter_rebuilds_total', 'Availability Bloom filter rebuilds.', (),
+        availability_filter_collector(availability_filter, {'rebuilds': None})))
+    registry.register(Gauge(
+        'apptest_availability_filter_rebuild_seconds', 'Duration of the last availability Bloom filter rebuild.', (),
+        availability_filter_collector(availability_filter, {'rebuild_seconds': None})))
+    registry.register(Gauge(
+        'apptest_availability_filter_keys', 'Keys in each availability Bloom filter and its capacity.',
+        ('filter', 'state'), availability_filter_collector(availability_filter, filter_names=('count', 'capacity'))))
+    registry.register(Gauge(
+        'apptest_availability_filter_memory_bytes', 'Memory used by each availability Bloom filter.', ('filter',),
+        availability_filter_collector(availability_filter, filter_names=('memory_bytes',))))
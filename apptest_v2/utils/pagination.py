@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(value, account_id, sort='created_at'):
+    """
+        페이지 커서 생성
+
+        마지막 행의 (정렬 값, account_id)와 정렬 기준을 base64 문자열로 만듭니다.
+
+    Args:
+        value: 마지막 행의 정렬 컬럼 값
+        account_id: 마지막 행의 어카운트 아이디
+        sort: 정렬 기준 (created_at, -name 등)
+
+    Returns:
+        커서 문자열
+    """
+
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, account_id], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+        페이지 커서 해석
+
+    Args:
+        cursor: encode_cursor로 만든 문자열
+
+    Returns:
+        (정렬 기준, 정렬 값, account_id)
+
+    Raises:
+        ValueError: 형식이 맞지 않는 커서
+    """
+
+    padded = cursor + '=' * (-len(cursor) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    sort, value, account_id = payload
+
+    if not isinstance(sort, str) or not isinstance(value, str) or not isinstance(account_id, int):
+        raise ValueError('INVALID_CURSOR')
+    if sort.lstrip('-') == 'created_at':
+        value = datetime.fromisoformat(value)
+    return sort, value, account_id
@@ -0,0 +1,284 @@
+import cProfile
+import hashlib
+import hmac
+import itertools
+import os
+import pstats
+import random
+import threading
+import time
+
+from flask import g, has_app_context, request
+
+from utils.metrics import QUERY_METRICS
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+SERVER_TIMING_PHASES = ('auth', 'validation', 'db', 'serialization')
+
+
+def add_timing(name, started_at):
+    """
+        현재 요청의 Server-Timing 구간에 시간 추가
+
+        Server-Timing을 만들지 않는 요청이나 요청 밖에서는 아무것도 하지 않습니다.
+
+    Args:
+        name: 구간 이름 (auth, validation, serialization)
+        started_at: time.perf_counter()로 잰 시작 시간
+
+    Returns:
+        None
+    """
+
+    if not has_app_context():
+        return
+
+    timings = g.get('server_timing')
+    if timings is not None:
+        timings[name] = timings.get(name, 0) + time.perf_counter() - started_at
+
+
+def sign_profile_token(secret, ttl=300, now=None):
+    """
+        프로파일링 요청 헤더 값 생성
+
+    Args:
+        secret: PROFILE_SECRET
+        ttl: 유효 시간(초)
+        now: 현재 시각 (unix time)
+
+    Returns:
+        '만료 시각.서명'
+    """
+
+    expires_at = int((time.time() if now is None else now) + ttl)
+    signature = hmac.new(secret.encode('utf-8'), str(expires_at).encode('utf-8'), hashlib.sha256).hexdigest()
+    return '{}.{}'.format(expires_at, signature)
+
+
+def verify_profile_token(secret, token, now=None):
+    """
+        프로파일링 요청 헤더 검증
+
+    Args:
+        secret: PROFILE_SECRET
+        token: 헤더 값
+        now: 현재 시각 (unix time)
+
+    Returns:
+        서명이 맞고 만료되지 않았으면 True
+    """
+
+    if not secret or not token:
+        return False
+
+    expires_at, _, signature = token.partition('.')
+    if not expires_at.isdigit():
+        return False
+
+    expected = hmac.new(secret.encode('utf-8'), expires_at.encode('utf-8'), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature) and int(expires_at) >= (time.time() if now is None else now)
+
+
+def collapsed_stacks(stats):
+    """
+        pstats를 collapsed stack 형식으로 변환
+
+        cProfile은 호출 경로가 아닌 호출자-피호출자 관계만 기록하므로
+        각 함수의 자체 시간을 호출 관계의 누적 시간 비율로 나눠서 경로를 추정합니다.
+        flamegraph.pl, speedscope 등에서 열 수 있습니다.
+
+    Args:
+        stats: pstats.Stats
+
+    Returns:
+        ['함수;함수;함수 마이크로초']
+    """
+
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    def label(func):
+        file_name, line, name = func
+        return '{}:{}:{}'.format(os.path.basename(file_name), line, name) if line else name
+
+    lines = {}
+
+    def walk(func, stack, ratio):
+        _, _, self_time, total_time, _ = entries[func]
+        stack = stack + (label(func),)
+        microseconds = int(self_time * ratio * 1000000)
+        if microseconds:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0) + microseconds
+
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            # 1마이크로초 미만인 경로와 재귀 호출은 따라가지 않음
+            if callee_total and ratio * edge_time >= 0.000001 and label(callee) not in stack:
+                walk(callee, stack, ratio * edge_time / callee_total)
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, (), 1.0)
+
+    return ['{} {}'.format(stack, microseconds) for stack, microseconds in sorted(lines.items())]
+
+
+class RequestProfiler:
+    """
+        요청 단위 cProfile
+
+        PROFILE_ENABLED일 때 서명된 X-Profile-Token 헤더가 있거나
+        PROFILE_SAMPLE_RATE 확률에 걸린 요청을 프로파일링합니다.
+        before_request부터 after_request까지 (login_decorator, 유효성 검사, 서비스, JSON 변환, commit 포함)
+        기록해서 PROFILE_DIR에 요청마다 .prof(pstats)와 .collapsed 파일을 씁니다.
+        cProfile은 동시에 하나만 켤 수 있으므로 다른 요청을 프로파일링 중이면 건너뜁니다.
+
+        Server-Timing 헤더(auth, validation, db, serialization, total)는
+        SERVER_TIMING_ENABLED이거나 서명된 헤더가 있는 요청에 붙입니다.
+    """
+
+    def __init__(self, config):
+        self.enabled = config.get('PROFILE_ENABLED', False)
+        self.directory = config.get('PROFILE_DIR', 'profiles')
+        self.sample_rate = config.get('PROFILE_SAMPLE_RATE', 0.0)
+        self.secret = config.get('PROFILE_SECRET')
+        self.server_timing = config.get('SERVER_TIMING_ENABLED', False)
+
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def start(self):
+        """
+            요청 시작 (before_request)
+
+        Returns:
+            None
+        """
+
+        signed = verify_profile_token(self.secret, request.headers.get(PROFILE_HEADER))
+
+        if self.server_timing or signed:
+            g.server_timing = {}
+            g.server_timing_started_at = time.perf_counter()
+
+        if not self.enabled:
+            return
+        if not signed and not (self.sample_rate and random.random() < self.sample_rate):
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 프로파일러가 켜져 있음
+            self._lock.release()
+            return
+        g.profiler = profiler
+
+    def finish(self, response):
+        """
+            요청 끝 (after_request)
+
+        Args:
+            response: 응답 객체
+
+        Returns:
+            응답 객체
+        """
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            self._lock.release()
+            response.headers['X-Profile-Id'] = self.write(profiler)
+
+        timings = g.get('server_timing')
+        if timings is not None:
+            response.headers['Server-Timing'] = self.server_timing_header(timings)
+        return response
+
+    def discard(self, exc):
+        """
+            after_request까지 가지 못한 요청의 프로파일러 정리 (teardown_request)
+        """
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            self._lock.release()
+
+    def server_timing_header(self, timings):
+        """
+            Server-Timing 헤더 값
+
+        Args:
+            timings: {구간 이름: 초}
+
+        Returns:
+            'auth;dur=0.120, ..., total;dur=3.400' (밀리초)
+        """
+
+        timings = dict(timings, db=QUERY_METRICS.request_seconds())
+        parts = [
+            '{};dur={:.3f}'.format(name, timings[name] * 1000)
+            for name in SERVER_TIMING_PHASES if timings.get(name)
+        ]
+        parts.append('total;dur={:.3f}'.format((time.perf_counter() - g.server_timing_started_at) * 1000))
+        return ', '.join(parts)
+
+    def write(self, profiler):
+        """
+            프로파일 파일 저장
+
+        Args:
+            profiler: 끝난 cProfile.Profile
+
+        Returns:
+            파일 이름 (확장자 제외)
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = '{}-{}-{}-{}-{}'.format(
+            time.strftime('%Y%m%d%H%M%S'),
+            request.endpoint or 'unknown',
+            request.method,
+            os.getpid(),
+            next(self._counter)
+        )
+        path = os.path.join(self.directory, name)
+
+        profiler.dump_stats(path + '.prof')
+        with open(path + '.collapsed', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(collapsed_stacks(pstats.Stats(profiler))) + '\n')
+        return name
+
+
+def init_profiling(app):
+    """
+        요청 프로파일링, Server-Timing 훅 등록
+
+        PROFILE_ENABLED, SERVER_TIMING_ENABLED, PROFILE_SECRET이 모두 없으면 등록하지 않습니다.
+        after_request는 등록의 역순으로 실행되므로 init_metrics, init_session보다 먼저 호출해서
+        다른 훅(commit 포함)이 모두 끝난 뒤에 프로파일링을 끝냅니다.
+
+    Args:
+        app: Flask 객체
+
+    """
+
+    profiler = RequestProfiler(app.config)
+    if not (profiler.enabled or profiler.server_timing or profiler.secret):
+        return
+
+    app.extensions['profiler'] = profiler
+    app.before_request(profiler.start)
+    app.after_request(profiler.finish)
+    app.teardown_request(profiler.discard)
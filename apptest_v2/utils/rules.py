@@ -4,12 +4,19 @@ from datetime import datetime, date
 from flask_request_validator import AbstractRule
 from flask_request_validator.exceptions import RuleError
 
+from .pagination import decode_cursor
+
+LOGIN_ID_PATTERN = re.compile('^[a-z0-9]{6,30}$')
+NAME_PATTERN = re.compile('^[가-힣]{2,30}$')
+NAME_PREFIX_PATTERN = re.compile('^[가-힣]{1,30}$')
+EMAIL_DOMAIN_PATTERN = re.compile('^[a-zA-Z0-9]+\\.[a-zA-Z0-9]+$')
+EMAIL_PATTERN = re.compile('^[a-zA-Z0-9-_]+@[a-zA-Z0-9]+\\.[a-zA-Z0-9]+$')
+PASSWORD_PATTERN = re.compile('^[a-zA-Z0-9]{6,20}$')
+
 
 class LoginIdRule(AbstractRule):
     def validate(self, value):
-        pattern = '^[a-z0-9]{6,30}$'
-        regex = re.compile(pattern)
-        result = regex.match(value)
+        result = LOGIN_ID_PATTERN.match(value)
         if not result:
             raise RuleError('INVALID_ID')
         return value
@@ -17,9 +24,7 @@ class LoginIdRule(AbstractRule):
 
 class NameRule(AbstractRule):
     def validate(self, value):
-        pattern = '^[가-힣]{2,30}$'
-        regex = re.compile(pattern)
-        result = regex.match(value)
+        result = NAME_PATTERN.match(value)
         if not result:
             raise RuleError('INVALID_NAME')
         return value
@@ -27,9 +32,7 @@ class NameRule(AbstractRule):
 
 class EmailRule(AbstractRule):
     def validate(self, value):
-        pattern = '^[a-zA-Z0-9-_]+@[a-zA-Z0-9]+\.[a-zA-Z0-9]+$'
-        regex = re.compile(pattern)
-        result = regex.match(value)
+        result = EMAIL_PATTERN.match(value)
         if not result:
             raise RuleError('INVALID_EMAIL')
         return value
@@ -40,9 +43,7 @@ class PutEmailRule(AbstractRule):
         if value == 'None':
             return None
 
-        pattern = '^[a-zA-Z0-9-_]+@[a-zA-Z0-9]+\.[a-zA-Z0-9]+$'
-        regex = re.compile(pattern)
-        result = regex.match(value)
+        result = EMAIL_PATTERN.match(value)
         if not result:
             raise RuleError('INVALID_EMAIL')
         return value
@@ -56,9 +57,7 @@ class PasswordRule(AbstractRule):
     """
 
     def validate(self, value):
-        pattern = '^[a-zA-Z0-9]{6,20}$'
-        regex = re.compile(pattern)
-        result = regex.match(value)
+        result = PASSWORD_PATTERN.match(value)
         if not result:
             raise RuleError('INVALID_PASSWORD')
         return value
@@ -74,8 +73,11 @@ class BirthDateRule(AbstractRule):
     def validate(self, value):
         if value == 'None':
             return None
-        birth_date = datetime.strptime(value, "%Y-%m-%d")
-        if birth_date.strftime("%Y-%m-%d") > date.today().strftime("%Y-%m-%d"):
+        try:
+            birth_date = datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise RuleError('INVALID_BIRTH_DATE')
+        if birth_date > date.today():
             raise RuleError('INVALID_BIRTH_DATE')
         return value
 
@@ -108,3 +110,69 @@ class ZeroRule(AbstractRule):
         if value == '0':
             return 0
         return int(value)
+
+
+class NamePrefixRule(AbstractRule):
+    """
+        이름 검색 규칙
+
+        한글 1-30글자 (앞부분 일치 검색)
+        flask_request_validator의 오류로 인해 값이 없으면 'None'이 들어옵니다.
+    """
+
+    def validate(self, value):
+        if value == 'None':
+            return None
+        if not NAME_PREFIX_PATTERN.match(value):
+            raise RuleError('INVALID_NAME')
+        return value
+
+
+class EmailDomainRule(AbstractRule):
+    """
+        이메일 도메인 규칙
+
+        이메일 규칙의 @ 뒷부분 (naver.com)
+        flask_request_validator의 오류로 인해 값이 없으면 'None'이 들어옵니다.
+    """
+
+    def validate(self, value):
+        if value == 'None':
+            return None
+        if not EMAIL_DOMAIN_PATTERN.match(value):
+            raise RuleError('INVALID_EMAIL_DOMAIN')
+        return value
+
+
+class DateRule(AbstractRule):
+    """
+        날짜 검색 규칙
+
+        YYYY-MM-DD 형식의 날짜를 date로 바꿉니다.
+        flask_request_validator의 오류로 인해 값이 없으면 'None'이 들어옵니다.
+    """
+
+    def validate(self, value):
+        if value == 'None':
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise RuleError('INVALID_DATE')
+
+
+class CursorRule(AbstractRule):
+    """
+        페이지 커서 규칙
+
+        encode_cursor로 만든 문자열을 (정렬 기준, 정렬 값, account_id)로 바꿉니다.
+        flask_request_validator의 오류로 인해 값이 없으면 'None'이 들어옵니다.
+    """
+
+    def validate(self, value):
+        if value == 'None':
+            return None
+        try:
+            return decode_cursor(value)
+        except (ValueError, TypeError):
+            raise RuleError('INVALID_CURSOR')
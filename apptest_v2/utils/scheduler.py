@@ -0,0 +1,55 @@
+import threading
+import traceback
+
+
+def start_periodic_job(interval, func, name, run_first=False):
+    """
+        주기 작업 실행
+
+        데몬 스레드에서 interval초마다 func를 실행합니다.
+        func에서 에러가 나도 다음 주기에 다시 실행합니다.
+
+    Args:
+        interval: 주기(초) (0이면 run_first일 때 한 번만 실행)
+        func: 인자 없는 함수
+        name: 스레드 이름
+        run_first: 시작하자마자 한 번 실행할지 여부
+
+    Returns:
+        멈출 때 set 하는 threading.Event (stop_periodic_jobs)
+    """
+
+    stopped = threading.Event()
+
+    def call():
+        try:
+            func()
+        except Exception:
+            traceback.print_exc()
+
+    def run():
+        if run_first and not stopped.is_set():
+            call()
+        while interval and not stopped.wait(interval):
+            call()
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return stopped
+
+
+def stop_periodic_jobs(jobs):
+    """
+        주기 작업 멈춤
+
+        실행 중인 작업은 끝날 때까지 기다리지 않고 다음 주기부터 실행하지 않습니다.
+
+    Args:
+        jobs: {이름: start_periodic_job 결과} (app.extensions['periodic_jobs'])
+
+    Returns:
+        None
+    """
+
+    for stopped in jobs.values():
+        stopped.set()
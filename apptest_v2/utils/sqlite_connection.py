@@ -0,0 +1,348 @@
+import json
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+import pymysql
+
+from utils.custom_exceptions import DatabaseException
+
+# schema/sqlite_schema.sql의 user_version과 같아야 함
+SQLITE_SCHEMA_VERSION = 9
+
+SQLITE_SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schema', 'sqlite_schema.sql')
+
+DUPLICATE_ENTRY = 1062
+
+PLACEHOLDER = re.compile(r'(IN\s+)?%(?:\((\w+)\))?s|%%')
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode('ascii')))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode('ascii')))
+
+
+@lru_cache(maxsize=1024)
+def translate(query):
+    """
+        pymysql 형식 SQL을 SQLite 형식으로 변환
+
+        %s는 ?, %(name)s는 :name으로 바꿉니다.
+        IN %s, IN %(name)s는 리스트를 JSON 문자열 하나로 넘기도록 json_each로 바꿔서
+        리스트 길이와 상관없이 같은 SQL 문자열(같은 prepared statement)을 사용합니다.
+
+    Args:
+        query: Dao의 SQL
+
+    Returns:
+        (SQLite SQL, IN 리스트 이름 튜플, IN 리스트 위치 튜플)
+    """
+
+    names, positions = [], []
+    counter = [0]
+
+    def replace(match):
+        if match.group(0) == '%%':
+            return '%'
+
+        in_list, name = match.group(1), match.group(2)
+        if name is None:
+            if in_list:
+                positions.append(counter[0])
+            counter[0] += 1
+            placeholder = '?'
+        else:
+            if in_list:
+                names.append(name)
+            placeholder = ':' + name
+
+        if in_list:
+            return in_list + '(SELECT value FROM json_each({}))'.format(placeholder)
+        return placeholder
+
+    return PLACEHOLDER.sub(replace, query), tuple(names), tuple(positions)
+
+
+def convert_args(args, names, positions):
+    """
+        pymysql execute 인자를 sqlite3 인자로 변환
+
+        pymysql처럼 튜플, 리스트, 딕셔너리가 아닌 값 하나는 인자 하나로 봅니다.
+        IN 리스트는 JSON 문자열로 바꿉니다.
+    """
+
+    if args is None:
+        return ()
+
+    if isinstance(args, dict):
+        if not names:
+            return args
+        args = dict(args)
+        for name in names:
+            args[name] = json.dumps(list(args[name]), ensure_ascii=False)
+        return args
+
+    if not isinstance(args, (tuple, list)):
+        return (args,)
+    if not positions:
+        return args
+
+    args = list(args)
+    for position in positions:
+        args[position] = json.dumps(list(args[position]), ensure_ascii=False)
+    return args
+
+
+class SqliteCursor:
+    """
+        pymysql cursor처럼 동작하는 sqlite3 cursor
+
+        execute는 pymysql처럼 조회한 행 수, 변경한 행 수를 돌려줍니다.
+        조회 결과는 execute에서 모두 읽어둡니다. (pymysql의 기본 cursor와 같음)
+        SSCursor를 요청하면 읽어두지 않고 fetchmany로 나눠 읽습니다.
+        DictCursor를 요청하면 행을 딕셔너리로 돌려줍니다.
+    """
+
+    def __init__(self, connection, cursor_class=None):
+        self.connection = connection
+        self.unbuffered = cursor_class is not None and issubclass(cursor_class, pymysql.cursors.SSCursor)
+        self.dict_rows = cursor_class is not None and issubclass(cursor_class, pymysql.cursors.DictCursorMixin)
+        self.rowcount = -1
+        self.lastrowid = None
+        self.description = None
+
+        self._cursor = connection.raw.cursor()
+        self._rows = None
+        self._position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def execute(self, query, args=None):
+        sql, names, positions = translate(query)
+        if not self.connection.raw.in_transaction and sql.lstrip().upper().startswith('SAVEPOINT'):
+            # 트랜잭션 밖의 SAVEPOINT는 새 트랜잭션을 시작하고 RELEASE가 commit 하므로
+            # pymysql처럼 트랜잭션 안에서 만들어지도록 먼저 시작합니다.
+            self.connection.raw.execute('BEGIN IMMEDIATE;')
+        return self._run(self._cursor.execute, sql, convert_args(args, names, positions))
+
+    def executemany(self, query, args):
+        sql, names, positions = translate(query)
+        return self._run(self._cursor.executemany, sql, [convert_args(row, names, positions) for row in args])
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        size = size or 1
+        if self._rows is None:
+            return self._convert(self._cursor.fetchmany(size))
+
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self._rows is None:
+            return self._convert(self._cursor.fetchall())
+
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self):
+        self._rows = None
+        self._cursor.close()
+
+    def _run(self, execute, sql, args):
+        try:
+            execute(sql, args)
+
+        except sqlite3.IntegrityError as e:
+            raise self.connection.integrity_error(e) from e
+
+        self.lastrowid = self._cursor.lastrowid
+        self.description = self._cursor.description
+        self._rows, self._position = None, 0
+
+        if self.description is None:
+            self.rowcount = self._cursor.rowcount
+            return self.rowcount
+
+        if self.unbuffered:
+            self.rowcount = -1
+            return 0
+
+        self._rows = self._convert(self._cursor.fetchall())
+        self.rowcount = len(self._rows)
+        return self.rowcount
+
+    def _convert(self, rows):
+        if not self.dict_rows:
+            return rows
+
+        names = [column[0] for column in self.description]
+        return [dict(zip(names, row)) for row in rows]
+
+
+class SqliteConnection:
+    """
+        pymysql 연결처럼 동작하는 sqlite3 연결
+
+        UserDao의 SQL(pymysql 형식)과 cursor 종류를 그대로 사용할 수 있게 합니다.
+        unique 인덱스 중복은 UserDao가 처리하는 pymysql IntegrityError(1062) 형식으로 바꿉니다.
+        ConnectionPool이 사용하는 open, ping, rollback, close도 같은 이름으로 제공합니다.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.open = True
+
+    def cursor(self, cursor_class=None):
+        return SqliteCursor(self, cursor_class)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def ping(self, reconnect=False):
+        self.raw.execute('SELECT 1;').fetchone()
+
+    def close(self):
+        """
+            연결 닫기
+
+            닫기 전에 PRAGMA optimize로 필요한 인덱스 통계를 갱신합니다.
+        """
+
+        if not self.open:
+            return
+
+        self.open = False
+        try:
+            self.raw.execute('PRAGMA optimize;')
+        finally:
+            self.raw.close()
+
+    def integrity_error(self, e):
+        """
+            sqlite3 IntegrityError를 pymysql IntegrityError로 변환
+
+            메시지 형식: UNIQUE constraint failed: table.column, table.column
+            컬럼이 같은 unique 인덱스 이름을 찾아서 MySQL의 Duplicate entry 메시지로 만듭니다.
+            (INTEGER PRIMARY KEY는 인덱스가 따로 없으므로 PRIMARY)
+
+        Args:
+            e: sqlite3.IntegrityError
+
+        Returns:
+            pymysql.err.IntegrityError
+        """
+
+        message = str(e)
+        prefix = 'UNIQUE constraint failed: '
+        if not message.startswith(prefix):
+            return pymysql.err.IntegrityError(getattr(e, 'sqlite_errorcode', 0), message)
+
+        columns = [column.split('.', 1) for column in message[len(prefix):].split(', ')]
+        table = columns[0][0]
+        key = 'PRIMARY'
+        for _, index_name, unique, origin, _ in self.raw.execute('PRAGMA index_list({});'.format(table)):
+            index_columns = [row[2] for row in self.raw.execute('PRAGMA index_info({});'.format(index_name))]
+            if unique and index_columns == [column for _, column in columns]:
+                key = 'PRIMARY' if origin == 'pk' else index_name
+                break
+
+        return pymysql.err.IntegrityError(DUPLICATE_ENTRY, "Duplicate entry for key '{}.{}'".format(table, key))
+
+
+def create_sqlite_schema(raw):
+    """
+        스키마 생성
+
+        빈 데이터베이스(user_version 0)면 schema/sqlite_schema.sql을 실행합니다.
+        스크립트는 BEGIN IMMEDIATE로 시작하고 IF NOT EXISTS를 사용하므로
+        여러 연결이 동시에 실행해도 한 번만 만들어집니다.
+        IF NOT EXISTS는 이미 있는 테이블의 컬럼을 바꾸지 않으므로
+        이전 버전 스키마로 만든 파일은 실행하지 않고 에러를 발생시킵니다. (파일을 지우고 다시 만듦)
+
+    Args:
+        raw: sqlite3 연결
+
+    Returns:
+        None
+
+    Raises:
+        DatabaseException: 이전 버전 스키마로 만든 파일
+    """
+
+    version = raw.execute('PRAGMA user_version;').fetchone()[0]
+    if version >= SQLITE_SCHEMA_VERSION:
+        return
+    if version:
+        raise DatabaseException('SQLITE_SCHEMA_OUTDATED {} < {}'.format(version, SQLITE_SCHEMA_VERSION))
+
+    with open(SQLITE_SCHEMA_PATH, encoding='utf-8') as f:
+        raw.executescript(f.read())
+
+
+def get_sqlite_connection(database):
+    """
+        sqlite 연결 함수
+
+        DATABASE_BACKEND가 sqlite일 때 ConnectionPool이 사용합니다.
+        WAL 모드에서는 쓰기 하나와 읽기 여러 개가 서로 기다리지 않습니다.
+        쓰기 트랜잭션은 BEGIN IMMEDIATE로 시작해서 다른 쓰기가 끝날 때까지 busy_timeout초 기다립니다.
+        sqlite3 모듈은 연결마다 SQL 문자열별 prepared statement를 statement_cache_size개까지 재사용합니다.
+        name LIKE '김%'가 (is_deleted, name) 인덱스 범위로 조회되도록 LIKE는 대소문자를 구분합니다.
+        (이름은 한글만 허용하므로 결과는 같음)
+
+        설정은 DB 설정의 키로 지정합니다.
+            path: 데이터베이스 파일 경로 (file:로 시작하면 URI)
+            busy_timeout: 잠금 대기 시간(초) (기본값 5)
+            statement_cache_size: 연결마다 재사용할 prepared statement 수 (기본값 256)
+            cache_size_kb: 페이지 캐시 크기 (기본값 65536)
+            mmap_size: 메모리 맵 크기 (기본값 268435456)
+            synchronous: NORMAL 혹은 FULL (기본값 NORMAL, WAL에서는 전원이 꺼질 때만 마지막 commit을 잃을 수 있음)
+
+    Args:
+        database: 데이터베이스 정보
+
+    Returns:
+        SqliteConnection
+    """
+
+    raw = sqlite3.connect(
+        database['path'],
+        timeout=database.get('busy_timeout', 5),
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        isolation_level='IMMEDIATE',
+        check_same_thread=False,
+        cached_statements=database.get('statement_cache_size', 256),
+        uri=database['path'].startswith('file:')
+    )
+
+    try:
+        raw.execute('PRAGMA journal_mode = WAL;')
+        raw.execute('PRAGMA synchronous = {};'.format(database.get('synchronous', 'NORMAL')))
+        raw.execute('PRAGMA foreign_keys = ON;')
+        raw.execute('PRAGMA temp_store = MEMORY;')
+        raw.execute('PRAGMA case_sensitive_like = ON;')
+        raw.execute('PRAGMA cache_size = -{:d};'.format(database.get('cache_size_kb', 65536)))
+        raw.execute('PRAGMA mmap_size = {:d};'.format(database.get('mmap_size', 268435456)))
+        create_sqlite_schema(raw)
+
+    except Exception as e:
+        raw.close()
+        raise e
+
+    return SqliteConnection(raw)
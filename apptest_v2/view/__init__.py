@@ -1,14 +1,22 @@
-from view.user_view import UserLoginView, UserDetailView, UserListView, UserSignUpView, AdminSignUpView
+from view.user_view import (
+    UserLoginView,
+    UserDetailView,
+    UserListView,
+    UserSignUpView,
+    AdminSignUpView,
+    UserExportView,
+    BulkSignUpView
+)
+from view.metrics_view import MetricsView
 from utils.error_handler import error_handle
 
 
-def create_endpoints(app, services, database):
+def create_endpoints(app, services):
     app.add_url_rule(
         '/sign-up',
         view_func=UserSignUpView.as_view(
             'sign_up_view',
-            services,
-            database
+            services
         )
     )
 
@@ -16,8 +24,15 @@ def create_endpoints(app, services, database):
         '/admin/sign-up',
         view_func=AdminSignUpView.as_view(
             'admin_sign_up_view',
-            services,
-            database
+            services
+        )
+    )
+
+    app.add_url_rule(
+        '/admin/users/bulk',
+        view_func=BulkSignUpView.as_view(
+            'bulk_sign_up_view',
+            services
         )
     )
 
@@ -25,8 +40,7 @@ def create_endpoints(app, services, database):
         '/login',
         view_func=UserLoginView.as_view(
             'login_view',
-            services,
-            database
+            services
         )
     )
 
@@ -34,8 +48,15 @@ def create_endpoints(app, services, database):
         '/users',
         view_func=UserListView.as_view(
             'user_view',
-            services,
-            database
+            services
+        )
+    )
+
+    app.add_url_rule(
+        '/admin/users/export',
+        view_func=UserExportView.as_view(
+            'user_export_view',
+            services
         )
     )
 
@@ -43,9 +64,17 @@ def create_endpoints(app, services, database):
         '/my-page',
         view_func=UserDetailView.as_view(
             'user_detail_view',
-            services,
-            database
+            services
         )
     )
 
+    if app.config.get('METRICS_ENABLED', False):
+        app.add_url_rule(
+            '/metrics',
+            view_func=MetricsView.as_view(
+                'metrics_view',
+                services
+            )
+        )
+
     error_handle(app)
@@ -0,0 +1,36 @@
+import hmac
+
+from flask import Response, current_app, request
+from flask.views import MethodView
+
+from utils.custom_exceptions import PermissionDeniedError
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(MethodView):
+    """
+        Prometheus 지표 뷰
+
+        METRICS_ENABLED일 때만 등록합니다. (기본값 False)
+        METRICS_TOKEN을 지정하면 Authorization: Bearer <METRICS_TOKEN> 헤더가 있는 요청만 응답합니다.
+        (Prometheus scrape 설정의 authorization) 지정하지 않으면 내부망에서만 접근할 수 있게 배포합니다.
+    """
+
+    def __init__(self, services):
+        self.services = services
+
+    def get(self):
+        """
+            지표 조회
+
+        Returns:
+            Prometheus 텍스트 형식 지표
+        """
+
+        token = current_app.config.get('METRICS_TOKEN')
+        if token and not hmac.compare_digest(
+                request.headers.get('Authorization', '').encode('utf-8'), 'Bearer {}'.format(token).encode('utf-8')):
+            raise PermissionDeniedError('PERMISSION_DENIED')
+
+        return Response(current_app.extensions['metrics'].render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,21 +1,37 @@
-import traceback
+import json
 
-from flask import jsonify, g
+from flask import jsonify, g, request, Response, stream_with_context
 from flask.views import MethodView
 
 from flask_request_validator import (
-    validate_params,
     Param,
     JSON,
     GET,
     Enum
 )
 
-from utils.rules import EmailRule, LoginIdRule, PasswordRule, BirthDateRule, NameRule, MemoRule, ZeroRule, PutEmailRule
-from utils.connection import get_connection
+from model.user_dao import USER_LIST_SORTS
+from utils.rules import (
+    EmailRule,
+    LoginIdRule,
+    PasswordRule,
+    BirthDateRule,
+    NameRule,
+    MemoRule,
+    ZeroRule,
+    PutEmailRule,
+    CursorRule,
+    NamePrefixRule,
+    EmailDomainRule,
+    DateRule
+)
+from utils.conditional import is_not_modified, not_modified, set_etag
+from utils.database_session import get_session
 from utils.decorator import login_decorator
 from utils.enums import PermissionTypeEnum
-from utils.custom_exceptions import PermissionDeniedError, PutUserInformationError
+from utils.custom_exceptions import PermissionDeniedError, PutUserInformationError, BulkSignUpError
+from utils.custom_json_encoder import CustomJSONEncoder
+from utils.validation import compile_params
 
 
 class UserSignUpView(MethodView):
@@ -23,11 +39,10 @@ class UserSignUpView(MethodView):
         유저 회원가입 뷰
     """
 
-    def __init__(self, services, database):
+    def __init__(self, services):
         self.user_service = services.user_service
-        self.database = database
 
-    @validate_params(
+    @compile_params(
         Param('login_id', JSON, str, rules=[LoginIdRule()]),
         Param('password', JSON, str, rules=[PasswordRule()]),
         Param('name', JSON, str, rules=[NameRule()]),
@@ -52,23 +67,9 @@ class UserSignUpView(MethodView):
             {'message': 'SUCCESS'}, 200
         """
 
-        connection = None
-        try:
-            data = valid.get_json()
-            connection = get_connection(self.database)
-            self.user_service.sign_up_logic(data, connection)
-            connection.commit()
-            return jsonify({'message': 'SUCCESS'}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            if connection:
-                connection.rollback()
-            raise e
-
-        finally:
-            if connection:
-                connection.close()
+        data = valid.get_json()
+        self.user_service.sign_up_logic(data, get_session())
+        return jsonify({'message': 'SUCCESS'}), 200
 
 
 class AdminSignUpView(MethodView):
@@ -76,11 +77,10 @@ class AdminSignUpView(MethodView):
         어드민 회원가입 뷰
     """
 
-    def __init__(self, services, database):
+    def __init__(self, services):
         self.user_service = services.user_service
-        self.database = database
 
-    @validate_params(
+    @compile_params(
         Param('login_id', JSON, str, rules=[LoginIdRule()]),
         Param('password', JSON, str, rules=[PasswordRule()]),
         Param('name', JSON, str, rules=[NameRule()]),
@@ -100,23 +100,55 @@ class AdminSignUpView(MethodView):
             {'message': 'SUCCESS'}, 200
         """
 
-        connection = None
-        try:
-            data = valid.get_json()
-            connection = get_connection(self.database)
-            self.user_service.admin_sign_up_logic(data, connection)
-            connection.commit()
-            return jsonify({'message': 'SUCCESS'}), 200
+        data = valid.get_json()
+        self.user_service.admin_sign_up_logic(data, get_session())
+        return jsonify({'message': 'SUCCESS'}), 200
+
+
+class BulkSignUpView(MethodView):
+    """
+        일괄 회원가입 뷰
+    """
+
+    def __init__(self, services):
+        self.user_service = services.user_service
+
+    @login_decorator
+    def post(self):
+        """
+            일괄 회원가입 (유저)
+
+            어드민만 사용 가능
+            행마다 회원가입과 같은 규칙으로 검사하고 결과를 돌려줍니다.
+            잘못되었거나 중복된 행은 건너뛰고 나머지 행만 생성합니다.
+            flask_request_validator는 JSON 배열 Param을 처리하지 못해서 본문을 직접 읽습니다.
+
+        Body:
+            users = [회원가입 (유저)와 같은 형식의 객체]
 
-        except Exception as e:
-            traceback.print_exc()
-            if connection:
-                connection.rollback()
-            raise e
+        Returns:
+            {'message': 'SUCCESS', 'data': {'created': 생성 수, 'failed': 실패 수, 'results': [행 결과]}}, 200
+        """
 
-        finally:
-            if connection:
-                connection.close()
+        if g.permission_type_id != PermissionTypeEnum.admin.value:
+            raise PermissionDeniedError('PERMISSION_DENIED')
+
+        body = request.get_json(silent=True)
+        records = body.get('users') if isinstance(body, dict) else None
+        if not isinstance(records, list):
+            raise BulkSignUpError('USERS_MUST_BE_LIST')
+
+        results = self.user_service.bulk_sign_up(records, get_session())
+        created = sum(1 for result in results if result['result'] == 'CREATED')
+
+        return jsonify({
+            'message': 'SUCCESS',
+            'data': {
+                'created': created,
+                'failed': len(results) - created,
+                'results': results
+            }
+        }), 200
 
 
 class UserLoginView(MethodView):
@@ -124,11 +156,10 @@ class UserLoginView(MethodView):
         유저 로그인 뷰
     """
 
-    def __init__(self, services, database):
+    def __init__(self, services):
         self.user_service = services.user_service
-        self.database = database
 
-    @validate_params(
+    @compile_params(
         Param('login_id', JSON, str, rules=[LoginIdRule()]),
         Param('password', JSON, str, rules=[PasswordRule()])
     )
@@ -145,20 +176,9 @@ class UserLoginView(MethodView):
             {'message': 'SUCCESS', 'token': token}, 200
         """
 
-        connection = None
-        try:
-            data = valid.get_json()
-            connection = get_connection(self.database)
-            token = self.user_service.login_logic(data, connection)
-            return jsonify({'message': 'SUCCESS', 'token': token}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            if connection:
-                connection.close()
+        data = valid.get_json()
+        token = self.user_service.login_logic(data, get_session())
+        return jsonify({'message': 'SUCCESS', 'token': token}), 200
 
 
 class UserListView(MethodView):
@@ -166,15 +186,22 @@ class UserListView(MethodView):
         유저 목록 조회 뷰
     """
 
-    def __init__(self, services, database):
+    def __init__(self, services):
         self.user_service = services.user_service
-        self.database = database
 
     @login_decorator
-    @validate_params(
-        Param('permission', GET, str, required=False, default='user', rules=[Enum('user', 'admin')]),
+    @compile_params(
+        Param('permission', GET, str, required=False, default='user', rules=[Enum('user', 'admin', 'all')]),
         Param('offset', GET, str, required=False, default='0', rules=[ZeroRule()]),
-        Param('limit', GET, int, required=False, default=10)
+        Param('limit', GET, int, required=False, default=10),
+        Param('cursor', GET, str, required=False, rules=[CursorRule()]),
+        Param('sort', GET, str, required=False, default='created_at', rules=[Enum(*USER_LIST_SORTS)]),
+        Param('name', GET, str, required=False, rules=[NamePrefixRule()]),
+        Param('email_domain', GET, str, required=False, rules=[EmailDomainRule()]),
+        Param('birth_date_from', GET, str, required=False, rules=[DateRule()]),
+        Param('birth_date_to', GET, str, required=False, rules=[DateRule()]),
+        Param('created_from', GET, str, required=False, rules=[DateRule()]),
+        Param('created_to', GET, str, required=False, rules=[DateRule()])
     )
     def get(self, valid):
         """
@@ -182,37 +209,101 @@ class UserListView(MethodView):
 
             어드민만 사용 가능
             페이지네이션 구현
+            cursor를 주면 offset 대신 커서 다음 행부터 조회 (깊은 페이지도 일정한 속도)
+            If-None-Match가 있으면 카운터만 읽어서 ETag를 만들고 같으면 목록을 조회하지 않고 304 응답
 
         Args:
             valid:
-                permission = user 혹은 admin / 기본값 user
+                permission = user, admin 혹은 all(유저와 어드민 함께) / 기본값 user
                 offset = str(라이브러리 기본값 에러로 인해) / 기본값 0
                 limit = int / 기본값 10
+                cursor = 이전 응답의 next_cursor (필수아님, sort가 같아야 함)
+                sort = created_at, -created_at, name, -name / 기본값 created_at
+                name = 이름 앞부분 (필수아님)
+                email_domain = 이메일 도메인 (필수아님, 유저만)
+                birth_date_from, birth_date_to = YYYY-MM-DD (필수아님, 유저만, 양쪽 포함)
+                created_from, created_to = YYYY-MM-DD (필수아님, created_to 당일 제외)
 
         Returns:
-            {'message': 'SUCCESS', 'data': user_list}, 200
+            {
+                'message': 'SUCCESS',
+                'data': user_list,
+                'next_cursor': next_cursor,
+                'total': 전체 수 (필터가 있으면 null),
+                'has_next': 다음 페이지 여부
+            }, 200 (ETag 헤더)
+            변경이 없으면 본문 없이 304
+        """
+
+        permission_type_id = g.permission_type_id
+
+        if permission_type_id != PermissionTypeEnum.admin.value:
+            raise PermissionDeniedError('PERMISSION_DENIED')
+
+        data = valid.get_params()
+        session = get_session(read_only=True)
+
+        counters = None
+        if request.if_none_match:
+            counters = self.user_service.get_user_list_version(data, session)
+            etag = self.user_service.get_user_list_etag(data, counters)
+            if is_not_modified(etag):
+                return not_modified(etag)
+
+        user_list, next_cursor, total, etag = self.user_service.get_user_list_logic(data, session, counters)
+
+        response = jsonify({
+            'message': 'SUCCESS',
+            'data': user_list,
+            'next_cursor': next_cursor,
+            'total': total,
+            'has_next': next_cursor is not None
+        })
+        return set_etag(response, etag), 200
+
+
+class UserExportView(MethodView):
+    """
+        유저 목록 내보내기 뷰
+    """
+
+    def __init__(self, services):
+        self.user_service = services.user_service
+
+    @login_decorator
+    @compile_params(
+        Param('permission', GET, str, required=False, default='user', rules=[Enum('user', 'admin')])
+    )
+    def get(self, valid):
         """
+            유저 목록 내보내기
 
-        connection = None
-        try:
-            permission_type_id = g.permission_type_id
+            어드민만 사용 가능
+            전체 목록을 한 줄에 하나씩 JSON으로 (NDJSON) 스트리밍
+            응답 크기와 상관없이 메모리 사용량이 일정합니다.
 
-            if permission_type_id != PermissionTypeEnum.admin.value:
-                raise PermissionDeniedError('PERMISSION_DENIED')
+        Args:
+            valid:
+                permission = user 혹은 admin / 기본값 user
 
-            data = valid.get_params()
-            connection = get_connection(self.database)
-            user_list = self.user_service.get_user_list_logic(data, connection)
+        Returns:
+            application/x-ndjson 스트리밍 응답, 200
+        """
+
+        if g.permission_type_id != PermissionTypeEnum.admin.value:
+            raise PermissionDeniedError('PERMISSION_DENIED')
 
-            return jsonify({'message': 'SUCCESS', 'data': user_list}), 200
+        data = valid.get_params()
+        batches = self.user_service.export_user_list_logic(data, get_session(read_only=True))
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        def generate():
+            for rows in batches:
+                yield ''.join(
+                    json.dumps(row, cls=CustomJSONEncoder, ensure_ascii=False) + '\n'
+                    for row in rows
+                )
 
-        finally:
-            if connection:
-                connection.close()
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
 
 
 class UserDetailView(MethodView):
@@ -220,9 +311,8 @@ class UserDetailView(MethodView):
         유저 디테일 뷰
     """
 
-    def __init__(self, services, database):
+    def __init__(self, services):
         self.user_service = services.user_service
-        self.database = database
 
     @login_decorator
     def get(self):
@@ -230,31 +320,31 @@ class UserDetailView(MethodView):
             유저 상세 조회
 
             유저, 어드민 모두 가능
+            If-None-Match가 현재 ETag와 같으면 유저 정보를 조회하지 않고 304 응답
+            캐시가 없으면 복제본에서 조회합니다. 수정 직후에만 쓰기용 세션에서 조회해서 캐시를 채웁니다.
+            (늦은 복제본의 수정 전 값이 캐시 유지 시간 동안 남지 않도록, 세션은 사용할 때만 연결을 꺼냄)
 
         Returns:
-            {'message': 'SUCCESS', 'data': user_info}, 200
+            {'message': 'SUCCESS', 'data': user_info}, 200 (ETag 헤더)
+            변경이 없으면 본문 없이 304
         """
 
-        connection = None
-        try:
-            connection = get_connection(self.database)
-            data = {
-                'account_id': g.account_id,
-                'permission_type_id': g.permission_type_id
-            }
-            user_info = self.user_service.get_user_information_logic(data, connection)
-            return jsonify({'message': 'SUCCESS', 'data': user_info}), 200
+        data = {
+            'account_id': g.account_id,
+            'permission_type_id': g.permission_type_id
+        }
+        session, primary = get_session(read_only=True), get_session()
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        if request.if_none_match:
+            etag = self.user_service.get_user_information_etag(data, session, primary)
+            if is_not_modified(etag):
+                return not_modified(etag)
 
-        finally:
-            if connection:
-                connection.close()
+        user_info, etag = self.user_service.get_user_information_logic(data, session, primary)
+        return set_etag(jsonify({'message': 'SUCCESS', 'data': user_info}), etag), 200
 
     @login_decorator
-    @validate_params(
+    @compile_params(
         Param('name', JSON, str, rules=[NameRule()]),
         Param('email', JSON, str, required=False, rules=[PutEmailRule()]),
         Param('birth_date', JSON, str, required=False, rules=[BirthDateRule()]),
@@ -276,29 +366,15 @@ class UserDetailView(MethodView):
             {'message': 'SUCCESS'}, 200
         """
 
-        connection = None
-        try:
-            data = valid.get_json()
-            data['account_id'] = g.account_id
-            data['permission_type_id'] = g.permission_type_id
+        data = valid.get_json()
+        data['account_id'] = g.account_id
+        data['permission_type_id'] = g.permission_type_id
 
-            if data['permission_type_id'] == PermissionTypeEnum.user.value and not data['email']:
-                raise PutUserInformationError('EMAIL_IS_REQUIRED')
+        if data['permission_type_id'] == PermissionTypeEnum.user.value and not data['email']:
+            raise PutUserInformationError('EMAIL_IS_REQUIRED')
 
-            connection = get_connection(self.database)
-            self.user_service.put_user_information_logic(data, connection)
-            connection.commit()
-            return jsonify({'message': 'SUCCESS'}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            if connection:
-                connection.rollback()
-            raise e
-
-        finally:
-            if connection:
-                connection.close()
+        self.user_service.put_user_information_logic(data, get_session())
+        return jsonify({'message': 'SUCCESS'}), 200
 
     @login_decorator
     def delete(self):
@@ -311,23 +387,9 @@ class UserDetailView(MethodView):
             {'message': 'SUCCESS'}, 200
         """
 
-        connection = None
-        try:
-            data = {
-                'account_id': g.account_id,
-                'permission_type_id': g.permission_type_id
-            }
-            connection = get_connection(self.database)
-            self.user_service.delete_user_logic(data, connection)
-            connection.commit()
-            return jsonify({'message': 'SUCCESS'}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            if connection:
-                connection.rollback()
-            raise e
-
-        finally:
-            if connection:
-                connection.close()
+        data = {
+            'account_id': g.account_id,
+            'permission_type_id': g.permission_type_id
+        }
+        self.user_service.delete_user_logic(data, get_session())
+        return jsonify({'message': 'SUCCESS'}), 200